@@ -1,8 +1,9 @@
 """Agent interface and call pattern for pipeline handoffs."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional
 
+from core.llm import CachedLLM, get_llm
 from schemas.pipeline import ProjectContext
 
 
@@ -10,6 +11,12 @@ class BaseAgent(ABC):
     """Base class for pipeline agents. Each agent receives and returns ProjectContext."""
 
     name: str = "base"
+    llm_client: Optional[CachedLLM] = None  # set on an agent to use another client (e.g. a FakeLLMProvider)
+
+    @property
+    def llm(self) -> CachedLLM:
+        """Cached LLM client for prompts: llm_client, else the process-wide core.llm.get_llm()."""
+        return self.llm_client or get_llm()
 
     @abstractmethod
     async def run(self, context: ProjectContext) -> ProjectContext:
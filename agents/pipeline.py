@@ -0,0 +1,277 @@
+"""Pipeline orchestrator: runs BaseAgent stages as a dependency graph.
+
+Stages whose dependencies are complete run concurrently, each on its own copy of
+the ProjectContext; the fields a stage changed are merged back into the shared
+context when it finishes. After every stage the context is checkpointed, so a
+failed run resumes from the last completed stages instead of starting over.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+from redis.exceptions import RedisError
+
+from agents.base import BaseAgent
+from core.cache import get_redis
+from core.config import get_settings
+from core.metrics import PIPELINE_STAGE_SECONDS
+from schemas.pipeline import PipelineStatus, ProjectContext
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Standard topology: charts and the draft -> critic chain both only need the forecast
+STAGE_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "topic": (),
+    "data": ("topic",),
+    "forecast": ("data",),
+    "draft": ("forecast",),
+    "charts": ("forecast",),
+    "critic": ("draft",),
+    "governance": ("critic", "charts"),
+}
+STAGE_STATUS: dict[str, PipelineStatus] = {
+    "topic": PipelineStatus.topic_done,
+    "data": PipelineStatus.data_done,
+    "forecast": PipelineStatus.forecast_done,
+    "draft": PipelineStatus.draft_done,
+    "critic": PipelineStatus.critic_done,
+    "governance": PipelineStatus.governance_done,
+}
+
+COMPLETED_KEY = "completed_stages"
+StageHook = Callable[[str, Optional[PipelineStatus], float], None]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the pipeline graph."""
+
+    name: str
+    agent: BaseAgent
+    depends_on: tuple[str, ...] = ()
+    status: Optional[PipelineStatus] = None  # context status once this stage completes
+
+
+class PipelineError(Exception):
+    """A stage failed; the context was checkpointed with status=failed."""
+
+    def __init__(self, stage: str, context: ProjectContext):
+        super().__init__(f"Pipeline stage '{stage}' failed for article {context.article_id or '?'}")
+        self.stage = stage
+        self.context = context
+
+
+class CheckpointStore(Protocol):
+    async def load(self, key: str) -> Optional[ProjectContext]: ...
+
+    async def save(self, key: str, context: ProjectContext) -> None: ...
+
+    async def clear(self, key: str) -> None: ...
+
+
+class MemoryCheckpointStore:
+    """In-process checkpoints (tests, single-process runs)."""
+
+    def __init__(self):
+        self._data: dict[str, str] = {}
+
+    async def load(self, key: str) -> Optional[ProjectContext]:
+        raw = self._data.get(key)
+        return ProjectContext.model_validate_json(raw) if raw else None
+
+    async def save(self, key: str, context: ProjectContext) -> None:
+        self._data[key] = context.model_dump_json()
+
+    async def clear(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class RedisCheckpointStore:
+    """Checkpoints shared by all workers, expiring after PIPELINE_CHECKPOINT_TTL_SECONDS."""
+
+    prefix = "probable:pipeline:checkpoint:"
+
+    async def load(self, key: str) -> Optional[ProjectContext]:
+        raw = await get_redis().get(self.prefix + key)
+        return ProjectContext.model_validate_json(raw) if raw else None
+
+    async def save(self, key: str, context: ProjectContext) -> None:
+        await get_redis().set(
+            self.prefix + key, context.model_dump_json(), ex=settings.pipeline_checkpoint_ttl_seconds
+        )
+
+    async def clear(self, key: str) -> None:
+        await get_redis().delete(self.prefix + key)
+
+
+def _merge(target: ProjectContext, before: ProjectContext, after: ProjectContext) -> None:
+    """Copy onto target the fields a stage changed between before and after."""
+    for field in ProjectContext.model_fields:
+        if field == "status":
+            continue
+        old, new = getattr(before, field), getattr(after, field)
+        if new == old:
+            continue
+        if field == "metadata":
+            target.metadata.update({k: v for k, v in new.items() if old.get(k) != v})
+        else:
+            setattr(target, field, new)
+
+
+class Pipeline:
+    """Dependency-ordered, concurrent, resumable agent pipeline."""
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        store: Optional[CheckpointStore] = None,
+        on_stage_complete: Optional[StageHook] = None,
+    ):
+        self.stages = {s.name: s for s in stages}
+        self.order = [s.name for s in stages]
+        self.store = store
+        self.on_stage_complete = on_stage_complete
+        self._validate()
+
+    @classmethod
+    def standard(cls, agents: dict[str, BaseAgent], **kwargs) -> "Pipeline":
+        """Build the standard topology from agents keyed by stage name (missing stages are skipped)."""
+        stages = []
+        for name, deps in STAGE_DEPENDENCIES.items():
+            if name not in agents:
+                continue
+            stages.append(
+                Stage(
+                    name=name,
+                    agent=agents[name],
+                    depends_on=tuple(_nearest_present(deps, agents)),
+                    status=STAGE_STATUS.get(name),
+                )
+            )
+        return cls(stages, **kwargs)
+
+    def _validate(self) -> None:
+        for stage in self.stages.values():
+            unknown = set(stage.depends_on) - self.stages.keys()
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {sorted(unknown)}")
+        # Kahn's algorithm: every stage must be reachable without a cycle
+        remaining = {name: set(s.depends_on) for name, s in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Pipeline has a dependency cycle among: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    async def _checkpoint(self, context: ProjectContext) -> None:
+        if self.store is None or not context.article_id:
+            return
+        try:
+            await self.store.save(context.article_id, context)
+        except RedisError:
+            logger.warning("Could not checkpoint pipeline for article %s", context.article_id)
+
+    async def _resume(self, context: ProjectContext) -> ProjectContext:
+        if self.store is None or not context.article_id:
+            return context
+        try:
+            saved = await self.store.load(context.article_id)
+        except RedisError:
+            return context
+        return saved or context
+
+    def _status_after(self, completed: set[str]) -> Optional[PipelineStatus]:
+        latest = None
+        for name in self.order:
+            if name in completed and self.stages[name].status is not None:
+                latest = self.stages[name].status
+        return latest
+
+    async def _run_stage(self, stage: Stage, snapshot: ProjectContext) -> tuple[Stage, ProjectContext, float]:
+        start = time.perf_counter()
+        result = await stage.agent.run(snapshot.model_copy(deep=True))
+        return stage, result, time.perf_counter() - start
+
+    async def run(self, context: ProjectContext) -> ProjectContext:
+        """Run (or resume) the pipeline for one article. Raises PipelineError on stage failure."""
+        context = await self._resume(context)
+        completed = set(context.metadata.get(COMPLETED_KEY, []))
+        running: dict[asyncio.Task, tuple[str, ProjectContext]] = {}
+
+        try:
+            while True:
+                for name in self.order:
+                    stage = self.stages[name]
+                    launched = any(n == name for n, _ in running.values())
+                    if name in completed or launched or not set(stage.depends_on) <= completed:
+                        continue
+                    snapshot = context.model_copy(deep=True)
+                    running[asyncio.create_task(self._run_stage(stage, snapshot))] = (name, snapshot)
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name, snapshot = running.pop(task)
+                    try:
+                        stage, result, seconds = task.result()
+                    except Exception as e:
+                        context.status = PipelineStatus.failed
+                        context.metadata.update({"failed_stage": name, "error": f"{type(e).__name__}: {e}"})
+                        await self._checkpoint(context)
+                        raise PipelineError(name, context) from e
+                    _merge(context, snapshot, result)
+                    completed.add(name)
+                    context.metadata[COMPLETED_KEY] = [n for n in self.order if n in completed]
+                    context.metadata.setdefault("stage_seconds", {})[name] = round(seconds, 3)
+                    context.status = self._status_after(completed) or context.status
+                    PIPELINE_STAGE_SECONDS.observe_nowait(
+                        seconds, stage=name, status=stage.status.value if stage.status else "none"
+                    )
+                    if self.on_stage_complete:
+                        self.on_stage_complete(name, stage.status, seconds)
+                    await self._checkpoint(context)
+        finally:
+            for task in running:
+                task.cancel()
+
+        context.metadata.pop("failed_stage", None)
+        context.metadata.pop("error", None)
+        return context
+
+    async def run_many(
+        self, contexts: Iterable[ProjectContext], max_in_flight: Optional[int] = None
+    ) -> list[ProjectContext | BaseException]:
+        """Run many articles concurrently, at most max_in_flight at a time."""
+        sem = asyncio.Semaphore(max_in_flight or settings.pipeline_max_in_flight)
+
+        async def one(ctx: ProjectContext) -> ProjectContext:
+            async with sem:
+                return await self.run(ctx)
+
+        return await asyncio.gather(*(one(c) for c in contexts), return_exceptions=True)
+
+    async def clear(self, article_id: str) -> None:
+        """Forget a checkpoint (e.g. after publishing)."""
+        if self.store is not None:
+            await self.store.clear(article_id)
+
+
+def _nearest_present(deps: Iterable[str], agents: dict[str, BaseAgent]) -> list[str]:
+    """Replace dependencies on absent stages with their own (present) dependencies."""
+    out: list[str] = []
+    for dep in deps:
+        if dep in agents:
+            out.append(dep)
+        else:
+            out.extend(_nearest_present(STAGE_DEPENDENCIES[dep], agents))
+    return list(dict.fromkeys(out))
+
@@ -0,0 +1,194 @@
+"""Monte Carlo seat forecast: vote-share uncertainty to PartyForecast distributions.
+
+Each simulation draws a national swing per party (poll error) plus independent
+constituency noise, applies it to baseline constituency shares, and awards each
+seat to the argmax party. Everything is vectorised over one float32 array of
+simulations x constituencies x parties (stored party-major so per-party passes
+are contiguous); simulations are processed in chunks so peak memory tracks
+``max_memory_mb`` rather than n_sims.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from agents.base import BaseAgent
+from schemas.pipeline import ForecastResult, PartyForecast, PipelineStatus, ProjectContext
+
+DEFAULT_QUANTILES = (0.05, 0.1, 0.5, 0.9, 0.95)
+
+
+@dataclass
+class SeatSimulation:
+    """Raw simulation output: seats won and national vote share per simulation and party."""
+
+    parties: list[str]
+    seats: np.ndarray  # (n_sims, n_parties) int32
+    vote_shares: np.ndarray  # (n_sims, n_parties) float32
+    n_seats: int
+
+
+def _chunk_size(n_constituencies: int, n_parties: int, max_memory_mb: float, reserved_bytes: int = 0) -> int:
+    # Per simulation: the float32 share array (P x C), then per seat the running
+    # max (float32), the comparison mask (bool), the winner index (int64), the
+    # totals/weights array (float32, divided in place) and its where-mask (bool)
+    per_sim = n_constituencies * (n_parties * 4 + 4 + 1 + 8 + 4 + 1) + n_parties * 8 * 2
+    available = max_memory_mb * 1024 * 1024 - reserved_bytes
+    return max(1, int(available // per_sim))
+
+
+def simulate_seats(
+    parties: Sequence[str],
+    baseline_shares: np.ndarray,
+    poll_shares: Sequence[float],
+    *,
+    poll_error: float | Sequence[float] = 0.02,
+    local_error: float = 0.03,
+    weights: Optional[np.ndarray] = None,
+    n_sims: int = 100_000,
+    seed: Optional[int] = None,
+    max_memory_mb: float = 64,
+) -> SeatSimulation:
+    """Simulate seat totals under uniform national swing plus local noise.
+
+    baseline_shares: (constituencies, parties) previous-result vote shares.
+    poll_shares: current national polling average per party.
+    poll_error: national polling error (std, per party or shared).
+    local_error: constituency-level noise std on top of the national swing.
+    weights: per-constituency turnout weights for national share (default equal).
+    """
+    baseline = np.asarray(baseline_shares, dtype=np.float32)
+    n_const, n_parties = baseline.shape
+    if len(parties) != n_parties:
+        raise ValueError(f"{len(parties)} parties but baseline has {n_parties} columns")
+    w = np.full(n_const, 1.0 / n_const, dtype=np.float32) if weights is None else np.asarray(weights, np.float32)
+    w = w / w.sum()
+
+    baseline_national = w @ baseline
+    mean_swing = np.asarray(poll_shares, dtype=np.float32) - baseline_national
+    national_std = np.broadcast_to(np.asarray(poll_error, dtype=np.float32), (n_parties,))
+
+    rng = np.random.default_rng(seed)
+    seats = np.empty((n_sims, n_parties), dtype=np.int32)
+    vote_shares = np.empty((n_sims, n_parties), dtype=np.float32)
+    # The outputs live for the whole run, so they come out of the budget first
+    chunk = _chunk_size(n_const, n_parties, max_memory_mb, reserved_bytes=seats.nbytes + vote_shares.nbytes)
+
+    for lo in range(0, n_sims, chunk):
+        n = min(chunk, n_sims - lo)
+        swing = mean_swing + national_std * rng.standard_normal((n, n_parties), dtype=np.float32)
+        shares = rng.standard_normal((n_parties, n, n_const), dtype=np.float32)  # (P, n, C)
+        shares *= local_error
+        shares += baseline.T[:, None, :]
+        shares += swing.T[:, :, None]
+        np.maximum(shares, 0.0, out=shares)
+
+        # Renormalising each seat doesn't change its argmax, so only the national share needs totals.
+        # argmax(axis=0) would copy the whole (P, n, C) array; a running max over parties keeps
+        # the temporaries per seat (strict > keeps the first party on ties, as argmax does).
+        best = shares[0].copy()
+        winners = np.zeros((n, n_const), dtype=np.int64)
+        higher = np.empty((n, n_const), dtype=bool)
+        for p in range(1, n_parties):
+            np.greater(shares[p], best, out=higher)
+            winners[higher] = p
+            np.maximum(best, shares[p], out=best)
+        del best, higher
+        winners += (np.arange(n, dtype=np.int64) * n_parties)[:, None]
+        counts = np.bincount(winners.ravel(), minlength=n * n_parties)
+        seats[lo : lo + n] = counts.reshape(n, n_parties)
+        del winners, counts
+
+        seat_weights = shares.sum(axis=0)  # totals, turned into w / totals in place
+        np.divide(w, seat_weights, out=seat_weights, where=seat_weights > 0)
+        for p in range(n_parties):
+            vote_shares[lo : lo + n, p] = np.einsum("sc,sc->s", shares[p], seat_weights)
+        del shares, seat_weights
+
+    return SeatSimulation(parties=list(parties), seats=seats, vote_shares=vote_shares, n_seats=n_const)
+
+
+def summarise(
+    sim: SeatSimulation,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    model_name: str = "elections_seat_model",
+) -> ForecastResult:
+    """Reduce a simulation to one PartyForecast per party."""
+    seats = sim.seats
+    top = seats == seats.max(axis=1, keepdims=True)
+    win_prob = (top / top.sum(axis=1, keepdims=True)).mean(axis=0)  # ties split evenly
+    majority = sim.n_seats // 2 + 1
+    majority_prob = (seats >= majority).mean(axis=0)
+    seat_q = np.quantile(seats, quantiles, axis=0)
+    seat_mean = seats.mean(axis=0)
+    seat_std = seats.std(axis=0)
+    share_mean = sim.vote_shares.mean(axis=0)
+    share_std = sim.vote_shares.std(axis=0)
+
+    targets = [
+        PartyForecast(
+            party=party,
+            seat_mean=float(seat_mean[i]),
+            seat_std=float(seat_std[i]),
+            win_prob=float(win_prob[i]),
+            vote_share_mean=float(share_mean[i]),
+            vote_share_std=float(share_std[i]),
+            quantiles={f"p{round(q * 100)}": float(seat_q[j, i]) for j, q in enumerate(quantiles)},
+        )
+        for i, party in enumerate(sim.parties)
+    ]
+    return ForecastResult(
+        targets=targets,
+        model_name=model_name,
+        metadata={
+            "n_sims": int(seats.shape[0]),
+            "n_seats": sim.n_seats,
+            "majority": majority,
+            "majority_prob": {p: float(majority_prob[i]) for i, p in enumerate(sim.parties)},
+        },
+    )
+
+
+def run_seat_forecast(
+    parties: Sequence[str],
+    baseline_shares: np.ndarray,
+    poll_shares: Sequence[float],
+    **kwargs,
+) -> ForecastResult:
+    """simulate_seats + summarise. kwargs go to simulate_seats."""
+    return summarise(simulate_seats(parties, baseline_shares, poll_shares, **kwargs))
+
+
+class SeatForecastAgent(BaseAgent):
+    """Forecast Computation Agent for seat-based elections.
+
+    Reads ``parties``, ``baseline_shares`` (constituency x party) and ``poll_shares``
+    from context.dataset, plus optional ``poll_error``, ``local_error`` and ``weights``.
+    """
+
+    name = "seat_forecast"
+
+    def __init__(self, n_sims: int = 100_000, seed: Optional[int] = None, max_memory_mb: float = 64):
+        self.n_sims = n_sims
+        self.seed = seed
+        self.max_memory_mb = max_memory_mb
+
+    async def run(self, context: ProjectContext) -> ProjectContext:
+        data = context.dataset or {}
+        kwargs = {k: data[k] for k in ("poll_error", "local_error", "weights") if k in data}
+        # NumPy releases the GIL for the heavy kernels; keep the event loop free
+        result = await asyncio.to_thread(
+            run_seat_forecast,
+            data["parties"],
+            np.asarray(data["baseline_shares"], dtype=np.float32),
+            data["poll_shares"],
+            n_sims=self.n_sims,
+            seed=self.seed,
+            max_memory_mb=self.max_memory_mb,
+            **kwargs,
+        )
+        context.forecast_result = result
+        context.status = PipelineStatus.forecast_done
+        return context
@@ -0,0 +1,30 @@
+"""Add composite (forecast_spec_id, run_at DESC) index on forecast_runs
+
+Revision ID: 005_forecast_runs_idx
+Revises: 004_marketplace
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005_forecast_runs_idx"
+down_revision: Union[str, None] = "004_marketplace"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the latest-run-per-spec lookup (DISTINCT ON forecast_spec_id ... ORDER BY run_at DESC)
+    op.create_index(
+        "ix_forecast_runs_spec_id_run_at",
+        "forecast_runs",
+        ["forecast_spec_id", sa.text("run_at DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_forecast_runs_spec_id_run_at", table_name="forecast_runs")
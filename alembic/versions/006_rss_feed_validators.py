@@ -0,0 +1,26 @@
+"""Add etag and last_modified to rss_feeds for conditional GETs
+
+Revision ID: 006_rss_feed_validators
+Revises: 005_forecast_runs_idx
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006_rss_feed_validators"
+down_revision: Union[str, None] = "005_forecast_runs_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("rss_feeds", sa.Column("etag", sa.String(length=512), nullable=True))
+    op.add_column("rss_feeds", sa.Column("last_modified", sa.String(length=128), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("rss_feeds", "last_modified")
+    op.drop_column("rss_feeds", "etag")
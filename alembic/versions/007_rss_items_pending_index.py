@@ -0,0 +1,30 @@
+"""Add partial index on unprocessed rss_items for the extraction stage
+
+Revision ID: 007_rss_items_pending
+Revises: 006_rss_feed_validators
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007_rss_items_pending"
+down_revision: Union[str, None] = "006_rss_feed_validators"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_rss_items_pending",
+        "rss_items",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("processed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rss_items_pending", table_name="rss_items")
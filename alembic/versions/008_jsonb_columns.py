@@ -0,0 +1,67 @@
+"""Convert JSON columns to JSONB; GIN indexes on article topics/entities
+
+Revision ID: 008_jsonb_columns
+Revises: 007_rss_items_pending
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "008_jsonb_columns"
+down_revision: Union[str, None] = "007_rss_items_pending"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> {column: server default}; each table is rewritten once
+COLUMNS = {
+    "articles": {"topics": "[]", "entities": "[]", "key_numbers": None, "quotes": None},
+    "datasets": {"data": "{}"},
+    "projects": {"sections": "[]", "charts": "[]", "datasets": "[]", "forecast_block": None},
+    "forecast_runs": {"result": "{}", "calibration_flags": "[]", "metadata": "{}"},
+}
+
+
+def _convert(type_: str) -> None:
+    for table, columns in COLUMNS.items():
+        clauses = []
+        for column, default in columns.items():
+            if default is not None:
+                clauses.append(f'ALTER COLUMN "{column}" DROP DEFAULT')
+            clauses.append(f'ALTER COLUMN "{column}" TYPE {type_} USING "{column}"::{type_}')
+            if default is not None:
+                clauses.append(f"ALTER COLUMN \"{column}\" SET DEFAULT '{default}'::{type_}")
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+
+
+def upgrade() -> None:
+    _convert("jsonb")
+    # jsonb_path_ops: smaller than the default opclass and serves @> (topics @> '["politics"]')
+    op.create_index(
+        "ix_articles_topics",
+        "articles",
+        ["topics"],
+        postgresql_using="gin",
+        postgresql_ops={"topics": "jsonb_path_ops"},
+    )
+    op.create_index(
+        "ix_articles_entities",
+        "articles",
+        ["entities"],
+        postgresql_using="gin",
+        postgresql_ops={"entities": "jsonb_path_ops"},
+    )
+    op.create_index(
+        "ix_forecast_runs_point_estimate",
+        "forecast_runs",
+        [sa.text("((result ->> 'point_estimate')::double precision)")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_forecast_runs_point_estimate", table_name="forecast_runs")
+    op.drop_index("ix_articles_entities", table_name="articles")
+    op.drop_index("ix_articles_topics", table_name="articles")
+    _convert("json")
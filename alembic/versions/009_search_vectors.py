@@ -0,0 +1,49 @@
+"""Add generated tsvector columns and GIN indexes for full-text search
+
+Revision ID: 009_search_vectors
+Revises: 008_jsonb_columns
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "009_search_vectors"
+down_revision: Union[str, None] = "008_jsonb_columns"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ARTICLE_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(headline, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(dek, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'C')"
+)
+PROJECT_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(lede, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Stored generated columns: Postgres recomputes them on every insert/update of the source
+    # columns, so no trigger function is needed (adding them rewrites the table once)
+    op.add_column(
+        "articles",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(ARTICLE_DOCUMENT, persisted=True)),
+    )
+    op.add_column(
+        "projects",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(PROJECT_DOCUMENT, persisted=True)),
+    )
+    op.create_index("ix_articles_search_vector", "articles", ["search_vector"], postgresql_using="gin")
+    op.create_index("ix_projects_search_vector", "projects", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_projects_search_vector", table_name="projects")
+    op.drop_index("ix_articles_search_vector", table_name="articles")
+    op.drop_column("projects", "search_vector")
+    op.drop_column("articles", "search_vector")
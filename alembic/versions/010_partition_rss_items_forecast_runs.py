@@ -0,0 +1,169 @@
+"""Partition rss_items and forecast_runs by month; rss_item_urls for URL dedup
+
+Revision ID: 010_monthly_partitions
+Revises: 009_search_vectors
+Create Date: 2026-10-18
+
+Both tables are rebuilt as RANGE partitioned tables (one partition per month of
+fetched_at / run_at) and the existing rows copied over. A partitioned table can
+only enforce uniqueness that includes the partition key, so the primary keys
+become (id, fetched_at) / (id, run_at) and rss_items.url uniqueness moves to
+rss_item_urls, maintained by a BEFORE INSERT trigger that silently skips rows
+whose URL is already stored (the old ON CONFLICT (url) DO NOTHING behaviour).
+A DEFAULT partition takes rows outside the premade months, so inserts keep
+working if partition maintenance falls behind; it moves them out later.
+
+"""
+from datetime import UTC, date, datetime
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = "010_monthly_partitions"
+down_revision: Union[str, None] = "009_search_vectors"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_MONTHS = 2
+
+RSS_ITEMS_COLUMNS = """
+    id integer NOT NULL DEFAULT nextval('rss_items_id_seq'),
+    url varchar(2048) NOT NULL,
+    guid varchar(512),
+    title varchar(1024) NOT NULL,
+    body text,
+    raw_html text,
+    source varchar(256) NOT NULL,
+    published_at timestamptz,
+    fetched_at timestamptz NOT NULL DEFAULT now(),
+    processed_at timestamptz,
+    article_id integer
+"""
+FORECAST_RUNS_COLUMNS = """
+    id integer NOT NULL DEFAULT nextval('forecast_runs_id_seq'),
+    project_id integer,
+    forecast_spec_id integer,
+    model_name varchar(128) NOT NULL,
+    result jsonb NOT NULL DEFAULT '{}'::jsonb,
+    calibration_flags jsonb NOT NULL DEFAULT '[]'::jsonb,
+    run_at timestamptz NOT NULL DEFAULT now(),
+    metadata jsonb NOT NULL DEFAULT '{}'::jsonb
+"""
+RSS_ITEMS_INDEXES = [
+    "CREATE INDEX ix_rss_items_url ON rss_items (url)",
+    "CREATE INDEX ix_rss_items_guid ON rss_items (guid)",
+    "CREATE INDEX ix_rss_items_source ON rss_items (source)",
+    "CREATE INDEX ix_rss_items_pending ON rss_items (id) WHERE processed_at IS NULL",
+]
+FORECAST_RUNS_INDEXES = [
+    "CREATE INDEX ix_forecast_runs_spec_id_run_at ON forecast_runs (forecast_spec_id, run_at DESC)",
+    "CREATE INDEX ix_forecast_runs_point_estimate ON forecast_runs (((result ->> 'point_estimate')::double precision))",
+]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _first_month(table: str, column: str) -> date:
+    current = datetime.now(UTC).date().replace(day=1)
+    if context.is_offline_mode():
+        return current
+    oldest = op.get_bind().execute(sa.text(f"SELECT min({column}) FROM {table}")).scalar()
+    if oldest is None:
+        return current
+    return min(oldest.astimezone(UTC).date().replace(day=1), current)
+
+
+def _partition(table: str, column: str, columns: str, indexes: list[str]) -> None:
+    legacy = f"{table}_legacy"
+    first = _first_month(table, column)
+    last = _add_months(datetime.now(UTC).date().replace(day=1), PREMAKE_MONTHS)
+
+    # Index and constraint names are schema-wide; free them for the new table
+    for index in indexes:
+        op.execute(f"DROP INDEX IF EXISTS {index.split()[2]}")
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+
+    op.execute(f"CREATE TABLE {table} ({columns}, PRIMARY KEY (id, {column})) PARTITION BY RANGE ({column})")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    month = first
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+        )
+        month = upper
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    for index in indexes:
+        op.execute(index)
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE rss_item_urls (
+            url varchar(2048) PRIMARY KEY,
+            fetched_at timestamptz NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute("CREATE INDEX ix_rss_item_urls_fetched_at ON rss_item_urls (fetched_at)")
+    op.execute(
+        """
+        CREATE FUNCTION rss_items_dedup() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO rss_item_urls (url, fetched_at) VALUES (NEW.url, NEW.fetched_at) ON CONFLICT DO NOTHING;
+            IF NOT FOUND THEN
+                RETURN NULL;
+            END IF;
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+
+    _partition("rss_items", "fetched_at", RSS_ITEMS_COLUMNS, RSS_ITEMS_INDEXES)
+    op.execute(
+        "CREATE TRIGGER rss_items_dedup BEFORE INSERT ON rss_items FOR EACH ROW EXECUTE FUNCTION rss_items_dedup()"
+    )
+    op.execute(
+        "INSERT INTO rss_items (id, url, guid, title, body, raw_html, source, published_at, fetched_at, "
+        "processed_at, article_id) SELECT id, url, guid, title, body, raw_html, source, published_at, fetched_at, "
+        "processed_at, article_id FROM rss_items_legacy ORDER BY id"
+    )
+    op.execute("DROP TABLE rss_items_legacy")
+
+    _partition("forecast_runs", "run_at", FORECAST_RUNS_COLUMNS, FORECAST_RUNS_INDEXES)
+    op.execute(
+        "INSERT INTO forecast_runs (id, project_id, forecast_spec_id, model_name, result, calibration_flags, "
+        "run_at, metadata) SELECT id, project_id, forecast_spec_id, model_name, result, calibration_flags, "
+        "run_at, metadata FROM forecast_runs_legacy"
+    )
+    op.execute("DROP TABLE forecast_runs_legacy")
+    op.execute("ANALYZE rss_items")
+    op.execute("ANALYZE forecast_runs")
+
+
+def _unpartition(table: str, indexes: list[str]) -> None:
+    plain = f"{table}_plain"
+    op.execute(f"CREATE TABLE {plain} (LIKE {table} INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {plain} SELECT * FROM {table}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {plain}.id")
+    op.execute(f"DROP TABLE {table}")  # drops every partition
+    op.execute(f"ALTER TABLE {plain} RENAME TO {table}")
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+    for index in indexes:
+        op.execute(index)
+
+
+def downgrade() -> None:
+    _unpartition("forecast_runs", FORECAST_RUNS_INDEXES)
+    _unpartition("rss_items", RSS_ITEMS_INDEXES[1:])
+    op.execute("CREATE UNIQUE INDEX ix_rss_items_url ON rss_items (url)")
+    op.execute("DROP TABLE rss_item_urls")
+    op.execute("DROP FUNCTION rss_items_dedup()")
@@ -0,0 +1,31 @@
+"""Add a generated md5 digest of datasets.data
+
+Revision ID: 011_dataset_digest
+Revises: 010_monthly_partitions
+Create Date: 2026-10-18
+
+The forecast refresh fingerprints every spec's input datasets each round;
+reading a stored digest avoids re-serialising and hashing the JSONB blobs.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "011_dataset_digest"
+down_revision: Union[str, None] = "010_monthly_partitions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Recomputed by Postgres whenever data is written (adding it rewrites the table once)
+    op.add_column(
+        "datasets",
+        sa.Column("data_digest", sa.String(32), sa.Computed("md5(data::text)", persisted=True)),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("datasets", "data_digest")
@@ -2,14 +2,19 @@
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from apps.api.middleware import DbInstrumentationMiddleware, RequestMetricsMiddleware, record_db_route
 from apps.api.routers import admin as admin_router
 from apps.api.routers import auth as auth_router
 from apps.api.routers import marketplace as marketplace_router
+from apps.api.routers import ops as ops_router
+from apps.api.routers import search as search_router
+from core.cache import close_redis
+from core.queue import close_queue
 from core.config import get_settings
-from core.db import engine
+from core.db import engine, replica_engine, start_pool_stats_logger
 
 settings = get_settings()
 
@@ -17,8 +22,15 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown."""
+    pool_stats_task = start_pool_stats_logger("api")
     yield
+    if pool_stats_task is not None:
+        pool_stats_task.cancel()
+    await close_redis()
+    await close_queue()
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
 
 
 app = FastAPI(
@@ -26,19 +38,25 @@ app = FastAPI(
     description="Autonomous data journalism and forecasting API",
     version="0.1.0",
     lifespan=lifespan,
+    dependencies=[Depends(record_db_route)],
 )
 
+app.add_middleware(DbInstrumentationMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-Pool-Wait-Ms", "X-Next-Cursor"],
 )
 
 app.include_router(auth_router.router, prefix="/api/v1")
 app.include_router(admin_router.router)
 app.include_router(marketplace_router.router)
+app.include_router(search_router.router)
+app.include_router(ops_router.router)
 
 
 @app.get("/health")
@@ -0,0 +1,105 @@
+"""ASGI middleware for the API app."""
+
+import time
+
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core import instrumentation
+from core.config import get_settings
+from core.metrics import REGISTRY
+
+settings = get_settings()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request latency", ("method", "route", "status")
+)
+REQUEST_QUERIES = REGISTRY.histogram(
+    "http_request_db_queries",
+    "SQL statements per request",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 500),
+)
+REQUEST_DB_SECONDS = REGISTRY.histogram("http_request_db_seconds", "Total SQL time per request", ("route",))
+REQUEST_POOL_WAIT_SECONDS = REGISTRY.histogram(
+    "http_request_db_pool_wait_seconds", "Connection pool wait per request", ("route",)
+)
+
+
+def route_template(scope: Scope) -> str:
+    """Matched route path (e.g. /api/feeds/{id}); a fixed label for unmatched paths keeps cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def record_db_route(request: Request) -> None:
+    """App dependency: label the request's DbStats with its route template once routing has matched.
+
+    Runs before the endpoint's own dependencies, so their slow queries are logged by route too.
+    """
+    stats = instrumentation.current()
+    if stats is not None:
+        stats.route = route_template(request.scope)
+
+
+class RequestMetricsMiddleware:
+    """Per-route request latency histogram."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started, method=scope["method"], route=route_template(scope), status=str(status)
+            )
+
+
+class DbInstrumentationMiddleware:
+    """Attribute SQL work to each request; report it in headers and per-route histograms."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = instrumentation.start(scope["path"])
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Routing has run by now (also for requests that never reach record_db_route)
+                stats.route = route_template(scope)
+            if message["type"] == "http.response.start" and settings.db_timing_headers:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.queries)
+                headers["X-DB-Time-Ms"] = f"{stats.db_seconds * 1000:.1f}"
+                headers["X-DB-Pool-Wait-Ms"] = f"{stats.pool_wait_seconds * 1000:.1f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            instrumentation.stop(token)
+            route = route_template(scope)
+            REQUEST_QUERIES.observe(stats.queries, route=route)
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, route=route)
+            REQUEST_POOL_WAIT_SECONDS.observe(stats.pool_wait_seconds, route=route)
@@ -0,0 +1,103 @@
+"""Keyset pagination and field projection for list endpoints.
+
+List endpoints keep returning a JSON array (the admin dashboard contract); the
+cursor for the next page travels in the ``X-Next-Cursor`` response header and is
+passed back as ``?cursor=``. Cursors are opaque to clients.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import Select
+from sqlalchemy.orm import load_only
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Query parameter declarations shared by list endpoints
+LimitQuery = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT)
+CursorQuery = Query(None, description="Opaque cursor from the X-Next-Cursor header")
+FieldsQuery = Query(None, description="Comma-separated response fields to return")
+
+
+def encode_cursor(*key: Any) -> str:
+    """Encode a sort key (e.g. the last row id) as an opaque cursor."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[list]:
+    """Decode a cursor produced by encode_cursor. Raises 400 if malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError):
+        key = None
+    if not isinstance(key, list) or not key:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+def keyset(q: Select, id_column, cursor: Optional[str], limit: int, descending: bool = True) -> Select:
+    """Apply keyset pagination on an integer id column.
+
+    Fetches one extra row so finish_page can tell whether another page exists.
+    """
+    key = decode_cursor(cursor)
+    if key is not None:
+        if not isinstance(key[0], int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        q = q.where(id_column < key[0] if descending else id_column > key[0])
+    order = id_column.desc() if descending else id_column.asc()
+    return q.order_by(None).order_by(order).limit(limit + 1)
+
+
+def finish_page(
+    rows: Sequence,
+    limit: int,
+    response: Response,
+    key: Callable[[Any], tuple] = lambda row: (row.id,),
+) -> Sequence:
+    """Trim the lookahead row and set X-Next-Cursor when more rows exist."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
+
+
+# Response field -> (model columns it reads, getter). Fields computed in SQL list no columns.
+FieldSpec = dict[str, tuple[tuple, Callable[[Any], Any]]]
+
+
+def parse_fields(fields: Optional[str], spec: FieldSpec) -> Optional[set[str]]:
+    """Parse ?fields=a,b,c against the fields an endpoint can return. None means all."""
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - spec.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested | {"id"}
+
+
+def projection(model, spec: FieldSpec, fields: Optional[set[str]]):
+    """load_only() option covering the columns behind the requested response fields."""
+    names = spec.keys() if fields is None else fields
+    columns = [model.id]
+    for name in names:
+        for col in spec[name][0]:
+            if not any(col is seen for seen in columns):
+                columns.append(col)
+    return load_only(*columns)
+
+
+def render(obj: Any, spec: FieldSpec, fields: Optional[set[str]] = None) -> dict:
+    """Build a response dict, touching only the attributes behind the requested fields."""
+    return {name: get(obj) for name, (_, get) in spec.items() if fields is None or name in fields}
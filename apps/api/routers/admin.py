@@ -3,11 +3,25 @@
 from datetime import datetime
 from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
-from sqlalchemy import delete, func, select
-
-from core.db import DbSession
+from sqlalchemy import Text, case, column, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by
+from sqlalchemy.orm import with_expression
+
+from apps.api.pagination import (
+    CursorQuery,
+    FieldSpec,
+    FieldsQuery,
+    LimitQuery,
+    finish_page,
+    keyset,
+    parse_fields,
+    projection,
+    render,
+)
+from core import partitions, principals, stats, webhooks
+from core.db import DbSession, ReadDbSession
 from models.article import Article
 from models.dataset import DataSource, Dataset
 from models.forecast import ForecastRun, ForecastSpecDB
@@ -27,34 +41,32 @@ from schemas.admin import (
 
 router = APIRouter(prefix="/api", tags=["admin"])
 
+# List previews are cut in SQL so the full Text/JSON columns never leave Postgres
+PREVIEW_CHARS = 1000
+
+
+def _iso(dt: Optional[datetime]) -> Optional[str]:
+    return dt.isoformat() if dt else None
+
+
 # ---------------------------------------------------------------------------
 # Dashboard
 # ---------------------------------------------------------------------------
 
 
 @router.get("/dashboard/stats", response_model=DashboardStats)
-async def dashboard_stats(db: DbSession):
-    """Aggregate stats for admin dashboard."""
-    total_feeds = (await db.execute(select(func.count(RssFeed.id)))).scalar() or 0
-    active_feeds = (
-        await db.execute(select(func.count(RssFeed.id)).where(RssFeed.status == "active"))
-    ).scalar() or 0
-    total_articles = (await db.execute(select(func.count(Article.id)))).scalar() or 0
-    total_projects = (await db.execute(select(func.count(Project.id)))).scalar() or 0
-    published_projects = (
-        await db.execute(select(func.count(Project.id)).where(Project.status == "published"))
-    ).scalar() or 0
-    total_forecasts = (await db.execute(select(func.count(ForecastSpecDB.id)))).scalar() or 0
-    active_forecasts = total_forecasts  # specs with runs - simplify for now
+async def dashboard_stats(db: ReadDbSession):
+    """Aggregate stats for admin dashboard (cached; see core.stats)."""
+    s = await stats.get_stats(db)
     return DashboardStats(
-        totalFeeds=total_feeds,
-        activeFeeds=active_feeds,
-        totalArticles=total_articles,
-        pendingArticles=total_articles,  # simplify: all queued
-        totalStories=total_projects,
-        publishedStories=published_projects,
-        totalForecasts=total_forecasts,
-        activeForecasts=active_forecasts or total_forecasts,
+        totalFeeds=s["total_feeds"],
+        activeFeeds=s["active_feeds"],
+        totalArticles=s["total_articles"],
+        pendingArticles=s["total_articles"],  # simplify: all queued
+        totalStories=s["total_stories"],
+        publishedStories=s["published_stories"],
+        totalForecasts=s["total_forecasts"],
+        activeForecasts=s["total_forecasts"],  # specs with runs - simplify for now
         agentsRunning=0,
         agentsWithErrors=0,
     )
@@ -65,28 +77,40 @@ async def dashboard_stats(db: DbSession):
 # ---------------------------------------------------------------------------
 
 
-def _feed_to_response(f: RssFeed) -> dict:
-    return {
-        "id": f.id,
-        "name": f.name,
-        "url": f.url,
-        "category": f.category,
-        "status": f.status,
-        "articlesCount": f.articles_count,
-        "lastFetched": f.last_fetched_at.isoformat() if f.last_fetched_at else None,
-        "createdAt": f.created_at.isoformat() if f.created_at else None,
-    }
+_FEED_FIELDS: FieldSpec = {
+    "id": ((RssFeed.id,), lambda f: f.id),
+    "name": ((RssFeed.name,), lambda f: f.name),
+    "url": ((RssFeed.url,), lambda f: f.url),
+    "category": ((RssFeed.category,), lambda f: f.category),
+    "status": ((RssFeed.status,), lambda f: f.status),
+    "articlesCount": ((RssFeed.articles_count,), lambda f: f.articles_count),
+    "lastFetched": ((RssFeed.last_fetched_at,), lambda f: _iso(f.last_fetched_at)),
+    "createdAt": ((RssFeed.created_at,), lambda f: _iso(f.created_at)),
+}
+
+
+def _feed_to_response(f: RssFeed, fields: Optional[set[str]] = None) -> dict:
+    return render(f, _FEED_FIELDS, fields)
 
 
 @router.get("/feeds")
-async def feeds_list(db: DbSession):
-    """List all RSS feeds."""
-    result = await db.execute(select(RssFeed).order_by(RssFeed.id))
-    return [_feed_to_response(f) for f in result.scalars().all()]
+async def feeds_list(
+    db: ReadDbSession,
+    response: Response,
+    limit: int = LimitQuery,
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[str] = FieldsQuery,
+):
+    """List RSS feeds (keyset-paginated by id)."""
+    wanted = parse_fields(fields, _FEED_FIELDS)
+    q = select(RssFeed).options(projection(RssFeed, _FEED_FIELDS, wanted))
+    result = await db.execute(keyset(q, RssFeed.id, cursor, limit, descending=False))
+    rows = finish_page(result.scalars().all(), limit, response)
+    return [_feed_to_response(f, wanted) for f in rows]
 
 
 @router.get("/feeds/{id}")
-async def feeds_get(id: int, db: DbSession):
+async def feeds_get(id: int, db: ReadDbSession):
     """Get single feed."""
     r = await db.execute(select(RssFeed).where(RssFeed.id == id))
     f = r.scalar_one_or_none()
@@ -101,6 +125,7 @@ async def feeds_create(data: FeedCreate, db: DbSession):
     f = RssFeed(name=data.name, url=data.url, category=data.category, status=data.status or "active")
     db.add(f)
     await db.flush()
+    stats.record(db, total_feeds=1, active_feeds=int(f.status == "active"))
     await db.refresh(f)
     return _feed_to_response(f)
 
@@ -119,6 +144,7 @@ async def feeds_update(id: int, data: FeedUpdate, db: DbSession):
     if data.category is not None:
         f.category = data.category
     if data.status is not None:
+        stats.record(db, active_feeds=int(data.status == "active") - int(f.status == "active"))
         f.status = data.status
     await db.flush()
     await db.refresh(f)
@@ -133,6 +159,7 @@ async def feeds_delete(id: int, db: DbSession):
     if not f:
         raise HTTPException(status_code=404, detail="Feed not found")
     await db.delete(f)
+    stats.record(db, total_feeds=-1, active_feeds=-int(f.status == "active"))
     return None
 
 
@@ -141,38 +168,64 @@ async def feeds_delete(id: int, db: DbSession):
 # ---------------------------------------------------------------------------
 
 
-def _article_to_response(a: Article) -> dict:
-    return {
-        "id": a.id,
-        "feedId": a.rss_item_id,
-        "title": a.headline,
-        "url": a.article_url,
-        "sourceUrl": a.source,
-        "content": (a.body or "")[:1000] if a.body else None,
-        "status": "complete",
-        "topics": a.topics or [],
-        "entities": a.entities or [],
-        "fetchedAt": a.created_at.isoformat() if a.created_at else None,
-        "processedAt": a.updated_at.isoformat() if a.updated_at else None,
-    }
+def _article_content(a: Article) -> Optional[str]:
+    if a.body_preview is not None:
+        return a.body_preview or None
+    return a.body[:PREVIEW_CHARS] if a.body else None
+
+
+_ARTICLE_FIELDS: FieldSpec = {
+    "id": ((Article.id,), lambda a: a.id),
+    "feedId": ((Article.rss_item_id,), lambda a: a.rss_item_id),
+    "title": ((Article.headline,), lambda a: a.headline),
+    "url": ((Article.article_url,), lambda a: a.article_url),
+    "sourceUrl": ((Article.source,), lambda a: a.source),
+    "content": ((), _article_content),
+    "status": ((), lambda a: "complete"),
+    "topics": ((Article.topics,), lambda a: a.topics or []),
+    "entities": ((Article.entities,), lambda a: a.entities or []),
+    "fetchedAt": ((Article.created_at,), lambda a: _iso(a.created_at)),
+    "processedAt": ((Article.updated_at,), lambda a: _iso(a.updated_at)),
+}
+
+
+def _article_to_response(a: Article, fields: Optional[set[str]] = None) -> dict:
+    return render(a, _ARTICLE_FIELDS, fields)
 
 
 @router.get("/articles")
 async def articles_list(
-    db: DbSession,
+    db: ReadDbSession,
+    response: Response,
     status: Optional[str] = Query(None),
     feedId: Optional[int] = Query(None),
+    topic: Optional[str] = Query(None),
+    entity: Optional[str] = Query(None),
+    limit: int = LimitQuery,
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[str] = FieldsQuery,
 ):
-    """List articles."""
-    q = select(Article).order_by(Article.id.desc())
+    """List articles, newest first (keyset-paginated by id).
+
+    topic/entity filter by containment (served by the GIN indexes on articles.topics/entities).
+    """
+    wanted = parse_fields(fields, _ARTICLE_FIELDS)
+    q = select(Article).options(projection(Article, _ARTICLE_FIELDS, wanted))
+    if wanted is None or "content" in wanted:
+        q = q.options(with_expression(Article.body_preview, func.left(Article.body, PREVIEW_CHARS)))
     if feedId:
         q = q.where(Article.rss_item_id == feedId)
-    result = await db.execute(q)
-    return [_article_to_response(a) for a in result.scalars().all()]
+    if topic:
+        q = q.where(Article.topics.contains([topic]))
+    if entity:
+        q = q.where(Article.entities.contains([entity]))
+    result = await db.execute(keyset(q, Article.id, cursor, limit))
+    rows = finish_page(result.scalars().all(), limit, response)
+    return [_article_to_response(a, wanted) for a in rows]
 
 
 @router.get("/articles/{id}")
-async def articles_get(id: int, db: DbSession):
+async def articles_get(id: int, db: ReadDbSession):
     """Get single article."""
     r = await db.execute(select(Article).where(Article.id == id))
     a = r.scalar_one_or_none()
@@ -211,6 +264,7 @@ async def articles_delete(id: int, db: DbSession):
     if not a:
         raise HTTPException(status_code=404, detail="Article not found")
     await db.delete(a)
+    stats.record(db, total_articles=-1)
     return None
 
 
@@ -219,7 +273,9 @@ async def articles_delete(id: int, db: DbSession):
 # ---------------------------------------------------------------------------
 
 
-def _project_to_story(p: Project) -> dict:
+def _story_content(p: Project) -> str:
+    if p.content_preview is not None:
+        return p.content_preview
     content = ""
     if p.sections:
         for s in p.sections:
@@ -229,18 +285,51 @@ def _project_to_story(p: Project) -> dict:
                 content += s + "\n"
     if not content and p.lede:
         content = p.lede
-    return {
-        "id": p.id,
-        "articleId": p.origin_article_id,
-        "title": p.title,
-        "content": content or p.lede or "",
-        "summary": p.lede,
-        "status": p.status,
-        "charts": p.charts or [],
-        "datasets": p.datasets or [],
-        "publishedAt": p.published_at.isoformat() if p.published_at else None,
-        "createdAt": p.created_at.isoformat() if p.created_at else None,
-    }
+    return content or p.lede or ""
+
+
+_STORY_FIELDS: FieldSpec = {
+    "id": ((Project.id,), lambda p: p.id),
+    "articleId": ((Project.origin_article_id,), lambda p: p.origin_article_id),
+    "title": ((Project.title,), lambda p: p.title),
+    "content": ((), _story_content),
+    "summary": ((Project.lede,), lambda p: p.lede),
+    "status": ((Project.status,), lambda p: p.status),
+    "charts": ((Project.charts,), lambda p: p.charts or []),
+    "datasets": ((Project.datasets,), lambda p: p.datasets or []),
+    "publishedAt": ((Project.published_at,), lambda p: _iso(p.published_at)),
+    "createdAt": ((Project.created_at,), lambda p: _iso(p.created_at)),
+}
+
+
+def _story_content_preview() -> Any:
+    """_story_content in SQL, cut to PREVIEW_CHARS: every section's text in order, else the lede."""
+    sections = case(
+        (func.jsonb_typeof(Project.sections) == "array", Project.sections),
+        else_=func.jsonb_build_array(),
+    )
+    section = func.jsonb_array_elements(sections).table_valued(column("value", JSONB), with_ordinality="n")
+    value = section.c.value
+    section_text = case(
+        (
+            (func.jsonb_typeof(value) == "object") & value.has_key("content"),
+            func.coalesce(value["content"].astext, "") + "\n",
+        ),
+        (func.jsonb_typeof(value) == "string", value.op("#>>", return_type=Text)(literal([], ARRAY(Text))) + "\n"),
+    )
+    content = (
+        select(func.string_agg(section_text, aggregate_order_by(literal(""), section.c.n)))
+        .select_from(section)
+        .scalar_subquery()
+    )
+    return func.left(func.coalesce(func.nullif(content, ""), Project.lede, ""), PREVIEW_CHARS)
+
+
+_STORY_CONTENT_PREVIEW = _story_content_preview()
+
+
+def _project_to_story(p: Project, fields: Optional[set[str]] = None) -> dict:
+    return render(p, _STORY_FIELDS, fields)
 
 
 def _slugify(title: str) -> str:
@@ -248,17 +337,28 @@ def _slugify(title: str) -> str:
 
 
 @router.get("/stories")
-async def stories_list(db: DbSession, status: Optional[str] = Query(None)):
-    """List stories (projects)."""
-    q = select(Project).order_by(Project.id.desc())
+async def stories_list(
+    db: ReadDbSession,
+    response: Response,
+    status: Optional[str] = Query(None),
+    limit: int = LimitQuery,
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[str] = FieldsQuery,
+):
+    """List stories (projects), newest first (keyset-paginated by id)."""
+    wanted = parse_fields(fields, _STORY_FIELDS)
+    q = select(Project).options(projection(Project, _STORY_FIELDS, wanted))
+    if wanted is None or "content" in wanted:
+        q = q.options(with_expression(Project.content_preview, _STORY_CONTENT_PREVIEW))
     if status:
         q = q.where(Project.status == status)
-    result = await db.execute(q)
-    return [_project_to_story(p) for p in result.scalars().all()]
+    result = await db.execute(keyset(q, Project.id, cursor, limit))
+    rows = finish_page(result.scalars().all(), limit, response)
+    return [_project_to_story(p, wanted) for p in rows]
 
 
 @router.get("/stories/{id}")
-async def stories_get(id: int, db: DbSession):
+async def stories_get(id: int, db: ReadDbSession):
     """Get single story."""
     r = await db.execute(select(Project).where(Project.id == id))
     p = r.scalar_one_or_none()
@@ -287,6 +387,7 @@ async def stories_create(data: StoryCreate, db: DbSession):
     )
     db.add(p)
     await db.flush()
+    stats.record(db, total_stories=1, published_stories=int(p.status == "published"))
     await db.refresh(p)
     return _project_to_story(p)
 
@@ -305,6 +406,7 @@ async def stories_update(id: int, data: StoryUpdate, db: DbSession):
     if data.content is not None:
         p.sections = [{"type": "body", "content": data.content}]
     if data.status is not None:
+        stats.record(db, published_stories=int(data.status == "published") - int(p.status == "published"))
         p.status = data.status
     if data.charts is not None:
         p.charts = data.charts
@@ -324,10 +426,14 @@ async def stories_publish(id: int, db: DbSession):
         raise HTTPException(status_code=404, detail="Story not found")
     from datetime import UTC
 
+    newly_published = p.status != "published"
+    stats.record(db, published_stories=int(newly_published))
     p.status = "published"
     p.published_at = datetime.now(UTC)
     await db.flush()
     await db.refresh(p)
+    if newly_published:
+        webhooks.publish(db, "story.published", webhooks.story_published(p))
     return _project_to_story(p)
 
 
@@ -339,6 +445,7 @@ async def stories_delete(id: int, db: DbSession):
     if not p:
         raise HTTPException(status_code=404, detail="Story not found")
     await db.delete(p)
+    stats.record(db, total_stories=-1, published_stories=-int(p.status == "published"))
     return None
 
 
@@ -347,11 +454,42 @@ async def stories_delete(id: int, db: DbSession):
 # ---------------------------------------------------------------------------
 
 
-async def _forecast_to_response(db: DbSession, spec: ForecastSpecDB) -> dict:
-    r = await db.execute(
-        select(ForecastRun).where(ForecastRun.forecast_spec_id == spec.id).order_by(ForecastRun.run_at.desc()).limit(1)
+async def _distinct_latest(
+    db: DbSession, spec_ids: list[int], since: Optional[datetime] = None
+) -> dict[int, ForecastRun]:
+    q = (
+        select(ForecastRun)
+        .where(ForecastRun.forecast_spec_id.in_(spec_ids))
+        .distinct(ForecastRun.forecast_spec_id)
+        .order_by(ForecastRun.forecast_spec_id, ForecastRun.run_at.desc(), ForecastRun.id.desc())
     )
-    run = r.scalar_one_or_none()
+    if since is not None:
+        q = q.where(ForecastRun.run_at >= since)
+    result = await db.execute(q)
+    return {run.forecast_spec_id: run for run in result.scalars().all()}
+
+
+async def _latest_runs(db: DbSession, spec_ids: list[int]) -> dict[int, ForecastRun]:
+    """Latest ForecastRun per spec (DISTINCT ON, served by ix_forecast_runs_spec_id_run_at).
+
+    forecast_runs is partitioned by month of run_at and specs refresh often, so the
+    current and previous month are searched first (the rest are pruned); only specs
+    without a recent run fall back to every partition.
+    """
+    if not spec_ids:
+        return {}
+    runs = await _distinct_latest(db, spec_ids, since=partitions.recent_since())
+    missing = [spec_id for spec_id in spec_ids if spec_id not in runs]
+    if missing:
+        runs.update(await _distinct_latest(db, missing))
+    return runs
+
+
+async def _latest_run(db: DbSession, spec_id: int) -> Optional[ForecastRun]:
+    return (await _latest_runs(db, [spec_id])).get(spec_id)
+
+
+def _forecast_to_response(spec: ForecastSpecDB, run: Optional[ForecastRun]) -> dict:
     prob_raw = 0.5
     if run and run.result and isinstance(run.result, dict):
         prob_raw = run.result.get("point_estimate", run.result.get("probability", 0.5))
@@ -373,21 +511,29 @@ async def _forecast_to_response(db: DbSession, spec: ForecastSpecDB) -> dict:
 
 
 @router.get("/forecasts")
-async def forecasts_list(db: DbSession, status: Optional[str] = Query(None)):
-    """List forecasts."""
-    q = select(ForecastSpecDB).order_by(ForecastSpecDB.id.desc())
-    result = await db.execute(q)
-    return [await _forecast_to_response(db, s) for s in result.scalars().all()]
+async def forecasts_list(
+    db: ReadDbSession,
+    response: Response,
+    status: Optional[str] = Query(None),
+    limit: int = LimitQuery,
+    cursor: Optional[str] = CursorQuery,
+):
+    """List forecasts, newest first (keyset-paginated by id)."""
+    q = select(ForecastSpecDB)
+    result = await db.execute(keyset(q, ForecastSpecDB.id, cursor, limit))
+    specs = finish_page(result.scalars().all(), limit, response)
+    runs = await _latest_runs(db, [s.id for s in specs])
+    return [_forecast_to_response(s, runs.get(s.id)) for s in specs]
 
 
 @router.get("/forecasts/{id}")
-async def forecasts_get(id: int, db: DbSession):
+async def forecasts_get(id: int, db: ReadDbSession):
     """Get single forecast."""
     r = await db.execute(select(ForecastSpecDB).where(ForecastSpecDB.id == id))
     s = r.scalar_one_or_none()
     if not s:
         raise HTTPException(status_code=404, detail="Forecast not found")
-    return await _forecast_to_response(db, s)
+    return _forecast_to_response(s, await _latest_run(db, s.id))
 
 
 @router.post("/forecasts", status_code=201)
@@ -404,18 +550,21 @@ async def forecasts_create(data: ForecastCreate, db: DbSession):
     )
     db.add(spec)
     await db.flush()
+    stats.record(db, total_forecasts=1)
     run = ForecastRun(
         project_id=data.storyId,
         forecast_spec_id=spec.id,
         model_name=data.modelType,
         result={"point_estimate": prob, "probability": prob},
         calibration_flags=[],
-        metadata={},
+        run_metadata={},
     )
     db.add(run)
     await db.flush()
     await db.refresh(spec)
-    return await _forecast_to_response(db, spec)
+    await db.refresh(run)
+    webhooks.publish(db, "forecast.updated", webhooks.forecast_updated(spec, run))
+    return _forecast_to_response(spec, run)
 
 
 @router.put("/forecasts/{id}")
@@ -433,17 +582,16 @@ async def forecasts_update(id: int, data: ForecastUpdate, db: DbSession):
         spec.horizon = data.horizon
     if data.status is not None:
         pass  # spec doesn't have status, could add
+    run = await _latest_run(db, spec.id)
     if data.probability is not None:
         prob = data.probability / 100.0 if data.probability > 1 else data.probability
-        run_r = await db.execute(
-            select(ForecastRun).where(ForecastRun.forecast_spec_id == spec.id).order_by(ForecastRun.run_at.desc()).limit(1)
-        )
-        run = run_r.scalar_one_or_none()
         if run:
             run.result = {**(run.result or {}), "point_estimate": prob, "probability": prob}
     await db.flush()
     await db.refresh(spec)
-    return await _forecast_to_response(db, spec)
+    if run and data.probability is not None:
+        webhooks.publish(db, "forecast.updated", webhooks.forecast_updated(spec, run))
+    return _forecast_to_response(spec, run)
 
 
 @router.delete("/forecasts/{id}", status_code=204)
@@ -454,6 +602,7 @@ async def forecasts_delete(id: int, db: DbSession):
     spec = r.scalar_one_or_none()
     if spec:
         await db.delete(spec)
+        stats.record(db, total_forecasts=-1)
     return None
 
 
@@ -462,15 +611,32 @@ async def forecasts_delete(id: int, db: DbSession):
 # ---------------------------------------------------------------------------
 
 
+_DATA_SOURCE_FIELDS: FieldSpec = {
+    "id": ((DataSource.id,), lambda d: d.id),
+    "topic": ((DataSource.topic,), lambda d: d.topic),
+    "config": ((DataSource.config,), lambda d: d.config),
+    "createdAt": ((DataSource.created_at,), lambda d: _iso(d.created_at)),
+}
+
+
 @router.get("/data-sources")
-async def data_sources_list(db: DbSession):
-    """List data sources."""
-    result = await db.execute(select(DataSource).order_by(DataSource.id))
-    return [{"id": d.id, "topic": d.topic, "config": d.config, "createdAt": d.created_at.isoformat() if d.created_at else None} for d in result.scalars().all()]
+async def data_sources_list(
+    db: ReadDbSession,
+    response: Response,
+    limit: int = LimitQuery,
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[str] = FieldsQuery,
+):
+    """List data sources (keyset-paginated by id)."""
+    wanted = parse_fields(fields, _DATA_SOURCE_FIELDS)
+    q = select(DataSource).options(projection(DataSource, _DATA_SOURCE_FIELDS, wanted))
+    result = await db.execute(keyset(q, DataSource.id, cursor, limit, descending=False))
+    rows = finish_page(result.scalars().all(), limit, response)
+    return [render(d, _DATA_SOURCE_FIELDS, wanted) for d in rows]
 
 
 @router.get("/data-sources/{id}")
-async def data_sources_get(id: int, db: DbSession):
+async def data_sources_get(id: int, db: ReadDbSession):
     """Get data source."""
     r = await db.execute(select(DataSource).where(DataSource.id == id))
     d = r.scalar_one_or_none()
@@ -538,14 +704,33 @@ async def data_sources_delete(id: int, db: DbSession):
 # ---------------------------------------------------------------------------
 
 
+# List view never includes Dataset.data; fetch a single dataset for the blob
+_DATASET_FIELDS: FieldSpec = {
+    "id": ((Dataset.id,), lambda d: d.id),
+    "articleId": ((Dataset.article_id,), lambda d: d.article_id),
+    "topic": ((Dataset.topic,), lambda d: d.topic),
+    "source": ((Dataset.source,), lambda d: d.source),
+    "createdAt": ((Dataset.created_at,), lambda d: _iso(d.created_at)),
+}
+
+
 @router.get("/datasets")
-async def datasets_list(db: DbSession, topic: Optional[str] = Query(None)):
-    """List datasets."""
-    q = select(Dataset).order_by(Dataset.id.desc())
+async def datasets_list(
+    db: ReadDbSession,
+    response: Response,
+    topic: Optional[str] = Query(None),
+    limit: int = LimitQuery,
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[str] = FieldsQuery,
+):
+    """List datasets, newest first (keyset-paginated by id)."""
+    wanted = parse_fields(fields, _DATASET_FIELDS)
+    q = select(Dataset).options(projection(Dataset, _DATASET_FIELDS, wanted))
     if topic:
         q = q.where(Dataset.topic == topic)
-    result = await db.execute(q)
-    return [{"id": d.id, "articleId": d.article_id, "topic": d.topic, "source": d.source, "createdAt": d.created_at.isoformat() if d.created_at else None} for d in result.scalars().all()]
+    result = await db.execute(keyset(q, Dataset.id, cursor, limit))
+    rows = finish_page(result.scalars().all(), limit, response)
+    return [render(d, _DATASET_FIELDS, wanted) for d in rows]
 
 
 class DatasetCreate(BaseModel):
@@ -571,7 +756,7 @@ async def datasets_create(data: DatasetCreate, db: DbSession):
 
 
 @router.get("/datasets/{id}")
-async def datasets_get(id: int, db: DbSession):
+async def datasets_get(id: int, db: ReadDbSession):
     """Get dataset."""
     r = await db.execute(select(Dataset).where(Dataset.id == id))
     d = r.scalar_one_or_none()
@@ -601,18 +786,33 @@ async def datasets_delete(id: int, db: DbSession):
 # ---------------------------------------------------------------------------
 
 
+_USER_FIELDS: FieldSpec = {
+    "id": ((User.id,), lambda u: u.id),
+    "email": ((User.email,), lambda u: u.email),
+    "fullName": ((User.full_name,), lambda u: u.full_name),
+    "isActive": ((User.is_active,), lambda u: u.is_active),
+    "createdAt": ((User.created_at,), lambda u: _iso(u.created_at)),
+}
+
+
 @router.get("/users")
-async def users_list(db: DbSession):
-    """List users."""
-    result = await db.execute(select(User).order_by(User.id))
-    return [
-        {"id": u.id, "email": u.email, "fullName": u.full_name, "isActive": u.is_active, "createdAt": u.created_at.isoformat() if u.created_at else None}
-        for u in result.scalars().all()
-    ]
+async def users_list(
+    db: ReadDbSession,
+    response: Response,
+    limit: int = LimitQuery,
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[str] = FieldsQuery,
+):
+    """List users (keyset-paginated by id)."""
+    wanted = parse_fields(fields, _USER_FIELDS)
+    q = select(User).options(projection(User, _USER_FIELDS, wanted))
+    result = await db.execute(keyset(q, User.id, cursor, limit, descending=False))
+    rows = finish_page(result.scalars().all(), limit, response)
+    return [render(u, _USER_FIELDS, wanted) for u in rows]
 
 
 @router.get("/users/{id}")
-async def users_get(id: int, db: DbSession):
+async def users_get(id: int, db: ReadDbSession):
     """Get user."""
     r = await db.execute(select(User).where(User.id == id))
     u = r.scalar_one_or_none()
@@ -632,6 +832,7 @@ async def users_update(id: int, data: UserUpdate, db: DbSession):
         u.full_name = data.fullName
     if data.isActive is not None:
         u.is_active = data.isActive
+    principals.invalidate(db, u.id)
     await db.flush()
     await db.refresh(u)
     return {"id": u.id, "email": u.email, "fullName": u.full_name, "isActive": u.is_active, "createdAt": u.created_at.isoformat() if u.created_at else None}
@@ -645,6 +846,7 @@ async def users_delete(id: int, db: DbSession):
     if not u:
         raise HTTPException(status_code=404, detail="User not found")
     await db.delete(u)
+    principals.invalidate(db, u.id)
     return None
 
 
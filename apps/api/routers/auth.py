@@ -6,7 +6,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 
-from core.auth import create_access_token, decode_access_token, get_password_hash, verify_password
+from core import principals
+from core.auth import (
+    PasswordServiceBusy,
+    create_access_token,
+    decode_access_token,
+    hash_password,
+    verify_and_update_password,
+)
 from core.db import DbSession
 from models.user import User
 from schemas.auth import Token, UserCreate, UserLogin, UserResponse
@@ -15,11 +22,23 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 security = HTTPBearer(auto_error=False)
 
 
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
     db: DbSession,
 ) -> User:
-    """Dependency: require a valid JWT and return the current user."""
+    """Dependency: require a valid JWT and return the current user.
+
+    The user usually comes from the principal cache, detached from db; load it
+    through db before modifying it.
+    """
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,8 +59,7 @@ async def get_current_user(
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    user = await principals.get_principal(db, int(user_id), payload.get("iat"))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -65,9 +83,13 @@ async def signup(data: UserCreate, db: DbSession):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
+    try:
+        hashed_password = await hash_password(data.password)
+    except PasswordServiceBusy:
+        raise _busy() from None
     user = User(
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=hashed_password,
         full_name=data.full_name,
     )
     db.add(user)
@@ -81,7 +103,13 @@ async def login(data: UserLogin, db: DbSession):
     """Log in and return a JWT access token."""
     result = await db.execute(select(User).where(User.email == data.email))
     user = result.scalar_one_or_none()
-    if user is None or not verify_password(data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user is not None:
+        try:
+            valid, new_hash = await verify_and_update_password(data.password, user.hashed_password)
+        except PasswordServiceBusy:
+            raise _busy() from None
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -91,6 +119,8 @@ async def login(data: UserLogin, db: DbSession):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account disabled",
         )
+    if new_hash:
+        user.hashed_password = new_hash  # stored hash used a deprecated cost; committed with the request
     token = create_access_token(subject=user.id)
     return Token(access_token=token)
 
@@ -2,15 +2,19 @@
 
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 
+from core import catalog
+from core.webhooks import UnsafeWebhookURL, check_webhook_url
+from core.config import get_settings
 from core.db import DbSession
 from models.marketplace import MarketplaceApp, UserAppIntegration
 from apps.api.routers.auth import get_current_user
 from models.user import User
 
+settings = get_settings()
 router = APIRouter(prefix="/api", tags=["marketplace"])
 
 
@@ -40,49 +44,45 @@ class IntegrationCreate(BaseModel):
 # ---------------------------------------------------------------------------
 
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # Weak comparison (RFC 9110 13.1.2): compressing proxies may add W/
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _cached_response(request: Request, body: catalog.Body) -> Response:
+    headers = {
+        "ETag": body.etag,
+        "Cache-Control": f"public, max-age={settings.marketplace_cache_max_age_seconds}",
+    }
+    if _etag_matches(request, body.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body.content, media_type="application/json", headers=headers)
+
+
 @router.get("/marketplace/apps")
 async def marketplace_apps_list(
-    db: DbSession,
+    request: Request,
     category: Optional[str] = None,
 ):
-    """List all active marketplace apps. Optional category filter."""
-    q = select(MarketplaceApp).where(MarketplaceApp.is_active).order_by(MarketplaceApp.sort_order, MarketplaceApp.name)
-    if category:
-        q = q.where(MarketplaceApp.category == category)
-    result = await db.execute(q)
-    apps = result.scalars().all()
-    return [
-        {
-            "id": a.id,
-            "slug": a.slug,
-            "name": a.name,
-            "description": a.description,
-            "category": a.category,
-            "icon": a.icon,
-            "workflows": a.workflows or [],
-            "configSchema": a.config_schema or {},
-        }
-        for a in apps
-    ]
+    """List all active marketplace apps. Optional category filter.
+
+    Served from the in-process catalog; honours If-None-Match with 304.
+    """
+    current = await catalog.get_catalog()
+    return _cached_response(request, current.listing(category or None))
 
 
 @router.get("/marketplace/apps/{slug}")
-async def marketplace_app_get(slug: str, db: DbSession):
-    """Get single app by slug."""
-    r = await db.execute(select(MarketplaceApp).where(MarketplaceApp.slug == slug, MarketplaceApp.is_active))
-    app = r.scalar_one_or_none()
-    if not app:
+async def marketplace_app_get(slug: str, request: Request):
+    """Get single app by slug (from the in-process catalog; honours If-None-Match)."""
+    body = (await catalog.get_catalog()).app(slug)
+    if body is None:
         raise HTTPException(status_code=404, detail="App not found")
-    return {
-        "id": app.id,
-        "slug": app.slug,
-        "name": app.name,
-        "description": app.description,
-        "category": app.category,
-        "icon": app.icon,
-        "workflows": app.workflows or [],
-        "configSchema": app.config_schema or {},
-    }
+    return _cached_response(request, body)
 
 
 # ---------------------------------------------------------------------------
@@ -142,6 +142,13 @@ async def integration_connect(
     )
     integ = existing.scalar_one_or_none()
 
+    webhook_url = (data.config or {}).get("webhook_url")
+    if webhook_url:
+        try:
+            await check_webhook_url(str(webhook_url))
+        except UnsafeWebhookURL as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
     if integ:
         integ.config = data.config or {}
         integ.status = "active"
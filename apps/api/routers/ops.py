@@ -0,0 +1,123 @@
+"""Operational endpoints: Prometheus metrics and the readiness probe."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from redis.exceptions import RedisError
+from sqlalchemy import text
+
+from core.cache import get_redis
+from core.config import get_settings
+from core.db import engine
+from core.metrics import REGISTRY
+from core.storage import get_storage
+from workers.queues import QUEUES
+
+settings = get_settings()
+router = APIRouter(tags=["ops"])
+
+DEPENDENCY_UP = REGISTRY.gauge("dependency_up", "Last readiness check result (1 = ok)", ("dependency",))
+DEPENDENCY_LATENCY = REGISTRY.gauge(
+    "dependency_latency_seconds", "Last readiness check latency", ("dependency",)
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def _queue_depth() -> str:
+    lines = ["# HELP arq_queue_depth Jobs waiting in the ARQ queue", "# TYPE arq_queue_depth gauge"]
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for queue in QUEUES:
+                pipe.zcard(queue)
+            depths = await pipe.execute()
+    except RedisError:
+        return ""
+    lines += [f'arq_queue_depth{{queue="{queue}"}} {depth}' for queue, depth in zip(QUEUES, depths)]
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY.add_collector(_queue_depth)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (API, DB pool, ARQ queue, worker jobs, pipeline stages)."""
+    return PlainTextResponse(await REGISTRY.collect(), media_type=CONTENT_TYPE)
+
+
+async def _check_database() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _check_redis() -> None:
+    await get_redis().ping()
+
+
+async def _check_storage() -> None:
+    await get_storage().ping()
+
+
+def _checks() -> dict[str, Callable[[], Awaitable[None]]]:
+    checks = {"database": _check_database, "redis": _check_redis}
+    if settings.ready_check_storage:
+        checks["storage"] = _check_storage
+    return checks
+
+
+async def _run_check(name: str, check: Callable[[], Awaitable[None]]) -> dict[str, Any]:
+    started = time.perf_counter()
+    error = None
+    try:
+        await asyncio.wait_for(check(), timeout=settings.ready_check_timeout_seconds)
+    except asyncio.TimeoutError:
+        error = f"timed out after {settings.ready_check_timeout_seconds}s"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"[:200]
+    latency = time.perf_counter() - started
+    DEPENDENCY_UP.set(0 if error else 1, dependency=name)
+    DEPENDENCY_LATENCY.set(latency, dependency=name)
+    result: dict[str, Any] = {"ok": error is None, "latency_ms": round(latency * 1000, 1)}
+    if error:
+        result["error"] = error
+    return result
+
+
+async def _readiness() -> dict[str, Any]:
+    checks = _checks()
+    results = await asyncio.gather(*(_run_check(name, check) for name, check in checks.items()))
+    by_name = dict(zip(checks, results))
+    return {"status": "ready" if all(r["ok"] for r in results) else "unavailable", "checks": by_name}
+
+
+# Probes from every load balancer share one check per READY_CACHE_SECONDS
+_ready_cache: Optional[tuple[float, dict[str, Any]]] = None
+_ready_inflight: Optional[asyncio.Future] = None
+
+
+async def _cached_readiness() -> dict[str, Any]:
+    global _ready_cache, _ready_inflight
+    now = time.monotonic()
+    if _ready_cache is not None and now - _ready_cache[0] < settings.ready_cache_seconds:
+        return _ready_cache[1]
+    if _ready_inflight is not None:
+        return await asyncio.shield(_ready_inflight)
+    _ready_inflight = asyncio.ensure_future(_readiness())
+    try:
+        result = await asyncio.shield(_ready_inflight)
+        _ready_cache = (time.monotonic(), result)
+        return result
+    finally:
+        _ready_inflight = None
+
+
+@router.get("/ready")
+async def ready():
+    """Readiness probe: DB, Redis and storage checked concurrently; 503 if any is down or slow."""
+    result = await _cached_readiness()
+    return JSONResponse(result, status_code=200 if result["status"] == "ready" else 503)
@@ -0,0 +1,129 @@
+"""Full-text search over articles and stories (projects).
+
+Both tables carry a generated ``search_vector`` (weighted tsvector) with a GIN
+index. Matching and ranking happen in one UNION ALL query ordered by
+(rank, type, id); highlighting runs only for the rows of the returned page.
+"""
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from sqlalchemy import func, literal, literal_column, select, tuple_, union_all
+
+from apps.api.pagination import CursorQuery, decode_cursor, finish_page
+from core.db import ReadDbSession
+from models.article import Article
+from models.project import Project
+
+router = APIRouter(prefix="/api", tags=["search"])
+
+# Must match the configuration in the search_vector expressions (migration 009)
+TS_CONFIG = literal_column("'english'::regconfig")
+# ts_rank_cd normalization 32: rank / (rank + 1), keeps scores in [0, 1)
+RANK_NORMALIZATION = 32
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10"
+
+SearchType = Literal["all", "articles", "stories"]
+
+
+def _hits(kind: str, model, query):
+    rank = func.ts_rank_cd(model.search_vector, query, RANK_NORMALIZATION)
+    return select(
+        literal(kind).label("type"),
+        model.id.label("id"),
+        rank.label("rank"),
+    ).where(model.search_vector.op("@@")(query))
+
+
+def _cursor_key(cursor: Optional[str]) -> Optional[tuple[float, str, int]]:
+    key = decode_cursor(cursor)
+    if key is None:
+        return None
+    if len(key) != 3 or not isinstance(key[0], (int, float)) or not isinstance(key[1], str) or not isinstance(key[2], int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return float(key[0]), key[1], key[2]
+
+
+async def _article_details(db: ReadDbSession, ids: list[int], query) -> dict[int, dict]:
+    if not ids:
+        return {}
+    q = select(
+        Article.id,
+        Article.headline,
+        Article.article_url,
+        Article.source,
+        Article.created_at,
+        func.ts_headline(TS_CONFIG, func.coalesce(Article.dek, "") + " " + Article.body, query, HEADLINE_OPTIONS),
+    ).where(Article.id.in_(ids))
+    return {
+        row[0]: {
+            "title": row[1],
+            "url": row[2],
+            "source": row[3],
+            "createdAt": row[4].isoformat() if row[4] else None,
+            "snippet": row[5],
+        }
+        for row in (await db.execute(q)).all()
+    }
+
+
+async def _story_details(db: ReadDbSession, ids: list[int], query) -> dict[int, dict]:
+    if not ids:
+        return {}
+    q = select(
+        Project.id,
+        Project.title,
+        Project.slug,
+        Project.status,
+        Project.created_at,
+        func.ts_headline(TS_CONFIG, func.coalesce(Project.lede, ""), query, HEADLINE_OPTIONS),
+    ).where(Project.id.in_(ids))
+    return {
+        row[0]: {
+            "title": row[1],
+            "slug": row[2],
+            "status": row[3],
+            "createdAt": row[4].isoformat() if row[4] else None,
+            "snippet": row[5],
+        }
+        for row in (await db.execute(q)).all()
+    }
+
+
+@router.get("/search")
+async def search(
+    db: ReadDbSession,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=256, description="Web-search syntax: words, \"phrases\", -exclude, or"),
+    type: SearchType = Query("all"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = CursorQuery,
+):
+    """Ranked search across articles and stories, best match first (keyset-paginated by rank).
+
+    Each result has ``type`` ("article" or "story"), ``id``, ``rank`` and a ``snippet``
+    with matches wrapped in <mark>; the next page's cursor is in X-Next-Cursor.
+    """
+    query = func.websearch_to_tsquery(TS_CONFIG, q)
+    branches = []
+    if type in ("all", "articles"):
+        branches.append(_hits("article", Article, query))
+    if type in ("all", "stories"):
+        branches.append(_hits("story", Project, query))
+    hits = (union_all(*branches) if len(branches) > 1 else branches[0]).subquery("hits")
+
+    page = select(hits.c.type, hits.c.id, hits.c.rank)
+    key = _cursor_key(cursor)
+    if key is not None:
+        page = page.where(tuple_(hits.c.rank, hits.c.type, hits.c.id) < tuple_(*key))
+    page = page.order_by(hits.c.rank.desc(), hits.c.type.desc(), hits.c.id.desc()).limit(limit + 1)
+
+    rows = finish_page((await db.execute(page)).all(), limit, response, key=lambda r: (r.rank, r.type, r.id))
+    articles = await _article_details(db, [r.id for r in rows if r.type == "article"], query)
+    stories = await _story_details(db, [r.id for r in rows if r.type == "story"], query)
+    results = []
+    for r in rows:
+        details = (articles if r.type == "article" else stories).get(r.id)
+        if details is not None:  # deleted between the two queries
+            results.append({"type": r.type, "id": r.id, "rank": round(r.rank, 6), **details})
+    return results
@@ -1,15 +1,33 @@
-"""Authentication utilities: password hashing and JWT."""
+"""Authentication utilities: password hashing and JWT.
 
+bcrypt is deliberately slow, so request handlers use the async password service
+(hash_password / verify_and_update_password): hashing runs on a dedicated thread
+pool behind a concurrency cap, and callers beyond PASSWORD_HASH_MAX_QUEUE are
+rejected with PasswordServiceBusy instead of piling up. Queue depth, waits and
+rejections are exported on /metrics (password_hash_*).
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from typing import Any, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from core.config import get_settings
+from core.metrics import REGISTRY
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes below bcrypt_rounds count as deprecated and are upgraded on the next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,6 +40,127 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+PASSWORD_WAIT_SECONDS = REGISTRY.histogram(
+    "password_hash_wait_seconds",
+    "Time password operations waited for a bcrypt slot",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+PASSWORD_HASH_SECONDS = REGISTRY.histogram(
+    "password_hash_seconds", "bcrypt hash/verify time", buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+PASSWORD_REJECTED = REGISTRY.counter(
+    "password_hash_rejected_total", "Password operations rejected because PASSWORD_HASH_MAX_QUEUE were queued"
+)
+PASSWORD_REHASHED = REGISTRY.counter("password_hash_rehashed_total", "Stored hashes upgraded on login")
+
+
+class PasswordServiceBusy(Exception):
+    """Too many password operations are already queued."""
+
+
+@dataclass
+class PasswordHashStats:
+    in_flight: int = 0  # running on the pool
+    waiting: int = 0  # queued for a slot
+    max_waiting: int = 0
+    completed: int = 0
+    rejected: int = 0
+    rehashed: int = 0
+    total_wait_seconds: float = 0.0
+    total_hash_seconds: float = 0.0
+
+
+class PasswordService:
+    """Runs pwd_context on a bounded thread pool so bcrypt never blocks the event loop."""
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.stats = PasswordHashStats()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="bcrypt")
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self.stats.waiting >= self.max_queue:
+            self.stats.rejected += 1
+            PASSWORD_REJECTED.inc()
+            raise PasswordServiceBusy(f"{self.stats.waiting} password operations already queued")
+        queued_at = time.perf_counter()
+        self.stats.waiting += 1
+        self.stats.max_waiting = max(self.stats.max_waiting, self.stats.waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.stats.waiting -= 1
+        started = time.perf_counter()
+        self.stats.total_wait_seconds += started - queued_at
+        PASSWORD_WAIT_SECONDS.observe(started - queued_at)
+        self.stats.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.stats.in_flight -= 1
+            self.stats.completed += 1
+            elapsed = time.perf_counter() - started
+            self.stats.total_hash_seconds += elapsed
+            PASSWORD_HASH_SECONDS.observe(elapsed)
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """Verify; if the hash uses a deprecated scheme or cost, also return its replacement."""
+        valid, new_hash = await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+        if new_hash:
+            self.stats.rehashed += 1
+            PASSWORD_REHASHED.inc()
+        return valid, new_hash
+
+    def metrics(self) -> dict[str, Any]:
+        completed = self.stats.completed or 1
+        return {
+            **asdict(self.stats),
+            "avg_wait_ms": round(self.stats.total_wait_seconds / completed * 1000, 2),
+            "avg_hash_ms": round(self.stats.total_hash_seconds / completed * 1000, 2),
+        }
+
+
+_password_service: Optional[PasswordService] = None
+
+
+def get_password_service() -> PasswordService:
+    """Process-wide password service sized by PASSWORD_HASH_CONCURRENCY."""
+    global _password_service
+    if _password_service is None:
+        _password_service = PasswordService(settings.password_hash_concurrency, settings.password_hash_max_queue)
+    return _password_service
+
+
+def _password_gauge(stat: str):
+    def collect() -> dict[tuple[str, ...], float]:
+        service = _password_service
+        return {(): getattr(service.stats, stat) if service is not None else 0}
+
+    return collect
+
+
+REGISTRY.gauge("password_hash_in_flight", "bcrypt operations running", callback=_password_gauge("in_flight"))
+REGISTRY.gauge("password_hash_waiting", "Password operations queued for a slot", callback=_password_gauge("waiting"))
+
+
+async def hash_password(password: str) -> str:
+    """Async get_password_hash for request handlers."""
+    return await get_password_service().hash(password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Async verify_password that also returns a new hash when the stored one needs upgrading."""
+    return await get_password_service().verify_and_update(plain_password, hashed_password)
+
+
 def create_access_token(subject: str | int, extra_claims: dict[str, Any] | None = None) -> str:
     """Create a JWT access token."""
     now = datetime.now(UTC)
@@ -0,0 +1,168 @@
+"""Public marketplace catalog, served from memory with ETags.
+
+The active apps are loaded once and kept as pre-serialized JSON bodies with a
+content hash (the ETag), so catalog requests cost neither a query nor a JSON
+encode. Changes are signalled through a version counter in Redis: any commit
+that touches a MarketplaceApp increments it (``invalidate()`` does the same for
+writes outside the ORM), and every process re-reads the version at most every
+MARKETPLACE_CATALOG_CHECK_SECONDS before trusting its copy.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from core.cache import get_redis
+from core.config import get_settings
+from core.db import async_session_maker
+from models.marketplace import MarketplaceApp
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "probable:marketplace:catalog_version"
+_CHANGED_INFO_KEY = "marketplace_catalog_changed"
+_invalidate_tasks: set[asyncio.Task] = set()
+
+
+@dataclass
+class Body:
+    """Serialized response and its strong ETag."""
+
+    content: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, payload: Any) -> "Body":
+        content = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return cls(content, '"' + hashlib.sha256(content).hexdigest()[:32] + '"')
+
+
+EMPTY_LIST = Body.of([])
+
+
+def app_to_dict(a: MarketplaceApp) -> dict[str, Any]:
+    return {
+        "id": a.id,
+        "slug": a.slug,
+        "name": a.name,
+        "description": a.description,
+        "category": a.category,
+        "icon": a.icon,
+        "workflows": a.workflows or [],
+        "configSchema": a.config_schema or {},
+    }
+
+
+@dataclass
+class Catalog:
+    version: Optional[str]
+    apps: list[dict[str, Any]]
+    built_at: float
+    checked_at: float
+    _lists: dict[Optional[str], Body] = field(default_factory=dict)
+    _apps: dict[str, Body] = field(default_factory=dict)
+
+    def listing(self, category: Optional[str] = None) -> Body:
+        """All active apps in display order, optionally one category (bodies built on first use).
+
+        Only categories that exist are cached, so arbitrary ?category= values can't grow memory.
+        """
+        body = self._lists.get(category)
+        if body is None:
+            apps = self.apps if category is None else [a for a in self.apps if a["category"] == category]
+            if not apps and category is not None:
+                return EMPTY_LIST
+            body = self._lists[category] = Body.of(apps)
+        return body
+
+    def app(self, slug: str) -> Optional[Body]:
+        body = self._apps.get(slug)
+        if body is None:
+            found = next((a for a in self.apps if a["slug"] == slug), None)
+            if found is None:
+                return None
+            body = self._apps[slug] = Body.of(found)
+        return body
+
+
+_catalog: Optional[Catalog] = None
+_lock = asyncio.Lock()
+
+
+async def _current_version() -> Optional[str]:
+    try:
+        return await get_redis().get(VERSION_KEY) or "0"
+    except RedisError:
+        return None
+
+
+async def _build(version: Optional[str]) -> Catalog:
+    # Always the primary: a lagging replica could store old rows under the new version until the next change
+    q = select(MarketplaceApp).where(MarketplaceApp.is_active).order_by(MarketplaceApp.sort_order, MarketplaceApp.name)
+    async with async_session_maker() as session:
+        apps = [app_to_dict(a) for a in (await session.execute(q)).scalars().all()]
+    now = time.monotonic()
+    return Catalog(version=version, apps=apps, built_at=now, checked_at=now)
+
+
+async def get_catalog() -> Catalog:
+    """The in-process catalog, rebuilt (once, however many requests are waiting) when its version moved."""
+    global _catalog
+    cached = _catalog
+    now = time.monotonic()
+    if cached is not None and now - cached.checked_at < settings.marketplace_catalog_check_seconds:
+        return cached
+
+    async with _lock:
+        if _catalog is not None and _catalog is not cached:  # another request already refreshed it
+            return _catalog
+        version = await _current_version()
+        # Without Redis the version is unknown; the copy is then rebuilt every check interval
+        if cached is not None and version is not None and version == cached.version:
+            cached.checked_at = now
+            return cached
+        _catalog = await _build(version)
+        return _catalog
+
+
+async def invalidate() -> None:
+    """Bump the catalog version so every process rebuilds on its next check."""
+    global _catalog
+    _catalog = None
+    try:
+        await get_redis().incr(VERSION_KEY)
+    except RedisError:
+        logger.warning("Could not bump the marketplace catalog version")
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, flush_context, instances) -> None:
+    if any(isinstance(obj, MarketplaceApp) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_CHANGED_INFO_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    if not session.info.pop(_CHANGED_INFO_KEY, False):
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(invalidate())
+    _invalidate_tasks.add(task)
+    task.add_done_callback(_invalidate_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_CHANGED_INFO_KEY, None)
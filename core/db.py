@@ -1,23 +1,147 @@
-"""Database connection and session management."""
+"""Database connection and session management.
 
+Pool sizing, timeouts, recycling and pre-ping come from DB_POOL_* settings, so each
+process type (API, worker) can be sized through its environment; DB_PGBOUNCER=true
+disables pooling and prepared-statement caches for pgbouncer transaction pooling.
+
+Writes and most reads use ``engine`` (the primary). When DATABASE_REPLICA_URL is
+set, read-only handlers take ``ReadDbSession`` instead of ``DbSession``; they are
+routed to ``replica_engine`` while its replication lag is within
+REPLICA_MAX_LAG_SECONDS, and fall back to the primary otherwise.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
 from collections.abc import AsyncGenerator
-from typing import Annotated
+from typing import Annotated, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Depends
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from core.config import get_settings
+from core.instrumentation import InstrumentedNullPool, InstrumentedPool, instrument_engine
+from core.metrics import REGISTRY
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    if settings.db_pgbouncer:
+        # pgbouncer (transaction pooling) owns the pool, and a server connection can change
+        # between transactions, so prepared statements must not be cached or reused by name
+        new_engine = create_async_engine(
+            make_url(url).update_query_dict({"prepared_statement_cache_size": "0"}),
+            echo=settings.debug,
+            poolclass=InstrumentedNullPool,
+            connect_args={"statement_cache_size": 0, "prepared_statement_name_func": _unique_statement_name},
+        )
+    else:
+        new_engine = create_async_engine(
+            url,
+            echo=settings.debug,
+            poolclass=InstrumentedPool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_use_lifo=True,  # idle connections beyond current load age out via recycle
+        )
+    instrument_engine(new_engine)
+    return new_engine
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4().hex}__"
+
+
+engine = _create_engine(settings.database_url_async)
+replica_engine: Optional[AsyncEngine] = (
+    _create_engine(settings.database_replica_url_async) if settings.database_replica_url else None
+)
+
+ENGINES: dict[str, AsyncEngine] = {"primary": engine, **({"replica": replica_engine} if replica_engine else {})}
+_peak_checked_out: dict[str, int] = dict.fromkeys(ENGINES, 0)
+
 
-engine = create_async_engine(
-    settings.database_url_async,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+def pool_stats(name: str) -> dict[str, int]:
+    """size/checked_out/checked_in/overflow for a queue pool (empty under NullPool)."""
+    pool = ENGINES[name].pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+def _pool_gauge(stat: str):
+    def collect() -> dict[tuple[str, ...], float]:
+        values = {}
+        for name in ENGINES:
+            current = pool_stats(name)
+            if stat in current:
+                values[(name,)] = current[stat]
+        return values
+
+    return collect
+
+
+REGISTRY.gauge("db_pool_size", "Configured pool size", ("engine",), callback=_pool_gauge("size"))
+REGISTRY.gauge("db_pool_checked_out", "Connections in use", ("engine",), callback=_pool_gauge("checked_out"))
+REGISTRY.gauge("db_pool_checked_in", "Idle pooled connections", ("engine",), callback=_pool_gauge("checked_in"))
+REGISTRY.gauge(
+    "db_pool_overflow", "Connections beyond pool_size (negative: unopened)", ("engine",), callback=_pool_gauge("overflow")
 )
 
+
+def _track_peak(name: str, pooled_engine: AsyncEngine) -> None:
+    @event.listens_for(pooled_engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        stats = pool_stats(name)
+        if stats:
+            _peak_checked_out[name] = max(_peak_checked_out[name], stats["checked_out"])
+
+
+for _name, _engine in ENGINES.items():
+    _track_peak(_name, _engine)
+
+
+async def _log_pool_stats(process: str, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        for name in ENGINES:
+            stats = pool_stats(name)
+            if not stats:
+                continue
+            logger.info(
+                "DB pool [%s/%s] size=%d checked_out=%d peak=%d checked_in=%d overflow=%d",
+                process,
+                name,
+                stats["size"],
+                stats["checked_out"],
+                _peak_checked_out[name],
+                stats["checked_in"],
+                stats["overflow"],
+            )
+            _peak_checked_out[name] = stats["checked_out"]
+
+
+def start_pool_stats_logger(process: str) -> Optional[asyncio.Task]:
+    """Log pool usage and the peak since the last line every DB_POOL_STATS_INTERVAL_SECONDS (0 = off)."""
+    if settings.db_pool_stats_interval_seconds <= 0 or settings.db_pgbouncer:
+        return None
+    return asyncio.get_running_loop().create_task(_log_pool_stats(process, settings.db_pool_stats_interval_seconds))
+
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -25,6 +149,69 @@ async_session_maker = async_sessionmaker(
     autocommit=False,
     autoflush=False,
 )
+replica_session_maker = (
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    if replica_engine is not None
+    else None
+)
+
+READ_ROUTING = REGISTRY.counter("db_read_routing_total", "Read-only sessions by target", ("target",))
+REPLICA_LAG = REGISTRY.gauge("db_replica_lag_seconds", "Replication lag at the last check (-1 = unreachable)")
+
+# 0 when the replica has replayed everything it received (an idle primary is not lag);
+# NULL when it has never replayed a transaction
+_REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """Periodically measured replica lag; decides whether reads may use the replica."""
+
+    def __init__(self, replica: AsyncEngine):
+        self.replica = replica
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self._checked_at = float("-inf")
+        self._refreshing = False
+
+    async def _measure(self) -> Optional[float]:
+        async with self.replica.connect() as conn:
+            return (await conn.execute(_REPLICA_LAG_SQL)).scalar()
+
+    async def _refresh(self) -> None:
+        self._refreshing = True
+        try:
+            lag = await asyncio.wait_for(self._measure(), timeout=settings.replica_lag_check_timeout_seconds)
+            self.lag = float(lag) if lag is not None else None
+            healthy = self.lag is not None and self.lag <= settings.replica_max_lag_seconds
+        except Exception as e:
+            self.lag = None
+            healthy = False
+            logger.warning("Replica check failed, reading from primary: %s", e)
+        finally:
+            self._refreshing = False
+            self._checked_at = time.monotonic()
+        if healthy != self.healthy:
+            logger.warning("Replica %s (lag %s s)", "in use" if healthy else "bypassed", self.lag)
+        self.healthy = healthy
+        REPLICA_LAG.set(self.lag if self.lag is not None else -1)
+
+    async def use_replica(self) -> bool:
+        """Current routing decision; refreshed at most every REPLICA_LAG_CHECK_INTERVAL_SECONDS."""
+        stale = time.monotonic() - self._checked_at >= settings.replica_lag_check_interval_seconds
+        if stale and not self._refreshing:
+            await self._refresh()
+        return self.healthy
+
+
+replica_monitor: Optional[ReplicaMonitor] = ReplicaMonitor(replica_engine) if replica_engine is not None else None
 
 
 class Base(DeclarativeBase):
@@ -46,5 +233,21 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-# Type alias for dependency injection
-DbSession = Annotated[AsyncSession, get_db]
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for read-only handlers: a replica session when it is caught up, else the primary.
+
+    Replica reads may trail recent writes by up to REPLICA_MAX_LAG_SECONDS.
+    """
+    if replica_monitor is None or not await replica_monitor.use_replica():
+        READ_ROUTING.inc(target="primary")
+        async with async_session_maker() as session:
+            yield session
+        return
+    READ_ROUTING.inc(target="replica")
+    async with replica_session_maker() as session:
+        yield session
+
+
+# Type aliases for dependency injection
+DbSession = Annotated[AsyncSession, Depends(get_db)]
+ReadDbSession = Annotated[AsyncSession, Depends(get_read_db)]
@@ -0,0 +1,186 @@
+"""SQL instrumentation: per-request query count, DB time and pool wait.
+
+``instrument_engine`` hooks SQLAlchemy's before/after_cursor_execute events and
+attributes every statement to the ``DbStats`` in the current context (set per
+request by the API middleware, or with ``track()`` elsewhere). Statements slower
+than DB_SLOW_QUERY_MS are logged with normalised SQL and, for a sampled
+fraction of SELECTs, an EXPLAIN ANALYZE plan run on a separate connection.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from core.config import get_settings
+from core.metrics import REGISTRY
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_START_KEY = "instrumentation_query_start"
+
+SLOW_QUERIES = REGISTRY.counter("db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_MS")
+POOL_WAIT = REGISTRY.histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+
+@dataclass
+class DbStats:
+    """Database work attributed to one request or job."""
+
+    route: str = "-"  # the raw request path until the API sets the route template (apps.api.middleware)
+    queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    slow_queries: int = 0
+
+
+_current: ContextVar[Optional[DbStats]] = ContextVar("db_stats", default=None)
+_explaining: ContextVar[bool] = ContextVar("db_explaining", default=False)
+_explain_tasks: set[asyncio.Task] = set()
+
+_WS_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|%s|\?")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SELECT_RE = re.compile(r"\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and replace literals/placeholders with ? so similar queries group together."""
+    sql = _WS_RE.sub(" ", statement).strip()
+    sql = _STRING_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _IN_LIST_RE.sub("(...)", sql)
+
+
+def current() -> Optional[DbStats]:
+    return _current.get()
+
+
+def start(route: str = "-") -> tuple[DbStats, Any]:
+    """Begin attributing statements in this context to a fresh DbStats. Returns (stats, reset token)."""
+    stats = DbStats(route=route)
+    return stats, _current.set(stats)
+
+
+def stop(token: Any) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def track(route: str = "-") -> Iterator[DbStats]:
+    """Collect DbStats for a block of code (jobs, scripts, benchmarks)."""
+    stats, token = start(route)
+    try:
+        yield stats
+    finally:
+        stop(token)
+
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            POOL_WAIT.observe(waited)
+            stats = _current.get()
+            if stats is not None:
+                stats.pool_wait_seconds += waited
+
+
+class InstrumentedPool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """Queue pool with checkout wait timing."""
+
+
+class InstrumentedNullPool(_TimedCheckout, NullPool):
+    """No pooling (behind pgbouncer); the "wait" is the time to open a connection."""
+
+
+def _is_select(statement: str) -> bool:
+    return _SELECT_RE.match(statement) is not None
+
+
+async def _explain(engine: AsyncEngine, statement: str, parameters: Any, normalized: str) -> None:
+    _explaining.set(True)
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in result.all())
+            await conn.rollback()
+        logger.warning("EXPLAIN ANALYZE for slow query %s\n%s", normalized, plan)
+    except Exception as e:
+        logger.info("Could not EXPLAIN slow query %s: %s", normalized, e)
+
+
+def _schedule_explain(engine: AsyncEngine, statement: str, parameters: Any, normalized: str) -> None:
+    if _explain_tasks:  # one at a time: EXPLAIN ANALYZE runs the query again
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_explain(engine, statement, parameters, normalized))
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach the query hooks to an async engine."""
+    sync_engine = engine.sync_engine
+    slow_seconds = settings.db_slow_query_ms / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info[_START_KEY].pop()
+        if _explaining.get():
+            return
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if elapsed < slow_seconds:
+            return
+        route = stats.route if stats is not None else "-"
+        normalized = normalize_sql(statement)
+        SLOW_QUERIES.inc()
+        if stats is not None:
+            stats.slow_queries += 1
+        logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, route, normalized)
+        if (
+            not executemany
+            and settings.db_explain_sample_rate > 0
+            and _is_select(statement)
+            and random.random() < settings.db_explain_sample_rate
+        ):
+            _schedule_explain(engine, statement, parameters, normalized)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_START_KEY):
+            conn.info[_START_KEY].pop()
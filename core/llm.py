@@ -0,0 +1,228 @@
+"""LLM calls for agents, behind a content-addressed response cache.
+
+Responses are keyed on a hash of (provider, model, messages, parameters) and
+served from an in-process LRU (with TTL), then Redis, before the provider is
+called. Identical requests already in flight share one provider call
+(single-flight). LLM_PROVIDER=fake swaps in a deterministic offline provider.
+
+Agents reach the process-wide client as ``BaseAgent.llm`` (``get_llm()``). Every
+cached completion is timed into the shared llm_request_duration_seconds
+histogram by source, so /metrics shows hits, misses and coalesced calls from
+all worker processes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+
+from core.cache import TTLCache, get_redis
+from core.config import get_settings
+from core.metrics import REGISTRY
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+Messages = list[dict[str, str]]
+
+# source: memory | redis (cache hits), coalesced (single-flight waiter), provider (miss), error
+LLM_SECONDS = REGISTRY.shared_histogram(
+    "llm_request_duration_seconds",
+    "Cached LLM completion time by where the response came from",
+    ("source",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+
+class LLMProvider(ABC):
+    """A chat-completion backend."""
+
+    name: str = "base"
+
+    @abstractmethod
+    async def complete(self, model: str, messages: Messages, params: dict[str, Any]) -> str:
+        """Return the assistant message text."""
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions."""
+
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = None):
+        from openai import AsyncOpenAI
+
+        self._client = AsyncOpenAI(api_key=api_key or settings.openai_api_key)
+
+    async def complete(self, model: str, messages: Messages, params: dict[str, Any]) -> str:
+        response = await self._client.chat.completions.create(model=model, messages=messages, **params)
+        return response.choices[0].message.content or ""
+
+
+class FakeLLMProvider(LLMProvider):
+    """Deterministic offline provider: canned responses or an echo of the request hash."""
+
+    name = "fake"
+
+    def __init__(self, responses: Optional[dict[str, str]] = None, delay: float = 0.0):
+        self.responses = responses or {}
+        self.delay = delay
+        self.calls = 0
+
+    async def complete(self, model: str, messages: Messages, params: dict[str, Any]) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        prompt = messages[-1]["content"] if messages else ""
+        if prompt in self.responses:
+            return self.responses[prompt]
+        return f"[{model}] {hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]}"
+
+
+def cache_key(provider: str, model: str, messages: Messages, params: dict[str, Any]) -> str:
+    """Stable hash of everything that determines a response."""
+    canonical = json.dumps(
+        {"provider": provider, "model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0  # requests that waited on an identical in-flight call
+    redis_errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.memory_hits + self.redis_hits + self.misses + self.coalesced
+        return (total - self.misses) / total if total else 0.0
+
+
+class CachedLLM:
+    """LLM client with memory -> Redis -> provider lookup and single-flight de-duplication."""
+
+    redis_prefix = "probable:llm:"
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        model: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        use_redis: Optional[bool] = None,
+    ):
+        self.provider = provider
+        self.model = model or settings.openai_model
+        self.ttl_seconds = ttl_seconds or settings.llm_cache_ttl_seconds
+        self.use_redis = settings.llm_cache_redis if use_redis is None else use_redis
+        self.memory = TTLCache(max_entries or settings.llm_cache_max_entries, self.ttl_seconds)
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def _redis_get(self, key: str) -> Optional[str]:
+        if not self.use_redis:
+            return None
+        try:
+            return await get_redis().get(self.redis_prefix + key)
+        except RedisError:
+            self.stats.redis_errors += 1
+            return None
+
+    async def _redis_set(self, key: str, value: str) -> None:
+        if not self.use_redis:
+            return
+        try:
+            await get_redis().set(self.redis_prefix + key, value, ex=self.ttl_seconds)
+        except RedisError:
+            self.stats.redis_errors += 1
+
+    async def complete(
+        self,
+        prompt: str | Messages,
+        *,
+        model: Optional[str] = None,
+        system: Optional[str] = None,
+        cache: bool = True,
+        **params: Any,
+    ) -> str:
+        """Complete a prompt (string or chat messages). Extra kwargs go to the provider."""
+        messages: Messages = [{"role": "user", "content": prompt}] if isinstance(prompt, str) else list(prompt)
+        if system:
+            messages = [{"role": "system", "content": system}, *messages]
+        model = model or self.model
+        if not cache:
+            return await self.provider.complete(model, messages, params)
+
+        key = cache_key(self.provider.name, model, messages, params)
+        started = time.perf_counter()
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats.memory_hits += 1
+            LLM_SECONDS.observe_nowait(time.perf_counter() - started, source="memory")
+            return value
+
+        while (pending := self._inflight.get(key)) is not None:
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not this caller: retry (the first to do so leads)
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            finally:
+                LLM_SECONDS.observe_nowait(time.perf_counter() - started, source="coalesced")
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        source = "error"
+        try:
+            value = await self._redis_get(key)
+            if value is not None:
+                self.stats.redis_hits += 1
+                source = "redis"
+            else:
+                self.stats.misses += 1
+                value = await self.provider.complete(model, messages, params)
+                source = "provider"
+                await self._redis_set(key, value)
+            self.memory.set(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved so lone failures don't log "never retrieved"
+            raise
+        except BaseException:
+            # Cancelled (or interrupted): waiters see a cancelled future and retry rather than fail
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+            LLM_SECONDS.observe_nowait(time.perf_counter() - started, source=source)
+
+    def metrics(self) -> dict[str, Any]:
+        return {**asdict(self.stats), "hit_ratio": self.stats.hit_ratio, "memory_entries": len(self.memory)}
+
+
+_llm: Optional[CachedLLM] = None
+
+
+def get_llm() -> CachedLLM:
+    """Process-wide cached LLM client for the configured provider (LLM_PROVIDER=openai | fake)."""
+    global _llm
+    if _llm is None:
+        provider: LLMProvider = FakeLLMProvider() if settings.llm_provider == "fake" else OpenAIProvider()
+        _llm = CachedLLM(provider)
+    return _llm
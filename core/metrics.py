@@ -0,0 +1,277 @@
+"""In-process metrics (counters, gauges, histograms) in the Prometheus text format.
+
+Metrics are module-level objects registered on ``REGISTRY`` at import time and
+updated from request, database and worker code. Everything runs on the event
+loop thread, so updates are plain dict operations.
+
+Work that happens in other processes (ARQ jobs, pipeline stages) is recorded in
+``SharedHistogram``s: observations are added to a Redis hash and read back when
+the API renders /metrics, so one scrape covers API and workers.
+"""
+
+import asyncio
+import json
+import logging
+import math
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from core.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(line + "\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {} if self.labelnames else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """A value that goes up and down; optionally computed at scrape time by a callback."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], dict[LabelValues, float]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> Iterable[str]:
+        values = self.callback() if self.callback else self._values
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+        if not self.labelnames:
+            self._counts[()] = [0] * len(self.buckets)
+            self._sums[()] = 0.0
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * len(self.buckets)
+            self._sums[key] = 0.0
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        self._sums[key] += value
+
+    def samples(self) -> Iterable[str]:
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class SharedHistogram:
+    """Histogram aggregated in Redis across processes (HINCRBY per bucket)."""
+
+    key_prefix = "probable:metrics:"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.key = self.key_prefix + name
+        self._tasks: set[asyncio.Task] = set()
+
+    async def observe(self, value: float, **labels: str) -> None:
+        key = [str(labels[n]) for n in self.labelnames]
+        bucket = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                pipe.hincrby(self.key, json.dumps([*key, bucket]), 1)
+                pipe.hincrbyfloat(self.key, json.dumps([*key, "sum"]), value)
+                await pipe.execute()
+        except RedisError:
+            logger.debug("Could not record %s", self.name)
+
+    def observe_nowait(self, value: float, **labels: str) -> None:
+        """observe() from sync code running on an event loop (fire and forget)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.observe(value, **labels))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def render(self) -> str:
+        local = Histogram(self.name, self.documentation, self.labelnames, self.buckets[:-1])
+        try:
+            fields = await get_redis().hgetall(self.key)
+        except RedisError:
+            return local.render()
+        for field, raw in fields.items():
+            *key, slot = json.loads(field)
+            key = tuple(key)
+            if key not in local._counts:
+                local._counts[key] = [0] * len(local.buckets)
+                local._sums[key] = 0.0
+            if slot == "sum":
+                local._sums[key] = float(raw)
+            else:
+                local._counts[key][slot] = int(raw)
+        return local.render()
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Awaitable[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def shared_histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> SharedHistogram:
+        metric = SharedHistogram(name, documentation, labelnames, buckets)
+        self.add_collector(metric.render)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Awaitable[str]]) -> None:
+        """Register an async callable returning exposition text, run at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4) for in-process metrics."""
+        return "".join(metric.render() for metric in self._metrics.values())
+
+    async def collect(self) -> str:
+        """render() plus every async collector (shared histograms, Redis-backed gauges)."""
+        parts = await asyncio.gather(*(collector() for collector in self._collectors))
+        return self.render() + "".join(parts)
+
+
+REGISTRY = Registry()
+
+# Recorded by worker processes and the pipeline; rendered by the API's /metrics
+JOB_SECONDS = REGISTRY.shared_histogram(
+    "arq_job_duration_seconds",
+    "ARQ job run time",
+    ("function", "status"),
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+PIPELINE_STAGE_SECONDS = REGISTRY.shared_histogram(
+    "pipeline_stage_seconds",
+    "Agent pipeline stage run time by the PipelineStatus it moves the article to",
+    ("stage", "status"),
+    buckets=(0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
@@ -0,0 +1,124 @@
+"""Monthly range partitions for the append-only tables (rss_items, forecast_runs).
+
+Partitions are named ``<table>_pYYYYMM`` and cover one calendar month (UTC) of the
+partition column; ``<table>_default`` catches rows outside every monthly range
+(e.g. when maintenance fell behind), so inserts never fail for lack of a
+partition. Migration 010 creates the partitioned tables; the maintenance job in
+``workers.retention`` creates upcoming months ahead of time, moves rows out of the
+default partition into their months, and archives and drops months past
+retention. Helpers take a raw asyncpg connection so they can be used next to
+COPY (archiving, bulk loads).
+"""
+
+import logging
+import re
+from datetime import UTC, date, datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table -> partition key column
+PARTITIONED = {"rss_items": "fetched_at", "forecast_runs": "run_at"}
+
+_NAME_RE = re.compile(r"^(?P<table>[a-z_]+)_p(?P<year>\d{4})(?P<month>\d{2})$")
+
+
+def month_start(value: date | datetime) -> date:
+    if isinstance(value, datetime):
+        value = value.astimezone(UTC).date()
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def recent_since(months: int = 1) -> datetime:
+    """Start of the month ``months`` before the current one: a run_at/fetched_at bound that
+    lets Postgres prune every older partition."""
+    start = add_months(month_start(datetime.now(UTC)), -months)
+    return datetime(start.year, start.month, 1, tzinfo=UTC)
+
+
+def _bound(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=UTC)
+
+
+async def ensure_partitions(conn: Any, table: str, first: date, last: date) -> list[str]:
+    """Create the monthly partitions of table for first..last (inclusive) that are missing.
+
+    Rows of a month that landed in the default partition are moved into the new
+    partition (Postgres refuses to create it while the default holds any of them).
+    """
+    existing = {name for name, _ in await list_partitions(conn, table)}
+    column = PARTITIONED[table]
+    default = default_name(table)
+    created = []
+    month = month_start(first)
+    while month <= last:
+        name = partition_name(table, month)
+        if name not in existing:
+            upper = add_months(month, 1)
+            bounds = f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+            async with conn.transaction():
+                # Blocks inserts into the default until the month is attached
+                await conn.execute(f"LOCK TABLE {default} IN SHARE ROW EXCLUSIVE MODE")
+                stray = await conn.fetchval(
+                    f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {column} >= $1 AND {column} < $2)",
+                    _bound(month),
+                    _bound(upper),
+                )
+                if stray:
+                    await conn.execute(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+                    status = await conn.execute(
+                        f"WITH moved AS (DELETE FROM {default} WHERE {column} >= $1 AND {column} < $2 RETURNING *) "
+                        f"INSERT INTO {name} SELECT * FROM moved",
+                        _bound(month),
+                        _bound(upper),
+                    )
+                    await conn.execute(f"ALTER TABLE {table} ATTACH PARTITION {name} {bounds}")
+                    logger.warning("Moved %s rows from %s into %s", status.split()[-1], default, name)
+                else:
+                    await conn.execute(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} {bounds}")
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+async def default_months(conn: Any, table: str) -> list[date]:
+    """Months (UTC) that have rows in table's default partition, oldest first."""
+    rows = await conn.fetch(
+        f"SELECT DISTINCT date_trunc('month', {PARTITIONED[table]} AT TIME ZONE 'UTC')::date AS month "
+        f"FROM {default_name(table)} ORDER BY month"
+    )
+    return [row["month"] for row in rows]
+
+
+async def list_partitions(conn: Any, table: str) -> list[tuple[str, date]]:
+    """(partition name, month) for table's monthly partitions, oldest first."""
+    rows = await conn.fetch(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = $1
+        """,
+        table,
+    )
+    partitions = []
+    for row in rows:
+        match = _NAME_RE.match(row["relname"])
+        if match and match["table"] == table:
+            partitions.append((row["relname"], date(int(match["year"]), int(match["month"]), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
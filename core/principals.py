@@ -0,0 +1,114 @@
+"""Authenticated-principal cache: a JWT's (user id, iat) resolved without a DB query.
+
+Lookups go in-process LRU -> Redis (one hash per user, a field per token iat) ->
+database. Only active users are cached. Admin writes call ``invalidate()``; the
+entries are dropped once the transaction commits, immediately in this process
+and in Redis, and within AUTH_PRINCIPAL_LOCAL_TTL_SECONDS in other processes.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache, get_redis
+from core.config import get_settings
+from models.user import User
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "probable:principal:"
+_FIELDS = ("id", "email", "full_name", "is_active", "created_at", "updated_at")
+_DATETIME_FIELDS = ("created_at", "updated_at")
+_INVALIDATE_INFO_KEY = "principal_cache_invalidate"
+
+_local = TTLCache(settings.auth_principal_cache_max_entries, settings.auth_principal_local_ttl_seconds)
+_invalidate_tasks: set[asyncio.Task] = set()
+
+
+def _snapshot(user: User) -> dict[str, Any]:
+    data = {name: getattr(user, name) for name in _FIELDS}
+    for name in _DATETIME_FIELDS:
+        if data[name] is not None:
+            data[name] = data[name].isoformat()
+    return data
+
+
+def _to_user(data: dict[str, Any]) -> User:
+    """Detached User carrying the cached columns (no password hash)."""
+    values = dict(data)
+    for name in _DATETIME_FIELDS:
+        if values.get(name):
+            values[name] = datetime.fromisoformat(values[name])
+    return User(**values)
+
+
+async def get_principal(db: AsyncSession, user_id: int, iat: Any) -> Optional[User]:
+    """User for a verified token, or None if it no longer exists. Callers check is_active."""
+    token_key = str(iat or 0)
+    data = _local.get((user_id, token_key))
+    if data is not None:
+        return _to_user(data)
+
+    redis_key = f"{KEY_PREFIX}{user_id}"
+    try:
+        raw = await get_redis().hget(redis_key, token_key)
+    except RedisError:
+        raw = None
+    if raw:
+        data = json.loads(raw)
+        _local.set((user_id, token_key), data)
+        return _to_user(data)
+
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+    if user is None or not user.is_active:
+        return user
+    data = _snapshot(user)
+    _local.set((user_id, token_key), data)
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.hset(redis_key, token_key, json.dumps(data))
+            pipe.expire(redis_key, settings.auth_principal_cache_ttl_seconds)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Could not cache principal for user %s", user_id)
+    return user
+
+
+def invalidate(db: AsyncSession, user_id: int) -> None:
+    """Drop the user's cached principals once db's transaction commits."""
+    db.sync_session.info.setdefault(_INVALIDATE_INFO_KEY, set()).add(user_id)
+
+
+async def _invalidate_redis(user_ids: set[int]) -> None:
+    try:
+        await get_redis().delete(*(f"{KEY_PREFIX}{user_id}" for user_id in user_ids))
+    except RedisError:
+        logger.warning("Could not invalidate cached principals for users %s", sorted(user_ids))
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    user_ids: Optional[set[int]] = session.info.pop(_INVALIDATE_INFO_KEY, None)
+    if not user_ids:
+        return
+    _local.discard(lambda key: key[0] in user_ids)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_invalidate_redis(user_ids))
+    _invalidate_tasks.add(task)
+    task.add_done_callback(_invalidate_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_INVALIDATE_INFO_KEY, None)
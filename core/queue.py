@@ -0,0 +1,45 @@
+"""Shared ARQ pool for enqueueing background jobs from the API."""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+from arq import ArqRedis, create_pool
+from arq.connections import RedisSettings
+from arq.jobs import Job
+from redis.exceptions import RedisError
+
+from core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ArqRedis] = None
+_lock = asyncio.Lock()
+
+
+async def get_queue() -> ArqRedis:
+    """Lazily create the process-wide ARQ pool."""
+    global _pool
+    if _pool is None:
+        async with _lock:
+            if _pool is None:
+                _pool = await create_pool(RedisSettings.from_dsn(settings.redis_url))
+    return _pool
+
+
+async def enqueue(function: str, *args: Any, **kwargs: Any) -> Optional[Job]:
+    """enqueue_job() that logs instead of raising when Redis is down (None if not enqueued)."""
+    try:
+        return await (await get_queue()).enqueue_job(function, *args, **kwargs)
+    except (RedisError, OSError) as e:
+        logger.warning("Could not enqueue %s: %s", function, e)
+        return None
+
+
+async def close_queue() -> None:
+    """Close the shared pool (app shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
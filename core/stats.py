@@ -0,0 +1,145 @@
+"""Dashboard stats: one aggregate query, cached in Redis, kept current from write paths.
+
+The cache is a Redis hash of counters. Write handlers record deltas on their
+session with ``record()``; once the transaction commits the deltas are applied
+with HINCRBY (only if the hash is cached), so the dashboard stays accurate
+between recomputes without ever counting rows on the request path.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import event, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.cache import get_redis
+from core.config import get_settings
+from models.article import Article
+from models.forecast import ForecastSpecDB
+from models.project import Project
+from models.rss_feed import RssFeed
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "probable:stats:dashboard"
+COUNTERS = (
+    "total_feeds",
+    "active_feeds",
+    "total_articles",
+    "total_stories",
+    "published_stories",
+    "total_forecasts",
+)
+_DELTAS_INFO_KEY = "dashboard_stats_deltas"
+_apply_tasks: set[asyncio.Task] = set()
+
+# HINCRBY only when the hash is cached; a missing hash is rebuilt from the DB on next read
+_INCR_IF_CACHED = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+for i = 1, #ARGV, 2 do redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1]) end
+return 1
+"""
+
+
+def _stats_query():
+    """All dashboard counters in one round trip (one scan per table, FILTER for subsets)."""
+    feeds = select(
+        func.count().label("total_feeds"),
+        func.count().filter(RssFeed.status == "active").label("active_feeds"),
+    ).select_from(RssFeed).subquery()
+    articles = select(func.count().label("total_articles")).select_from(Article).subquery()
+    stories = select(
+        func.count().label("total_stories"),
+        func.count().filter(Project.status == "published").label("published_stories"),
+    ).select_from(Project).subquery()
+    forecasts = select(func.count().label("total_forecasts")).select_from(ForecastSpecDB).subquery()
+    return select(
+        feeds.c.total_feeds,
+        feeds.c.active_feeds,
+        articles.c.total_articles,
+        stories.c.total_stories,
+        stories.c.published_stories,
+        forecasts.c.total_forecasts,
+    ).select_from(feeds.join(articles, true()).join(stories, true()).join(forecasts, true()))
+
+
+async def compute_stats(db: AsyncSession) -> dict[str, int]:
+    """Count everything straight from the database."""
+    row = (await db.execute(_stats_query())).one()
+    return {name: int(getattr(row, name) or 0) for name in COUNTERS}
+
+
+async def get_stats(db: AsyncSession) -> dict[str, int]:
+    """Cached counters, recomputed when the cache has expired or Redis is unavailable."""
+    redis = get_redis()
+    try:
+        cached = await redis.hgetall(STATS_KEY)
+    except RedisError:
+        logger.warning("Redis unavailable; computing dashboard stats from the database")
+        return await compute_stats(db)
+    if cached and all(name in cached for name in COUNTERS):
+        return {name: max(int(cached[name]), 0) for name in COUNTERS}
+
+    stats = await compute_stats(db)
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(STATS_KEY, mapping=stats)
+            pipe.expire(STATS_KEY, settings.dashboard_stats_ttl_seconds)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Could not cache dashboard stats")
+    return stats
+
+
+async def invalidate() -> None:
+    """Drop cached counters so the next read recomputes them."""
+    try:
+        await get_redis().delete(STATS_KEY)
+    except RedisError:
+        logger.warning("Could not invalidate dashboard stats cache")
+
+
+def record(db: AsyncSession, **deltas: int) -> None:
+    """Queue counter deltas (e.g. total_feeds=1) to apply when db's transaction commits."""
+    if not settings.dashboard_stats_incremental:
+        return
+    pending: dict[str, int] = db.sync_session.info.setdefault(_DELTAS_INFO_KEY, {})
+    for name, delta in deltas.items():
+        if name not in COUNTERS:
+            raise ValueError(f"Unknown dashboard counter: {name}")
+        if delta:
+            pending[name] = pending.get(name, 0) + delta
+
+
+async def _apply(deltas: dict[str, int]) -> None:
+    args: list = []
+    for name, delta in deltas.items():
+        args.extend((name, delta))
+    try:
+        await get_redis().eval(_INCR_IF_CACHED, 1, STATS_KEY, *args)
+    except RedisError:
+        # Counters may now be stale; force a recompute rather than serve drift
+        await invalidate()
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    deltas: Optional[dict[str, int]] = session.info.pop(_DELTAS_INFO_KEY, None)
+    if not deltas:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_apply(deltas))
+    _apply_tasks.add(task)
+    task.add_done_callback(_apply_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_DELTAS_INFO_KEY, None)
@@ -1,7 +1,23 @@
-"""Object storage (S3-compatible) for datasets, chart images, and raw HTML."""
+"""Object storage (S3-compatible or local filesystem) for datasets, chart images, and raw HTML.
 
+boto3 is synchronous, so S3 calls run on a dedicated, bounded thread pool sized to
+the client's connection pool; the event loop never blocks on network I/O. Large
+blobs go through upload_stream (multipart) and stream_file (chunked, optionally
+ranged) so they are never held in memory whole. STORAGE_BACKEND=local swaps in a
+filesystem backend for offline development and tests.
+"""
+
+import asyncio
 import io
-from typing import Optional
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Optional
 
 import boto3
 from botocore.config import Config
@@ -10,13 +26,57 @@ from core.config import get_settings
 
 settings = get_settings()
 
-# S3 client - supports local MinIO or AWS S3
-_client = None
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 rejects non-final multipart parts smaller than this
+
+Body = bytes | str | BinaryIO
+
+
+def _to_stream(body: Body) -> BinaryIO:
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if isinstance(body, bytes):
+        body = io.BytesIO(body)
+    return body
+
+
+class StorageBackend(ABC):
+    """Async object storage interface."""
+
+    @abstractmethod
+    async def upload(self, key: str, body: Body, content_type: str) -> str:
+        """Store a small object. Returns the key."""
+
+    @abstractmethod
+    async def upload_stream(self, key: str, chunks: AsyncIterable[bytes], content_type: str) -> str:
+        """Store an object from an async stream of chunks without buffering it whole."""
+
+    @abstractmethod
+    def stream(
+        self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE, start: Optional[int] = None, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Yield an object's bytes (inclusive byte range start..end if given)."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete an object (no error if missing)."""
+
+    @abstractmethod
+    async def ping(self) -> None:
+        """Raise if the bucket/root is unreachable."""
+
+    def presigned_url(self, key: str, expires_in: int = 3600) -> Optional[str]:
+        return None
+
+    async def download(self, key: str) -> bytes:
+        """Read a whole object. Prefer stream() for anything large."""
+        return b"".join([chunk async for chunk in self.stream(key)])
 
 
-def _get_client():
-    global _client
-    if _client is None:
+class S3Storage(StorageBackend):
+    """S3/MinIO backend: boto3 calls offloaded to a bounded thread pool."""
+
+    def __init__(self):
         extra = {}
         if settings.s3_endpoint_url:
             extra["endpoint_url"] = settings.s3_endpoint_url
@@ -24,51 +84,221 @@ def _get_client():
             extra["aws_access_key_id"] = settings.aws_access_key_id
         if settings.aws_secret_access_key:
             extra["aws_secret_access_key"] = settings.aws_secret_access_key
-        _client = boto3.client(
+        self.bucket = settings.s3_bucket
+        self.part_size = max(settings.s3_multipart_chunk_bytes, MIN_PART_SIZE)
+        # boto3 clients are thread-safe; one client, pool size matched to the executor
+        self.client = boto3.client(
             "s3",
             region_name=settings.s3_region,
-            config=Config(signature_version="s3v4"),
+            config=Config(
+                signature_version="s3v4",
+                max_pool_connections=settings.s3_max_pool_connections,
+                retries={"max_attempts": 3, "mode": "adaptive"},
+            ),
             **extra,
         )
-    return _client
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.s3_max_pool_connections, thread_name_prefix="s3"
+        )
+
+    async def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def upload(self, key: str, body: Body, content_type: str) -> str:
+        await self._run(
+            self.client.put_object, Bucket=self.bucket, Key=key, Body=_to_stream(body), ContentType=content_type
+        )
+        return key
+
+    async def upload_stream(self, key: str, chunks: AsyncIterable[bytes], content_type: str) -> str:
+        created = await self._run(
+            self.client.create_multipart_upload, Bucket=self.bucket, Key=key, ContentType=content_type
+        )
+        upload_id = created["UploadId"]
+        parts: list[dict] = []
+        buffer = bytearray()
+
+        async def flush() -> None:
+            number = len(parts) + 1
+            resp = await self._run(
+                self.client.upload_part,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=number,
+                Body=bytes(buffer),
+            )
+            parts.append({"PartNumber": number, "ETag": resp["ETag"]})
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                if len(buffer) >= self.part_size:
+                    await flush()
+            if buffer or not parts:
+                await flush()
+            await self._run(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await self._run(self.client.abort_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+        return key
+
+    async def stream(
+        self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE, start: Optional[int] = None, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        params: dict[str, Any] = {"Bucket": self.bucket, "Key": key}
+        if start is not None or end is not None:
+            params["Range"] = f"bytes={start or 0}-{'' if end is None else end}"
+        response = await self._run(self.client.get_object, **params)
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await self._run(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete(self, key: str) -> None:
+        await self._run(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def ping(self) -> None:
+        await self._run(self.client.head_bucket, Bucket=self.bucket)
+
+    def presigned_url(self, key: str, expires_in: int = 3600) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
+
+class LocalStorage(StorageBackend):
+    """Filesystem backend rooted at STORAGE_LOCAL_PATH (development and offline tests)."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.storage_local_path).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"Storage key escapes root: {key}")
+        return path
+
+    def _write(self, path: Path, src: BinaryIO) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        with os.fdopen(fd, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, path)
+
+    async def upload(self, key: str, body: Body, content_type: str) -> str:
+        await asyncio.to_thread(self._write, self._path(key), _to_stream(body))
+        return key
+
+    async def upload_stream(self, key: str, chunks: AsyncIterable[bytes], content_type: str) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                async for chunk in chunks:
+                    await asyncio.to_thread(dst.write, chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return key
+
+    async def stream(
+        self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE, start: Optional[int] = None, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(open, self._path(key), "rb")
+        try:
+            if start:
+                await asyncio.to_thread(f.seek, start)
+            remaining = None if end is None else end - (start or 0) + 1
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await asyncio.to_thread(f.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            f.close()
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    async def ping(self) -> None:
+        if not os.access(self.root, os.W_OK):
+            raise OSError(f"Storage root not writable: {self.root}")
+
+
+_backend: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """Process-wide storage backend selected by STORAGE_BACKEND (s3 | local)."""
+    global _backend
+    if _backend is None:
+        if settings.storage_backend == "local":
+            _backend = LocalStorage()
+        else:
+            _backend = S3Storage()
+    return _backend
 
 
 async def upload_file(
     key: str,
-    body: bytes | str | io.BytesIO,
+    body: Body,
     content_type: str = "application/octet-stream",
 ) -> str:
-    """Upload a file to S3. Returns the object key (path)."""
-    client = _get_client()
-    if isinstance(body, str):
-        body = body.encode("utf-8")
-    if isinstance(body, bytes):
-        body = io.BytesIO(body)
+    """Upload a file to storage. Returns the object key (path)."""
+    return await get_storage().upload(key, body, content_type)
 
-    client.put_object(
-        Bucket=settings.s3_bucket,
-        Key=key,
-        Body=body,
-        ContentType=content_type,
-    )
-    return key
+
+async def upload_stream(
+    key: str,
+    chunks: AsyncIterable[bytes],
+    content_type: str = "application/octet-stream",
+) -> str:
+    """Upload a large object from an async iterator of chunks (S3 multipart)."""
+    return await get_storage().upload_stream(key, chunks, content_type)
 
 
 async def download_file(key: str) -> bytes:
-    """Download a file from S3."""
-    client = _get_client()
-    response = client.get_object(Bucket=settings.s3_bucket, Key=key)
-    return response["Body"].read()
+    """Download a whole file. Use stream_file for large objects."""
+    return await get_storage().download(key)
+
+
+def stream_file(
+    key: str, chunk_size: int = DEFAULT_CHUNK_SIZE, start: Optional[int] = None, end: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """Yield a file's bytes in chunks, optionally for an inclusive byte range."""
+    return get_storage().stream(key, chunk_size=chunk_size, start=start, end=end)
+
+
+async def delete_file(key: str) -> None:
+    """Delete a file."""
+    await get_storage().delete(key)
 
 
 def get_presigned_url(key: str, expires_in: int = 3600) -> Optional[str]:
     """Generate a presigned URL for temporary access."""
     try:
-        client = _get_client()
-        return client.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": settings.s3_bucket, "Key": key},
-            ExpiresIn=expires_in,
-        )
+        return get_storage().presigned_url(key, expires_in)
     except Exception:
         return None
@@ -0,0 +1,132 @@
+"""Outgoing webhook events for marketplace integrations.
+
+Write paths call ``publish(db, type, data)``. Once the transaction commits, each
+event is handed to the ``webhook_fan_out`` ARQ job (workers.webhooks), which
+queues it for every active integration with a ``webhook_url`` in its config;
+``webhook_deliver`` then POSTs each destination's queued events in batches.
+Events from a rolled-back transaction are never sent.
+
+Webhook URLs are user-supplied, so ``check_webhook_url`` (run when an integration
+is saved and again before every send) only allows https and public addresses:
+loopback, private, link-local and other reserved ranges are refused, which keeps
+integrations from reaching internal services or cloud metadata endpoints.
+"""
+
+import asyncio
+import ipaddress
+import socket
+import uuid
+from datetime import UTC, datetime
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core import queue
+from core.config import get_settings
+
+settings = get_settings()
+
+EVENT_TYPES = ("forecast.updated", "story.published")
+FAN_OUT_JOB = "webhook_fan_out"
+
+_EVENTS_INFO_KEY = "webhook_events"
+_enqueue_tasks: set[asyncio.Task] = set()
+
+
+class UnsafeWebhookURL(ValueError):
+    """A webhook URL that must not be called (scheme, unresolvable or non-public address)."""
+
+
+def _public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])  # drop an IPv6 zone id
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def check_webhook_url(url: str) -> str:
+    """Return url if it may be POSTed to, else raise UnsafeWebhookURL.
+
+    Every address the host resolves to must be public (WEBHOOK_ALLOW_PRIVATE_HOSTS
+    lifts this for local development; WEBHOOK_ALLOW_HTTP allows plain http).
+    """
+    parts = urlsplit(url)
+    allowed = ("https", "http") if settings.webhook_allow_http else ("https",)
+    if parts.scheme not in allowed:
+        raise UnsafeWebhookURL(f"Webhook URL must use {' or '.join(allowed)}")
+    if not parts.hostname:
+        raise UnsafeWebhookURL("Webhook URL has no host")
+    if settings.webhook_allow_private_hosts:
+        return url
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            parts.hostname, parts.port or (443 if parts.scheme == "https" else 80), type=socket.SOCK_STREAM
+        )
+    except (socket.gaierror, UnicodeError) as e:
+        raise UnsafeWebhookURL(f"Webhook host does not resolve: {parts.hostname}") from e
+    if not infos or not all(_public(info[4][0]) for info in infos):
+        raise UnsafeWebhookURL(f"Webhook host is not a public address: {parts.hostname}")
+    return url
+
+
+def make_event(type: str, data: dict[str, Any]) -> dict[str, Any]:
+    if type not in EVENT_TYPES:
+        raise ValueError(f"Unknown webhook event type: {type}")
+    return {"id": uuid.uuid4().hex, "type": type, "occurredAt": datetime.now(UTC).isoformat(), "data": data}
+
+
+def publish(db: AsyncSession, type: str, data: dict[str, Any]) -> None:
+    """Queue an event for integrations, sent once db's transaction commits."""
+    db.sync_session.info.setdefault(_EVENTS_INFO_KEY, []).append(make_event(type, data))
+
+
+def forecast_updated(spec: Any, run: Any) -> dict[str, Any]:
+    """Event data for a ForecastSpecDB and its latest ForecastRun."""
+    result = run.result or {}
+    return {
+        "forecastId": spec.id,
+        "runId": run.id,
+        "topic": spec.topic,
+        "target": spec.target,
+        "horizon": spec.horizon,
+        "probability": result.get("point_estimate", result.get("probability")),
+        "runAt": run.run_at.isoformat() if run.run_at else None,
+    }
+
+
+def story_published(project: Any) -> dict[str, Any]:
+    """Event data for a published Project."""
+    return {
+        "storyId": project.id,
+        "slug": project.slug,
+        "title": project.title,
+        "topic": project.topic,
+        "publishedAt": project.published_at.isoformat() if project.published_at else None,
+    }
+
+
+async def _enqueue(events: list[dict[str, Any]]) -> None:
+    for item in events:
+        await queue.enqueue(FAN_OUT_JOB, item)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    events: Optional[list[dict[str, Any]]] = session.info.pop(_EVENTS_INFO_KEY, None)
+    if not events:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_enqueue(events))
+    _enqueue_tasks.add(task)
+    task.add_done_callback(_enqueue_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_EVENTS_INFO_KEY, None)
@@ -2,7 +2,7 @@
 # Import all models so Base.metadata picks them up for Alembic
 
 from models.marketplace import MarketplaceApp, UserAppIntegration
-from models.rss import RssItem
+from models.rss import RssItem, RssItemUrl
 from models.rss_feed import RssFeed
 from models.article import Article
 from models.dataset import Dataset, DataSource
@@ -15,6 +15,7 @@ __all__ = [
     "UserAppIntegration",
     "RssFeed",
     "RssItem",
+    "RssItemUrl",
     "Article",
     "Dataset",
     "DataSource",
@@ -3,8 +3,9 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, JSON, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Computed, DateTime, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, query_expression
 
 from core.db import Base
 
@@ -13,6 +14,11 @@ class Article(Base):
     """Normalised article content with extracted entities and topics."""
 
     __tablename__ = "articles"
+    __table_args__ = (
+        Index("ix_articles_topics", "topics", postgresql_using="gin", postgresql_ops={"topics": "jsonb_path_ops"}),
+        Index("ix_articles_entities", "entities", postgresql_using="gin", postgresql_ops={"entities": "jsonb_path_ops"}),
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     rss_item_id: Mapped[Optional[int]] = mapped_column(nullable=True)
@@ -21,9 +27,23 @@ class Article(Base):
     body: Mapped[str] = mapped_column(Text)
     article_url: Mapped[str] = mapped_column(String(2048), index=True)
     source: Mapped[str] = mapped_column(String(256), index=True)
-    topics: Mapped[list] = mapped_column(JSON, default=list)
-    entities: Mapped[list] = mapped_column(JSON, default=list)
-    key_numbers: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
-    quotes: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    topics: Mapped[list] = mapped_column(JSONB, default=list)
+    entities: Mapped[list] = mapped_column(JSONB, default=list)
+    key_numbers: Mapped[Optional[list]] = mapped_column(JSONB, nullable=True)
+    quotes: Mapped[Optional[list]] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Full-text search document: headline (A) > dek (B) > body (C); maintained by Postgres
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(headline, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(dek, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    # Populated with with_expression() by list queries that must not load the full body
+    body_preview: Mapped[Optional[str]] = query_expression()
@@ -3,7 +3,8 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, JSON, String, Text, func
+from sqlalchemy import Computed, DateTime, JSON, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.db import Base
@@ -28,7 +29,11 @@ class Dataset(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     article_id: Mapped[Optional[int]] = mapped_column(nullable=True)
     topic: Mapped[str] = mapped_column(String(128), index=True)
-    data: Mapped[dict] = mapped_column(JSON, default=dict)
+    data: Mapped[dict] = mapped_column(JSONB, default=dict)
     s3_key: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
     source: Mapped[str] = mapped_column(String(256))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # md5 of data, maintained by Postgres on every write (fingerprints forecast inputs)
+    data_digest: Mapped[Optional[str]] = mapped_column(
+        String(32), Computed("md5(data::text)", persisted=True), deferred=True
+    )
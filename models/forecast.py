@@ -3,7 +3,8 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, JSON, Integer, String, func
+from sqlalchemy import DateTime, Index, JSON, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.db import Base
@@ -26,15 +27,23 @@ class ForecastSpecDB(Base):
 
 
 class ForecastRun(Base):
-    """Model run output: point estimates, distributions."""
+    """Model run output: point estimates, distributions.
+
+    Partitioned by month of run_at (migration 010), so the primary key includes it.
+    """
 
     __tablename__ = "forecast_runs"
+    __table_args__ = (
+        Index("ix_forecast_runs_spec_id_run_at", "forecast_spec_id", text("run_at DESC")),
+        Index("ix_forecast_runs_point_estimate", text("((result ->> 'point_estimate')::double precision)")),
+        {"postgresql_partition_by": "RANGE (run_at)"},
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     project_id: Mapped[Optional[int]] = mapped_column(nullable=True)
     forecast_spec_id: Mapped[Optional[int]] = mapped_column(nullable=True)
     model_name: Mapped[str] = mapped_column(String(128))
-    result: Mapped[dict] = mapped_column(JSON, default=dict)
-    calibration_flags: Mapped[list] = mapped_column(JSON, default=list)
-    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    run_metadata: Mapped[dict] = mapped_column(JSON, default=dict)
+    result: Mapped[dict] = mapped_column(JSONB, default=dict)
+    calibration_flags: Mapped[list] = mapped_column(JSONB, default=list)
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    run_metadata: Mapped[dict] = mapped_column("metadata", JSONB, default=dict)
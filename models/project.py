@@ -3,8 +3,9 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, JSON, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Computed, DateTime, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, query_expression
 
 from core.db import Base
 
@@ -13,19 +14,33 @@ class Project(Base):
     """Final project: article + analysis + forecast + charts."""
 
     __tablename__ = "projects"
+    __table_args__ = (Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     slug: Mapped[str] = mapped_column(String(256), unique=True, index=True)
     title: Mapped[str] = mapped_column(String(512))
     lede: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     origin_article_id: Mapped[Optional[int]] = mapped_column(nullable=True)
-    sections: Mapped[list] = mapped_column(JSON, default=list)
-    charts: Mapped[list] = mapped_column(JSON, default=list)
-    datasets: Mapped[list] = mapped_column(JSON, default=list)
+    sections: Mapped[list] = mapped_column(JSONB, default=list)
+    charts: Mapped[list] = mapped_column(JSONB, default=list)
+    datasets: Mapped[list] = mapped_column(JSONB, default=list)
     methodology: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    forecast_block: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    forecast_block: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     status: Mapped[str] = mapped_column(String(64), index=True, default="draft")
     topic: Mapped[str] = mapped_column(String(128), index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Full-text search document: title (A) > lede (B); maintained by Postgres
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(lede, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    # Populated with with_expression() by list queries that must not load sections
+    content_preview: Mapped[Optional[str]] = query_expression()
@@ -3,25 +3,43 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy import DateTime, Index, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.db import Base
 
 
 class RssItem(Base):
-    """Raw RSS entry before processing."""
+    """Raw RSS entry before processing.
+
+    Partitioned by month of fetched_at (migration 010), so the primary key includes it.
+    URLs are unique through rss_item_urls: a trigger skips inserts of already-stored URLs.
+    """
 
     __tablename__ = "rss_items"
+    __table_args__ = (
+        # Extraction streams unprocessed items in id order
+        Index("ix_rss_items_pending", "id", postgresql_where=text("processed_at IS NULL")),
+        {"postgresql_partition_by": "RANGE (fetched_at)"},
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    url: Mapped[str] = mapped_column(String(2048), unique=True, index=True)
+    url: Mapped[str] = mapped_column(String(2048), index=True)
     guid: Mapped[Optional[str]] = mapped_column(String(512), index=True, nullable=True)
     title: Mapped[str] = mapped_column(String(1024))
     body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     raw_html: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     source: Mapped[str] = mapped_column(String(256), index=True)
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
-    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     article_id: Mapped[Optional[int]] = mapped_column(nullable=True)  # FK to articles.id
+
+
+class RssItemUrl(Base):
+    """Every stored rss_items URL (the uniqueness a partitioned rss_items cannot enforce itself)."""
+
+    __tablename__ = "rss_item_urls"
+
+    url: Mapped[str] = mapped_column(String(2048), primary_key=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -21,4 +21,7 @@ class RssFeed(Base):
     status: Mapped[str] = mapped_column(String(64), default="active", nullable=False)
     articles_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     last_fetched_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Validators from the last 200 response, sent back as a conditional GET
+    etag: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
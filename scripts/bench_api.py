@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Benchmark every admin, marketplace and auth route in process.
+
+Boots apps.api.main:app behind httpx's ASGI transport against the configured
+(local) database. Every GET route is discovered from the OpenAPI schema; path parameters are
+filled from the first row of the parent collection. Auth login/signup are included.
+For each table size the data is topped up with scripts.load_data, then each route
+gets one isolated request (exact SQL statement count) followed by a concurrent
+load phase (throughput and p50/p95/p99). Results go to a JSON report that
+--compare checks against a baseline (exit 1 on regression):
+
+    python scripts/seed_db.py
+    python scripts/bench_api.py --sizes 10000,100000 --out bench-$(git rev-parse --short HEAD).json
+    python scripts/bench_api.py --sizes 10000,100000 --compare bench-main.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import re
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Optional
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from sqlalchemy import delete, event, func, select
+
+from apps.api.main import app
+from core.auth import get_password_hash
+from core.db import async_session_maker, engine
+from models.rss import RssItem
+from models.user import User
+from scripts.load_data import Volumes, generate
+
+BENCH_EMAIL = "bench-api@probable.local"
+BENCH_PASSWORD = "bench-password-123"
+SIGNUP_PREFIX = "bench-api-signup-"
+ROUTE_PREFIXES = ("/api/v1/auth", "/api/")
+_PARAM_RE = re.compile(r"\{(\w+)\}")
+
+
+@dataclass
+class RouteResult:
+    size: int
+    route: str
+    statements: int  # SQL statements for one isolated request
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    status: int = 0  # status of the isolated request
+    skipped: Optional[str] = None
+
+
+@dataclass
+class Target:
+    method: str
+    template: str  # route path as declared, the report key
+    path: str = ""
+    body: Optional[dict] = None
+    auth: bool = False
+    counter: list[int] = field(default_factory=lambda: [0])  # per-request suffix for signup
+
+
+class StatementCounter:
+    """Count statements sent to the database while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+
+def _pct(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def discover_targets() -> list[Target]:
+    """GET routes of the admin/marketplace/auth routers, plus the auth POSTs."""
+    targets = []
+    for path, operations in app.openapi()["paths"].items():
+        if not path.startswith(ROUTE_PREFIXES):
+            continue
+        if "get" in operations:
+            targets.append(Target("GET", path, auth="security" in operations["get"]))
+        elif path.endswith(("/auth/login", "/auth/signup")):
+            targets.append(Target("POST", path))
+    return targets
+
+
+async def seed_user() -> None:
+    async with async_session_maker() as session:
+        await session.execute(delete(User).where(User.email == BENCH_EMAIL))
+        session.add(User(email=BENCH_EMAIL, hashed_password=get_password_hash(BENCH_PASSWORD)))
+        await session.commit()
+
+
+async def cleanup_users() -> None:
+    async with async_session_maker() as session:
+        await session.execute(
+            delete(User).where((User.email == BENCH_EMAIL) | User.email.startswith(SIGNUP_PREFIX))
+        )
+        await session.commit()
+
+
+async def top_up(size: int, seed: int) -> int:
+    """Grow rss_items to size (other tables scale with it). Returns the item count."""
+    async with async_session_maker() as session:
+        current = (await session.execute(select(func.count()).select_from(RssItem))).scalar_one()
+    missing = size - current
+    if missing > 0:
+        await generate(
+            Volumes(
+                feeds=max(10, missing // 10_000),
+                rss_items=missing,
+                articles=missing // 5,
+                forecast_specs=max(1, missing // 50),
+                seed=seed + size,
+            )
+        )
+    return max(size, current)
+
+
+async def resolve(client: httpx.AsyncClient, target: Target, headers: dict) -> Optional[str]:
+    """Fill path parameters from the parent collection. Returns a skip reason or None."""
+    path = target.template
+    for param in _PARAM_RE.findall(path):
+        parent = path[: path.index("{" + param + "}")].rstrip("/")
+        r = await client.get(parent, params={"limit": 1}, headers=headers)
+        rows = r.json() if r.status_code == 200 else None
+        if not isinstance(rows, list) or not rows or param not in rows[0]:
+            return f"no {param} available from {parent}"
+        path = path.replace("{" + param + "}", str(rows[0][param]))
+    target.path = path
+    if target.template.endswith("/auth/login"):
+        target.body = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+    return None
+
+
+async def request(client: httpx.AsyncClient, target: Target, headers: dict) -> int:
+    if target.method == "GET":
+        r = await client.get(target.path, headers=headers if target.auth else None)
+    else:
+        body = target.body
+        if body is None:  # signup: a fresh email per request
+            target.counter[0] += 1
+            body = {"email": f"{SIGNUP_PREFIX}{time.time_ns()}-{target.counter[0]}@probable.local",
+                    "password": BENCH_PASSWORD}
+        r = await client.post(target.path, json=body)
+    return r.status_code
+
+
+async def measure(
+    client: httpx.AsyncClient, target: Target, headers: dict, size: int, n_requests: int, concurrency: int
+) -> RouteResult:
+    key = f"{target.method} {target.template}"
+    skipped = await resolve(client, target, headers)
+    if skipped:
+        return RouteResult(size, key, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, skipped=skipped)
+
+    with StatementCounter() as counter:
+        first_status = await request(client, target, headers)
+
+    latencies: list[float] = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        nonlocal errors
+        async with sem:
+            start = time.perf_counter()
+            code = await request(client, target, headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += code >= 400
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n_requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return RouteResult(
+        size=size,
+        route=key,
+        statements=counter.count,
+        requests=n_requests,
+        errors=errors,
+        rps=round(n_requests / elapsed, 1),
+        p50_ms=round(_pct(latencies, 0.5), 2),
+        p95_ms=round(_pct(latencies, 0.95), 2),
+        p99_ms=round(_pct(latencies, 0.99), 2),
+        status=first_status,
+    )
+
+
+def compare(report: dict, baseline: dict, latency_tolerance: float) -> bool:
+    """Print regressions against baseline; True if none."""
+    before = {(r["size"], r["route"]): r for r in baseline["results"] if not r.get("skipped")}
+    ok = True
+    for r in report["results"]:
+        b = before.get((r["size"], r["route"]))
+        if b is None or r.get("skipped"):
+            continue
+        problems = []
+        if r["statements"] > b["statements"]:
+            problems.append(f"statements {b['statements']} -> {r['statements']}")
+        if b["p95_ms"] and r["p95_ms"] > b["p95_ms"] * (1 + latency_tolerance):
+            problems.append(f"p95 {b['p95_ms']} -> {r['p95_ms']} ms")
+        if problems:
+            ok = False
+            print(f"  REGRESSION size={r['size']} {r['route']}: {', '.join(problems)}")
+    if ok:
+        print("  No regressions against baseline.")
+    return ok
+
+
+async def run_bench(args) -> dict:
+    results: list[RouteResult] = []
+    await seed_user()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            r = await client.post("/api/v1/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+            r.raise_for_status()
+            headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+            for size in args.sizes:
+                actual = size if args.no_generate else await top_up(size, args.seed)
+                print(f"rss_items={actual:,}")
+                for target in discover_targets():
+                    n = args.auth_requests if target.method == "POST" else args.requests
+                    result = await measure(client, target, headers, size, n, args.concurrency)
+                    results.append(result)
+                    if result.skipped:
+                        print(f"  {result.route:<45} skipped: {result.skipped}")
+                    else:
+                        print(
+                            f"  {result.route:<45} sql={result.statements:<4} rps={result.rps:<8} "
+                            f"p50={result.p50_ms:<8} p95={result.p95_ms:<8} p99={result.p99_ms:<8} "
+                            f"errors={result.errors}"
+                        )
+    finally:
+        await cleanup_users()
+        await engine.dispose()
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "generated_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": [asdict(r) for r in results],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=[10_000],
+                        help="Comma-separated rss_items table sizes to benchmark at")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per GET route")
+    parser.add_argument("--auth-requests", type=int, default=20, help="Requests for login/signup (bcrypt)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--no-generate", action="store_true", help="Benchmark the data as it is")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Baseline report to check for regressions")
+    parser.add_argument("--latency-tolerance", type=float, default=0.25, help="Allowed p95 increase (fraction)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_bench(args))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    if args.compare:
+        ok = compare(report, json.loads(args.compare.read_text()), args.latency_tolerance)
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
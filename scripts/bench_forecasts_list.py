@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Benchmark GET /api/forecasts: per-spec latest-run lookups vs the batched loader.
+
+Seeds N forecast specs (default 10k) with a few runs each under a throwaway topic,
+then reports SQL statement count and wall time for both strategies. Run after
+alembic upgrade head against a local database:
+
+    python scripts/bench_forecasts_list.py --specs 10000 --runs-per-spec 3
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, event, insert, select
+
+from apps.api.routers.admin import _forecast_to_response, forecasts_list
+from core.db import async_session_maker, engine
+from models.forecast import ForecastRun, ForecastSpecDB
+
+BENCH_TOPIC = "bench-forecasts-list"
+
+
+class StatementCounter:
+    """Count statements sent to the database while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+
+async def seed(n_specs: int, runs_per_spec: int) -> None:
+    """Insert bench specs and runs in bulk."""
+    async with async_session_maker() as session:
+        spec_rows = [
+            {
+                "target": f"Bench target {i}",
+                "horizon": "bench",
+                "granularity": "binary",
+                "constraints": {},
+                "topic": BENCH_TOPIC,
+            }
+            for i in range(n_specs)
+        ]
+        result = await session.execute(insert(ForecastSpecDB).returning(ForecastSpecDB.id), spec_rows)
+        spec_ids = list(result.scalars().all())
+        now = datetime.now(UTC)
+        run_rows = [
+            {
+                "forecast_spec_id": spec_id,
+                "model_name": "baseline",
+                "result": {"point_estimate": 0.5},
+                "calibration_flags": [],
+                "run_metadata": {},
+                "run_at": now - timedelta(days=k),
+            }
+            for spec_id in spec_ids
+            for k in range(runs_per_spec)
+        ]
+        await session.execute(insert(ForecastRun), run_rows)
+        await session.commit()
+
+
+async def cleanup() -> None:
+    async with async_session_maker() as session:
+        spec_ids = select(ForecastSpecDB.id).where(ForecastSpecDB.topic == BENCH_TOPIC)
+        await session.execute(delete(ForecastRun).where(ForecastRun.forecast_spec_id.in_(spec_ids)))
+        await session.execute(delete(ForecastSpecDB).where(ForecastSpecDB.topic == BENCH_TOPIC))
+        await session.commit()
+
+
+async def per_spec_strategy(session) -> int:
+    """The previous behaviour: one latest-run query per spec."""
+    specs = (await session.execute(select(ForecastSpecDB).order_by(ForecastSpecDB.id.desc()))).scalars().all()
+    out = []
+    for spec in specs:
+        r = await session.execute(
+            select(ForecastRun)
+            .where(ForecastRun.forecast_spec_id == spec.id)
+            .order_by(ForecastRun.run_at.desc())
+            .limit(1)
+        )
+        out.append(_forecast_to_response(spec, r.scalar_one_or_none()))
+    return len(out)
+
+
+async def batched_strategy(session) -> int:
+    return len(await forecasts_list(db=session, status=None))
+
+
+async def measure(name: str, strategy) -> None:
+    async with async_session_maker() as session:
+        with StatementCounter() as counter:
+            start = time.perf_counter()
+            rows = await strategy(session)
+            elapsed = time.perf_counter() - start
+    print(f"  {name:<10} rows={rows:<7} statements={counter.count:<7} time={elapsed * 1000:.1f} ms")
+
+
+async def run_bench(n_specs: int, runs_per_spec: int, keep: bool) -> None:
+    print(f"Seeding {n_specs} specs x {runs_per_spec} runs...")
+    await seed(n_specs, runs_per_spec)
+    try:
+        await measure("per-spec", per_spec_strategy)
+        await measure("batched", batched_strategy)
+    finally:
+        if not keep:
+            await cleanup()
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--specs", type=int, default=10_000)
+    parser.add_argument("--runs-per-spec", type=int, default=3)
+    parser.add_argument("--keep", action="store_true", help="Keep seeded rows after the run")
+    args = parser.parse_args()
+    asyncio.run(run_bench(args.specs, args.runs_per_spec, args.keep))
+
+
+if __name__ == "__main__":
+    main()
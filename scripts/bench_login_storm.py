@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark unrelated-endpoint latency during a login storm.
+
+Creates a throwaway user, then fires --logins concurrent POST /api/v1/auth/login
+requests through the ASGI app while a probe loop hits GET /health. Reports probe
+p50/p99/max latency and the password service's queue metrics. --inline runs bcrypt
+on the event loop (the previous behaviour) for comparison. Run after alembic
+upgrade head against a local database:
+
+    python scripts/bench_login_storm.py --logins 200
+    python scripts/bench_login_storm.py --logins 200 --inline
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from sqlalchemy import delete
+
+from apps.api.main import app
+from apps.api.routers import auth as auth_router
+from core.auth import get_password_hash, get_password_service, pwd_context
+from core.db import async_session_maker, engine
+from models.user import User
+
+BENCH_EMAIL = "bench-login-storm@probable.local"
+BENCH_PASSWORD = "bench-password-123"
+
+
+async def _verify_inline(plain_password: str, hashed_password: str):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def seed_user() -> None:
+    async with async_session_maker() as session:
+        await session.execute(delete(User).where(User.email == BENCH_EMAIL))
+        session.add(User(email=BENCH_EMAIL, hashed_password=get_password_hash(BENCH_PASSWORD)))
+        await session.commit()
+
+
+async def cleanup() -> None:
+    async with async_session_maker() as session:
+        await session.execute(delete(User).where(User.email == BENCH_EMAIL))
+        await session.commit()
+
+
+def _pct(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def storm(client: httpx.AsyncClient, n_logins: int, probe_interval: float) -> None:
+    probes: list[float] = []
+    statuses: dict[int, int] = {}
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/health")
+            probes.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(probe_interval)
+
+    async def login() -> None:
+        r = await client.post("/api/v1/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(n_logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+
+    print(f"  logins: {n_logins} in {elapsed:.2f}s ({n_logins / elapsed:.1f}/s) statuses={statuses}")
+    if probes:
+        print(
+            f"  /health probes: n={len(probes)} p50={statistics.median(probes):.1f} ms "
+            f"p99={_pct(probes, 0.99):.1f} ms max={max(probes):.1f} ms"
+        )
+    print(f"  password service: {get_password_service().metrics()}")
+
+
+async def run_bench(n_logins: int, inline: bool, probe_interval: float) -> None:
+    if inline:
+        auth_router.verify_and_update_password = _verify_inline
+    await seed_user()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"Login storm ({'inline bcrypt' if inline else 'password service'}):")
+            await storm(client, n_logins, probe_interval)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--inline", action="store_true", help="Hash on the event loop (previous behaviour)")
+    parser.add_argument("--probe-interval", type=float, default=0.005, help="Seconds between /health probes")
+    args = parser.parse_args()
+    asyncio.run(run_bench(args.logins, args.inline, args.probe_interval))
+
+
+if __name__ == "__main__":
+    main()
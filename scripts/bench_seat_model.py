@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Benchmark the Monte Carlo seat model (agents.seat_model).
+
+Builds a synthetic election (650 seats, 8 parties by default) and reports
+wall time, simulations/sec and peak traced memory for each memory budget:
+
+    python scripts/bench_seat_model.py --sims 100000 --memory-mb 16 64 256
+
+Exits non-zero when simulate_seats peaks above its max_memory_mb budget.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from agents.seat_model import _chunk_size, simulate_seats, summarise
+
+
+def synthetic_election(n_seats: int, n_parties: int, seed: int = 0) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """Baseline constituency shares from a Dirichlet, polls = baseline national average."""
+    rng = np.random.default_rng(seed)
+    baseline = rng.dirichlet(np.linspace(4.0, 0.5, n_parties), size=n_seats).astype(np.float32)
+    return [f"Party {i + 1}" for i in range(n_parties)], baseline, baseline.mean(axis=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sims", type=int, default=100_000)
+    parser.add_argument("--seats", type=int, default=650)
+    parser.add_argument("--parties", type=int, default=8)
+    parser.add_argument("--memory-mb", type=float, nargs="+", default=[16, 64, 256])
+    args = parser.parse_args()
+
+    parties, baseline, polls = synthetic_election(args.seats, args.parties)
+    print(f"{args.sims} simulations x {args.seats} seats x {args.parties} parties")
+    over = []
+    for budget in args.memory_mb:
+        tracemalloc.start()
+        start = time.perf_counter()
+        sim = simulate_seats(parties, baseline, polls, n_sims=args.sims, seed=1, max_memory_mb=budget)
+        _, peak = tracemalloc.get_traced_memory()
+        result = summarise(sim)
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+        chunk = _chunk_size(args.seats, args.parties, budget, reserved_bytes=args.sims * args.parties * 8)
+        leader = max(result.targets, key=lambda t: t.win_prob)
+        within = peak <= budget * 2**20
+        if not within:
+            over.append(budget)
+        print(
+            f"  budget={budget:>6.0f} MB chunk={chunk:>6} time={elapsed:6.2f} s "
+            f"sims/s={args.sims / elapsed:>9.0f} peak={peak / 2**20:7.1f} MB{'' if within else ' OVER BUDGET'} "
+            f"leader={leader.party} ({leader.win_prob:.1%})"
+        )
+    if over:
+        sys.exit(f"simulate_seats exceeded its memory budget at {', '.join(f'{b:g}' for b in over)} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Exercise webhook fan-out and delivery against a local HTTP stub.
+
+Starts a stub receiver on 127.0.0.1 (optionally slow or failing), creates a
+throwaway marketplace app with --integrations active integrations pointing at it,
+publishes --events forecast events through webhook_fan_out and runs
+webhook_deliver in-process until every destination has received every event.
+Reports requests, events per request (batching) and delivery throughput, then
+removes everything it created. Run after alembic upgrade head with Redis up:
+
+    python scripts/bench_webhooks.py --integrations 2000 --events 5
+    python scripts/bench_webhooks.py --integrations 500 --fail-rate 0.2 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import uvicorn
+from sqlalchemy import delete, insert, select
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from core import webhooks
+from core.cache import close_redis, get_redis
+from core.config import get_settings
+from core.db import async_session_maker, engine
+from core.queue import close_queue, get_queue
+from models.marketplace import MarketplaceApp, UserAppIntegration
+from workers import webhooks as delivery
+
+settings = get_settings()
+
+BENCH_SLUG = "bench-webhooks"
+BENCH_USER_ID = 0
+
+
+def stub_app(received: Counter, requests: Counter, fail_rate: float, latency: float) -> Starlette:
+    async def hook(request: Request) -> Response:
+        if latency:
+            await asyncio.sleep(latency)
+        if random.random() < fail_rate:
+            return Response(status_code=503, headers={"Retry-After": "0"})
+        dest = int(request.path_params["dest"])
+        requests[dest] += 1
+        received[dest] += len((await request.json())["events"])
+        return Response(status_code=204)
+
+    return Starlette(routes=[Route("/hook/{dest}", hook, methods=["POST"])])
+
+
+async def setup(n: int, port: int) -> list[int]:
+    async with async_session_maker() as session:
+        await cleanup_db(session)
+        app_id = (
+            await session.execute(
+                insert(MarketplaceApp)
+                .values(slug=BENCH_SLUG, name="Webhook bench", description="Temporary", category="automation")
+                .returning(MarketplaceApp.id)
+            )
+        ).scalar_one()
+        rows = [
+            {"user_id": BENCH_USER_ID, "app_id": app_id, "config": {"webhook_url": f"http://127.0.0.1:{port}/hook/{i}"}}
+            for i in range(n)
+        ]
+        result = await session.execute(insert(UserAppIntegration).returning(UserAppIntegration.id), rows)
+        ids = list(result.scalars())
+        await session.commit()
+    return ids
+
+
+async def cleanup_db(session) -> None:
+    app_ids = select(MarketplaceApp.id).where(MarketplaceApp.slug == BENCH_SLUG).scalar_subquery()
+    await session.execute(delete(UserAppIntegration).where(UserAppIntegration.app_id.in_(app_ids)))
+    await session.execute(delete(MarketplaceApp).where(MarketplaceApp.slug == BENCH_SLUG))
+
+
+async def cleanup(ids: list[int]) -> None:
+    async with async_session_maker() as session:
+        await cleanup_db(session)
+        await session.commit()
+    redis = get_redis()
+    async with redis.pipeline(transaction=False) as pipe:
+        for integration_id in ids:
+            pipe.delete(
+                delivery.PENDING_KEY.format(integration_id),
+                delivery.INFLIGHT_KEY.format(integration_id),
+                delivery.LEASE_KEY.format(integration_id),
+            )
+            pipe.zrem(delivery.DUE_KEY, str(integration_id))
+            pipe.hdel(delivery.ATTEMPTS_KEY, str(integration_id))
+        await pipe.execute()
+
+
+async def run(args: argparse.Namespace) -> None:
+    # Deliver immediately and retry fast so the run measures throughput, not waiting
+    settings.webhook_batch_window_seconds = 0.2
+    settings.webhook_retry_base_seconds = 0.1
+    # The stub listens on plain http on localhost
+    settings.webhook_allow_http = True
+    settings.webhook_allow_private_hosts = True
+    # Every destination is the same stub host; lift the per-host limits
+    settings.webhook_per_host_rate = 0
+    settings.webhook_per_host_concurrency = settings.webhook_max_connections
+    received: Counter = Counter()
+    requests: Counter = Counter()
+    config = uvicorn.Config(
+        stub_app(received, requests, args.fail_rate, args.latency_ms / 1000),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+    )
+    server = uvicorn.Server(config)
+    serve = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    ids = await setup(args.integrations, args.port)
+    ctx = {"redis": await get_queue(), "webhook_http": delivery.create_webhook_client()}
+    try:
+        start = time.perf_counter()
+        for n in range(args.events):
+            event = webhooks.make_event(
+                "forecast.updated", {"forecastId": n, "target": f"Bench target {n}", "probability": 0.5}
+            )
+            await delivery.webhook_fan_out(ctx, event)
+        fanned = time.perf_counter() - start
+
+        expected = args.events * args.integrations
+        totals = Counter()
+        while sum(received.values()) < expected and time.perf_counter() - start < args.timeout:
+            totals.update({k: v for k, v in (await delivery.webhook_deliver(ctx)).items() if k != "seconds"})
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - start
+    finally:
+        await ctx["webhook_http"].aclose()
+        await cleanup(ids)
+        server.should_exit = True
+        await serve
+
+    delivered = sum(received.values())
+    sent = sum(requests.values())
+    print(f"Integrations: {args.integrations}, events: {args.events}")
+    print(f"Fan-out:      {fanned:.2f}s")
+    print(f"Delivered:    {delivered}/{args.events * args.integrations} events in {sent} requests "
+          f"({delivered / max(sent, 1):.1f} events/request) in {elapsed:.2f}s")
+    print(f"Throughput:   {sent / elapsed:,.0f} requests/s, {delivered / elapsed:,.0f} events/s")
+    print(f"Outcomes:     {dict(totals)}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--integrations", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of stub responses that are 503")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stub response delay")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+    try:
+        await run(args)
+    finally:
+        await close_queue()
+        await close_redis()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,285 @@
+"""Synthetic production-sized data for benchmarks (seed_db.py --generate).
+
+Rows are generated lazily and streamed into Postgres with asyncpg COPY, bypassing
+the ORM, so millions of rows load in minutes with flat memory. Distributions are
+shaped like real traffic: a few feeds produce most items (Zipf), publication times
+skew recent, the newest items are still pending extraction, body lengths are
+log-normal, and each forecast spec has a Poisson number of runs. Ids are assigned
+after the current max id, so the generator can run on top of existing data.
+"""
+
+import json
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+
+from core import partitions, stats
+from core.cache import close_redis
+from core.config import get_settings
+from core.db import engine
+
+settings = get_settings()
+
+TOPICS = ("politics", "economy", "elections", "business", "technology", "health", "climate", "world")
+TOPIC_WEIGHTS = (0.28, 0.16, 0.14, 0.12, 0.1, 0.08, 0.07, 0.05)
+ENTITIES = (
+    "Labour", "Conservative", "Liberal Democrats", "Reform UK", "SNP", "Green Party", "Bank of England",
+    "ONS", "HM Treasury", "NHS", "European Union", "United States", "Ofgem", "IMF", "Westminster",
+)
+MODELS = ("baseline", "elections_seat_model", "poll_average", "ensemble")
+GRANULARITIES = ("binary", "numeric", "categorical")
+_WORDS = (
+    "government minister election poll vote seats majority budget inflation rate growth economy forecast "
+    "probability survey leader party campaign policy tax spending energy prices wages unemployment housing "
+    "market bank interest decision report data analysis result council parliament debate voters turnout "
+    "constituency swing margin estimate quarter annual rise fall sharp modest record lowest highest since "
+    "according official figures showed expected analysts warned said announced plans confirmed week month"
+).split()
+
+
+@dataclass
+class Volumes:
+    """Row counts and shape parameters for one generator run."""
+
+    feeds: int = 500
+    rss_items: int = 5_000_000
+    articles: int = 1_000_000
+    forecast_specs: int = 100_000
+    runs_per_spec: float = 4.0  # Poisson mean, at least one run each
+    days: int = 365
+    pending_ratio: float = 0.02  # newest items left unprocessed
+    seed: int = 42
+
+
+class _Text:
+    """Cheap synthetic prose: sentences are sampled from a pre-built pool."""
+
+    def __init__(self, rng: np.random.Generator, n_sentences: int = 4096):
+        words = np.array(_WORDS)
+        self.sentences = []
+        for length in rng.integers(8, 24, n_sentences):
+            sentence = " ".join(rng.choice(words, length))
+            self.sentences.append(sentence[0].upper() + sentence[1:] + ".")
+
+    def title(self, i: int) -> str:
+        return self.sentences[(i * 7919) % len(self.sentences)][:-1]
+
+    def paragraph(self, i: int, n_sentences: int) -> str:
+        pool = self.sentences
+        return " ".join(pool[(i * 104729 + k * 31) % len(pool)] for k in range(n_sentences))
+
+
+async def _next_id(conn, table: str) -> int:
+    return int(await conn.fetchval(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"))
+
+
+async def _sync_sequence(conn, table: str) -> None:
+    await conn.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+    )
+
+
+async def _copy(conn, table: str, columns: list[str], records: Iterator[tuple], count: int) -> None:
+    start = time.perf_counter()
+    await conn.copy_records_to_table(table, columns=columns, records=records)
+    elapsed = time.perf_counter() - start
+    print(f"  {table:<16} {count:>10,} rows in {elapsed:7.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> np.ndarray:
+    w = 1.0 / np.arange(1, n + 1) ** s
+    return w / w.sum()
+
+
+def _article_slot(i: int, n_articles: int, n_processed: int) -> int:
+    """Article index for processed item i, or -1; spreads exactly n_articles over n_processed items."""
+    hi = (i + 1) * n_articles // n_processed
+    return hi - 1 if hi > i * n_articles // n_processed else -1
+
+
+async def generate(volumes: Volumes) -> None:
+    """Generate and COPY all tables for volumes."""
+    rng = np.random.default_rng(volumes.seed)
+    text = _Text(rng)
+    now = datetime.now(UTC)
+    n_items = volumes.rss_items
+    n_pending = int(n_items * volumes.pending_ratio)
+    n_processed = n_items - n_pending
+    n_articles = min(volumes.articles, n_processed)
+
+    # Per-item attributes as compact arrays; both the items and articles passes index them
+    feed_of_item = rng.choice(volumes.feeds, size=n_items, p=_zipf_weights(volumes.feeds)).astype(np.int32)
+    # Recency-skewed ages, sorted so id order follows publication order (newest = highest id)
+    age_seconds = np.sort(rng.exponential(volumes.days * 86400 / 4, n_items).clip(0, volumes.days * 86400))[::-1]
+    age_seconds = age_seconds.astype(np.int32)
+    body_sentences = rng.lognormal(mean=2.6, sigma=0.5, size=n_items).clip(3, 120).astype(np.int16)
+    topic_of_item = rng.choice(len(TOPICS), size=n_items, p=TOPIC_WEIGHTS).astype(np.int8)
+
+    async with engine.connect() as sa_conn:
+        conn = (await sa_conn.get_raw_connection()).driver_connection
+        feed_base = await _next_id(conn, "rss_feeds")
+        item_base = await _next_id(conn, "rss_items")
+        article_base = await _next_id(conn, "articles")
+        spec_base = await _next_id(conn, "forecast_specs")
+        run_base = await _next_id(conn, "forecast_runs")
+        sources = [f"Load Source {feed_base + f}" for f in range(volumes.feeds)]
+
+        def feeds() -> Iterator[tuple]:
+            counts = np.bincount(feed_of_item, minlength=volumes.feeds)
+            for f in range(volumes.feeds):
+                yield (
+                    feed_base + f,
+                    sources[f],
+                    f"https://load-{feed_base + f}.example.com/rss.xml",
+                    TOPICS[f % len(TOPICS)],
+                    "active" if f % 20 else "paused",
+                    int(counts[f]),
+                    now - timedelta(minutes=int(rng.integers(1, 60))),
+                )
+
+        def published(i: int) -> datetime:
+            return now - timedelta(seconds=int(age_seconds[i]))
+
+        def item_url(i: int) -> str:
+            return f"https://load-{feed_base + int(feed_of_item[i])}.example.com/news/{item_base + i}"
+
+        def items() -> Iterator[tuple]:
+            for i in range(n_items):
+                slot = _article_slot(i, n_articles, n_processed) if i < n_processed else -1
+                when = published(i)
+                yield (
+                    item_base + i,
+                    item_url(i),
+                    f"load-{item_base + i}",
+                    text.title(i),
+                    text.paragraph(i, 2),
+                    sources[feed_of_item[i]],
+                    when,
+                    when + timedelta(minutes=5),
+                    when + timedelta(minutes=6) if i < n_processed else None,
+                    article_base + slot if slot >= 0 else None,
+                )
+
+        def articles() -> Iterator[tuple]:
+            for i in range(n_processed):
+                slot = _article_slot(i, n_articles, n_processed)
+                if slot < 0:
+                    continue
+                when = published(i) + timedelta(minutes=6)
+                topic = TOPICS[topic_of_item[i]]
+                entities = [ENTITIES[(i + k * 5) % len(ENTITIES)] for k in range(1 + i % 4)]
+                yield (
+                    article_base + slot,
+                    item_base + i,
+                    text.title(i),
+                    text.paragraph(i + 1, 1)[:512],
+                    text.paragraph(i, int(body_sentences[i])),
+                    item_url(i),
+                    sources[feed_of_item[i]],
+                    json.dumps([topic]),
+                    json.dumps(entities),
+                    json.dumps([{"value": f"{i % 97}%", "context": text.title(i + 3)}]),
+                    json.dumps([]),
+                    when,
+                    when,
+                )
+
+        runs_per_spec = np.maximum(rng.poisson(volumes.runs_per_spec, volumes.forecast_specs), 1)
+        spec_topics = rng.choice(len(TOPICS), size=volumes.forecast_specs, p=TOPIC_WEIGHTS)
+
+        def specs() -> Iterator[tuple]:
+            for s in range(volumes.forecast_specs):
+                yield (
+                    spec_base + s,
+                    article_base + int(s * n_articles / volumes.forecast_specs) if n_articles else None,
+                    f"Load target {spec_base + s}",
+                    f"{2025 + s % 3} outcome",
+                    GRANULARITIES[s % len(GRANULARITIES)],
+                    json.dumps({}),
+                    TOPICS[spec_topics[s]],
+                    now - timedelta(days=int(rng.integers(0, volumes.days))),
+                )
+
+        def runs() -> Iterator[tuple]:
+            run_id = run_base
+            for s in range(volumes.forecast_specs):
+                k = int(runs_per_spec[s])
+                estimates = rng.beta(4, 4, k)
+                ages = np.sort(rng.integers(0, volumes.days * 86400, k))
+                for j in range(k):
+                    p = float(estimates[j])
+                    result = {
+                        "point_estimate": round(p, 4),
+                        "ci_low": round(max(p - 0.12, 0.0), 4),
+                        "ci_high": round(min(p + 0.12, 1.0), 4),
+                        "distribution": "beta",
+                    }
+                    yield (
+                        run_id,
+                        spec_base + s,
+                        MODELS[(s + j) % len(MODELS)],
+                        json.dumps(result),
+                        json.dumps([]),
+                        now - timedelta(seconds=int(ages[j])),
+                        json.dumps({"generated": True}),
+                    )
+                    run_id += 1
+
+        print(f"Generating load data (seed={volumes.seed})...")
+        # rss_items and forecast_runs are partitioned by month: cover the generated time range
+        first = partitions.month_start(now - timedelta(days=volumes.days + 1))
+        last = partitions.add_months(partitions.month_start(now), settings.partition_premake_months)
+        for table in partitions.PARTITIONED:
+            await partitions.ensure_partitions(conn, table, first, last)
+        await _copy(
+            conn, "rss_feeds",
+            ["id", "name", "url", "category", "status", "articles_count", "last_fetched_at"],
+            feeds(), volumes.feeds,
+        )
+        await _copy(
+            conn, "rss_items",
+            ["id", "url", "guid", "title", "body", "source", "published_at", "fetched_at", "processed_at",
+             "article_id"],
+            items(), n_items,
+        )
+        await _copy(
+            conn, "articles",
+            ["id", "rss_item_id", "headline", "dek", "body", "article_url", "source", "topics", "entities",
+             "key_numbers", "quotes", "created_at", "updated_at"],
+            articles(), n_articles,
+        )
+        await _copy(
+            conn, "forecast_specs",
+            ["id", "article_id", "target", "horizon", "granularity", "constraints", "topic", "created_at"],
+            specs(), volumes.forecast_specs,
+        )
+        await _copy(
+            conn, "forecast_runs",
+            ["id", "forecast_spec_id", "model_name", "result", "calibration_flags", "run_at", "metadata"],
+            runs(), int(runs_per_spec.sum()),
+        )
+
+        for table in ("rss_feeds", "rss_items", "articles", "forecast_specs", "forecast_runs"):
+            await _sync_sequence(conn, table)
+            await conn.execute(f"ANALYZE {table}")
+    await stats.invalidate()
+    await close_redis()
+    await engine.dispose()
+    print("Load data complete.")
+
+
+def volumes_from_args(args: Any) -> Volumes:
+    return Volumes(
+        feeds=args.feeds,
+        rss_items=args.rss_items,
+        articles=args.articles,
+        forecast_specs=args.forecast_specs,
+        runs_per_spec=args.runs_per_spec,
+        days=args.days,
+        pending_ratio=args.pending_ratio,
+        seed=args.seed,
+    )
@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
-"""Seed the database with initial data. Run after alembic upgrade head."""
+"""Seed the database with initial data. Run after alembic upgrade head.
 
+    python scripts/seed_db.py                 # sample rows for development
+    python scripts/seed_db.py --generate      # production-sized synthetic data via COPY
+    python scripts/seed_db.py --generate --rss-items 500000 --articles 100000 --forecast-specs 10000
+"""
+
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -10,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from sqlalchemy import select
 
+from core import catalog
 from core.config import get_settings
 from core.db import async_session_maker
 from core.auth import get_password_hash
@@ -177,7 +184,7 @@ async def seed_sample_forecast(session, project_id: int | None) -> int:
             "distribution": "beta",
         },
         calibration_flags=[],
-        metadata={"seed": True},
+        run_metadata={"seed": True},
     )
     session.add(run)
     return 1
@@ -414,6 +421,9 @@ async def run_seed():
             print(f"  Marketplace apps: {n_m} added")
 
             await session.commit()
+            if n_m:
+                # The script exits before the commit hook's bump would run
+                await catalog.invalidate()
             print("Seed complete.")
         except Exception as e:
             await session.rollback()
@@ -421,6 +431,24 @@ async def run_seed():
 
 
 def main():
+    from scripts.load_data import Volumes, generate, volumes_from_args
+
+    defaults = Volumes()
+    parser = argparse.ArgumentParser(description="Seed the database.")
+    parser.add_argument("--generate", action="store_true", help="Bulk-load synthetic data instead of samples")
+    parser.add_argument("--feeds", type=int, default=defaults.feeds)
+    parser.add_argument("--rss-items", type=int, default=defaults.rss_items)
+    parser.add_argument("--articles", type=int, default=defaults.articles)
+    parser.add_argument("--forecast-specs", type=int, default=defaults.forecast_specs)
+    parser.add_argument("--runs-per-spec", type=float, default=defaults.runs_per_spec, help="Poisson mean")
+    parser.add_argument("--days", type=int, default=defaults.days, help="Publication window")
+    parser.add_argument("--pending-ratio", type=float, default=defaults.pending_ratio)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    if args.generate:
+        asyncio.run(generate(volumes_from_args(args)))
+        return
     print("Seeding database...")
     asyncio.run(run_seed())
 
@@ -0,0 +1,86 @@
+"""Draft stage: run the agent pipeline (agents.pipeline) for one article.
+
+``draft_article`` runs on the draft queue, where the LLM-bound agents live, and is
+deduplicated by article id. Checkpoints are kept in Redis, so a job that is
+retried or enqueued again resumes after the last completed stage. Stages with no
+agent for the article are skipped by ``Pipeline.standard``.
+"""
+
+import logging
+import time
+from typing import Any, Optional
+
+from sqlalchemy import select
+
+from agents.base import BaseAgent
+from agents.pipeline import COMPLETED_KEY, Pipeline, PipelineError, RedisCheckpointStore
+from agents.seat_model import SeatForecastAgent
+from core.config import get_settings
+from core.db import async_session_maker
+from models.article import Article
+from models.dataset import Dataset
+from schemas.pipeline import ProjectContext
+from workers.forecast import SEAT_INPUTS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def pipeline_agents(context: ProjectContext) -> dict[str, BaseAgent]:
+    """Agents keyed by stage name for this article's pipeline."""
+    agents: dict[str, BaseAgent] = {}
+    if context.dataset and all(k in context.dataset for k in SEAT_INPUTS):
+        agents["forecast"] = SeatForecastAgent(n_sims=settings.forecast_n_sims)
+    return agents
+
+
+async def _context(article_id: int) -> Optional[ProjectContext]:
+    async with async_session_maker() as session:
+        article = await session.get(Article, article_id)
+        if article is None:
+            return None
+        dataset = (
+            await session.execute(
+                select(Dataset).where(Dataset.article_id == article_id).order_by(Dataset.id.desc()).limit(1)
+            )
+        ).scalar_one_or_none()
+    return ProjectContext(
+        article_id=str(article.id),
+        topic=next(iter(article.topics or []), ""),
+        origin_article={
+            "headline": article.headline,
+            "dek": article.dek,
+            "url": article.article_url,
+            "source": article.source,
+            "key_numbers": article.key_numbers or [],
+            "quotes": article.quotes or [],
+        },
+        dataset=dataset.data if dataset else None,
+        dataset_id=str(dataset.id) if dataset else None,
+    )
+
+
+async def draft_article(ctx: dict, article_id: int) -> dict[str, Any]:
+    """ARQ job: run (or resume) the pipeline for one article."""
+    start = time.perf_counter()
+    context = await _context(article_id)
+    if context is None:
+        return {"article": article_id, "status": "missing"}
+    agents = pipeline_agents(context)
+    if not agents:
+        return {"article": article_id, "status": "skipped"}
+
+    pipeline = Pipeline.standard(agents, store=RedisCheckpointStore())
+    try:
+        context = await pipeline.run(context)
+    except PipelineError as e:
+        logger.warning("Pipeline for article %s failed at %s: %s", article_id, e.stage, e.__cause__)
+        return {"article": article_id, "status": "failed", "stage": e.stage}
+
+    seconds = round(time.perf_counter() - start, 3)
+    return {
+        "article": article_id,
+        "status": context.status.value,
+        "stages": context.metadata.get(COMPLETED_KEY, []),
+        "seconds": seconds,
+    }
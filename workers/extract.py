@@ -0,0 +1,251 @@
+"""Article extraction: turn pending RssItem rows into Article rows.
+
+HTML parsing is CPU-bound, so items are parsed in a ProcessPoolExecutor while the
+event loop only streams batches from the database and writes results in bulk.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+import traceback
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+from arq import ArqRedis
+from bs4 import BeautifulSoup
+from readability import Document
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from core import stats
+from core.config import get_settings
+from core.db import async_session_maker
+from models.article import Article
+from models.rss import RssItem
+from workers import queues
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+INSERT_CHUNK_ROWS = 2000  # 10 params per row keeps each INSERT under asyncpg's 32767 limit
+MAX_KEY_NUMBERS = 20
+MAX_QUOTES = 10
+
+_NUMBER_RE = re.compile(
+    r"(?:[£$€]\s?)?\b\d{1,3}(?:,\d{3})*(?:\.\d+)?\s?(?:%|per cent|percent|bn|billion|m\b|million|k\b|seats?|votes?)?",
+    re.IGNORECASE,
+)
+_QUOTE_RE = re.compile(r"[\"“]([^\"”]{20,400})[\"”]")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _pool_size() -> int:
+    return settings.extract_processes or os.cpu_count() or 1
+
+
+def create_process_pool() -> ProcessPoolExecutor:
+    """Process pool sized to the machine (EXTRACT_PROCESSES=0 means one per core)."""
+    return ProcessPoolExecutor(max_workers=_pool_size())
+
+
+def _text(html: str) -> str:
+    soup = BeautifulSoup(html, "lxml")
+    return re.sub(r"\s+\n", "\n", soup.get_text("\n", strip=True))
+
+
+def _key_numbers(text: str) -> list[dict[str, str]]:
+    """Numbers with a unit or currency, plus the sentence they appear in."""
+    found = []
+    for sentence in _SENTENCE_RE.split(text):
+        for m in _NUMBER_RE.finditer(sentence):
+            value = m.group(0).strip()
+            if value.isdigit() and len(value) == 4:
+                continue  # bare years are context, not figures
+            found.append({"value": value, "context": sentence.strip()[:300]})
+            if len(found) >= MAX_KEY_NUMBERS:
+                return found
+    return found
+
+
+def extract_item(item: tuple) -> Optional[dict[str, Any]]:
+    """Extract one (id, url, title, summary, raw_html, source) tuple (None when it has no text)."""
+    item_id, url, title, summary, raw_html, source = item
+    if raw_html:
+        doc = Document(raw_html)
+        headline = doc.short_title() or title
+        body = _text(doc.summary(html_partial=True))
+    else:
+        headline = title
+        body = _text(summary) if summary else ""
+    if not body:
+        return None
+    dek = _text(summary) if summary else _SENTENCE_RE.split(body, maxsplit=1)[0]
+    return {
+        "rss_item_id": item_id,
+        "headline": (headline or url)[:1024],
+        "dek": dek[:512] or None,
+        "body": body,
+        "article_url": url,
+        "source": source,
+        "topics": [],
+        "entities": [],
+        "key_numbers": _key_numbers(body),
+        "quotes": [q.strip() for q in _QUOTE_RE.findall(body)[:MAX_QUOTES]],
+    }
+
+
+def extract_chunk(items: list[tuple]) -> tuple[list[Optional[dict[str, Any]]], list[tuple[int, str, str]]]:
+    """Extract a chunk of items in one process round trip. Runs in a worker process.
+
+    Returns the results in item order (None for failures) and (item id, exception
+    class, traceback) per failure, so malformed markup doesn't take down the chunk
+    and the parent can still log what went wrong.
+    """
+    results: list[Optional[dict[str, Any]]] = []
+    errors: list[tuple[int, str, str]] = []
+    for item in items:
+        try:
+            results.append(extract_item(item))
+        except Exception as e:
+            results.append(None)
+            errors.append((item[0], type(e).__name__, traceback.format_exc()))
+    return results, errors
+
+
+async def _extract_parallel(pool: Executor, items: list[tuple], workers: int) -> tuple[list[Optional[dict]], int]:
+    """Results in item order and the number of items whose extraction raised."""
+    loop = asyncio.get_running_loop()
+    size = max(1, -(-len(items) // workers))
+    chunks = [items[i : i + size] for i in range(0, len(items), size)]
+    results = await asyncio.gather(*(loop.run_in_executor(pool, extract_chunk, c) for c in chunks))
+    n_errors = 0
+    for chunk, (_, errors) in zip(chunks, results):
+        if errors:
+            n_errors += len(errors)
+            item_id, error, trace = errors[0]
+            logger.warning(
+                "Extraction failed for %s of %s items (%s); first: item %s %s\n%s",
+                len(errors),
+                len(chunk),
+                ", ".join(f"{i}: {name}" for i, name, _ in errors[:10]),
+                item_id,
+                error,
+                trace.rstrip(),
+            )
+    return [r for extracted, _ in results for r in extracted], n_errors
+
+
+async def _write_batch(
+    items: list[tuple], fetched_at: list[datetime], extracted: list[Optional[dict]]
+) -> dict[int, int]:
+    """Insert the batch's articles and mark every item processed (failed ones without an article).
+
+    Returns {rss_item_id: article_id} for the articles created.
+    """
+    now = datetime.now(UTC)
+    article_ids: dict[int, int] = {}
+    async with async_session_maker() as session:
+        rows = [row for row in extracted if row]
+        table = Article.__table__
+        for i in range(0, len(rows), INSERT_CHUNK_ROWS):
+            result = await session.execute(
+                insert(table).values(rows[i : i + INSERT_CHUNK_ROWS]).returning(table.c.id, table.c.rss_item_id)
+            )
+            article_ids.update({rss_item_id: article_id for article_id, rss_item_id in result.all()})
+        stats.record(session, total_articles=len(article_ids))
+
+        items_table = RssItem.__table__
+        await session.execute(
+            update(items_table)
+            # fetched_at (the partition key) limits each update to one partition
+            .where(items_table.c.id == bindparam("b_id"), items_table.c.fetched_at == bindparam("b_fetched_at"))
+            .values(processed_at=bindparam("b_processed_at"), article_id=bindparam("b_article_id")),
+            [
+                {
+                    "b_id": item[0],
+                    "b_fetched_at": fetched,
+                    "b_processed_at": now,
+                    "b_article_id": article_ids.get(item[0]),
+                }
+                for item, fetched in zip(items, fetched_at)
+            ],
+        )
+        await session.commit()
+    return article_ids
+
+
+async def _enqueue_drafts(
+    redis: ArqRedis, article_ids: dict[int, int], published_at: dict[int, Optional[datetime]]
+) -> None:
+    """Hand new articles to the draft stage; fresh news takes the breaking lane."""
+    for rss_item_id, article_id in article_ids.items():
+        lane = queues.lane_for(published_at.get(rss_item_id))
+        await queues.enqueue(redis, "draft", "draft_article", article_id, key=article_id, lane=lane)
+
+
+async def sweep_pending(ctx: dict) -> None:
+    """ARQ cron job: queue an extraction pass in case a poll's enqueue was lost.
+
+    Goes through the keyed job rather than extracting directly, so it never runs
+    alongside a pass that is already queued or running.
+    """
+    await queues.enqueue(ctx["redis"], "extract", "extract_pending", key="all", lane="backfill")
+
+
+async def extract_pending(ctx: dict, limit: Optional[int] = None) -> dict[str, Any]:
+    """ARQ job: stream unprocessed RssItems in id order and extract them in parallel."""
+    start = time.perf_counter()
+    pool: Executor = ctx.get("process_pool") or create_process_pool()
+    workers = _pool_size()
+    batch_size = settings.extract_batch_size
+    totals = {"items": 0, "articles": 0, "failed": 0, "errors": 0}
+    last_id = 0
+    try:
+        while limit is None or totals["items"] < limit:
+            take = batch_size if limit is None else min(batch_size, limit - totals["items"])
+            async with async_session_maker() as session:
+                result = await session.execute(
+                    select(
+                        RssItem.id,
+                        RssItem.url,
+                        RssItem.title,
+                        RssItem.body,
+                        RssItem.raw_html,
+                        RssItem.source,
+                        RssItem.fetched_at,
+                        RssItem.published_at,
+                    )
+                    .where(RssItem.processed_at.is_(None), RssItem.id > last_id)
+                    .order_by(RssItem.id)
+                    .limit(take)
+                )
+                rows = result.all()
+            if not rows:
+                break
+            if "redis" in ctx:
+                await queues.backpressure(ctx["redis"], "forecast", "draft")
+            items = [tuple(row[:6]) for row in rows]
+            last_id = items[-1][0]
+            extracted, errors = await _extract_parallel(pool, items, workers)
+            created = await _write_batch(items, [row[6] for row in rows], extracted)
+            if created and "redis" in ctx:
+                await _enqueue_drafts(ctx["redis"], created, {row[0]: row[7] for row in rows})
+            totals["items"] += len(items)
+            totals["articles"] += len(created)
+            totals["failed"] += len(items) - len(created)
+            totals["errors"] += errors
+    finally:
+        if "process_pool" not in ctx:
+            pool.shutdown(wait=False)
+
+    elapsed = time.perf_counter() - start
+    totals["seconds"] = round(elapsed, 3)
+    totals["items_per_sec"] = round(totals["items"] / elapsed, 1) if elapsed > 0 else 0.0
+    logger.info(
+        "Extracted %(articles)s articles from %(items)s items, %(errors)s extraction errors (%(items_per_sec)s items/s)",
+        totals,
+    )
+    return totals
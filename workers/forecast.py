@@ -0,0 +1,267 @@
+"""Forecast stage: recompute one ForecastSpec from its input datasets.
+
+``forecast_spec`` runs on the forecast queue, deduplicated by spec id. Inputs are
+the datasets listed in ``constraints.dataset_ids``, else those attached to the
+spec's article, else the latest dataset for its topic. Datasets carrying seat
+model inputs (``parties``, ``baseline_shares``, ``poll_shares``) are simulated
+with agents.seat_model; the simulation is seeded with the spec id so unchanged
+inputs reproduce the same result.
+
+A new ForecastRun is written only when the result moves by more than
+FORECAST_REFRESH_TOLERANCE; otherwise the latest run's metadata just records the
+inputs' fingerprint and the check time (see workers.refresh).
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+import numpy as np
+from arq import ArqRedis
+from arq.jobs import Job
+from sqlalchemy import Row, bindparam, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agents.seat_model import simulate_seats, summarise
+from core import partitions, webhooks
+from core.config import get_settings
+from core.db import async_session_maker
+from models.dataset import Dataset
+from models.forecast import ForecastRun, ForecastSpecDB
+from workers import queues
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SEAT_INPUTS = ("parties", "baseline_shares", "poll_shares")
+SEAT_OPTIONS = ("poll_error", "local_error", "weights")
+MODEL_NAME = "elections_seat_model"
+
+
+async def input_datasets(session: AsyncSession, spec: ForecastSpecDB) -> list[Dataset]:
+    """The datasets a spec is computed from, oldest first."""
+    ids = (spec.constraints or {}).get("dataset_ids")
+    if ids:
+        q = select(Dataset).where(Dataset.id.in_(ids))
+    elif spec.article_id is not None:
+        q = select(Dataset).where(Dataset.article_id == spec.article_id)
+    else:
+        q = select(Dataset).where(Dataset.topic == spec.topic).order_by(Dataset.id.desc()).limit(1)
+    return sorted((await session.execute(q)).scalars().all(), key=lambda d: d.id)
+
+
+@dataclass
+class Inputs:
+    """What a spec would be computed from, without loading the dataset blobs."""
+
+    dataset_ids: list[int]
+    fingerprint: str  # changes whenever a dataset is added, removed or edited
+    computable: bool  # the datasets together carry every SEAT_INPUTS key
+
+
+async def input_fingerprints(session: AsyncSession, specs: Sequence[Any]) -> dict[int, Inputs]:
+    """Inputs per spec id, for specs with id, article_id, topic and constraints (same rules as input_datasets).
+
+    Datasets are fingerprinted by their stored data_digest, so the JSONB blobs are neither read nor hashed.
+    """
+    explicit = {s.id: s.constraints["dataset_ids"] for s in specs if (s.constraints or {}).get("dataset_ids")}
+    by_article = {s.id: s.article_id for s in specs if s.id not in explicit and s.article_id is not None}
+    by_topic = {s.id: s.topic for s in specs if s.id not in explicit and s.id not in by_article}
+
+    columns = (
+        Dataset.id,
+        Dataset.article_id,
+        Dataset.topic,
+        Dataset.s3_key,
+        Dataset.data_digest.label("digest"),
+        *(Dataset.data.has_key(key).label(key) for key in SEAT_INPUTS),
+    )
+    rows: list[Row] = []
+    ids = {i for dataset_ids in explicit.values() for i in dataset_ids}
+    if ids:
+        rows += (await session.execute(select(*columns).where(Dataset.id.in_(ids)))).all()
+    if by_article:
+        q = select(*columns).where(Dataset.article_id.in_(set(by_article.values())))
+        rows += (await session.execute(q)).all()
+    topic_rows: dict[str, Row] = {}
+    if by_topic:
+        q = (
+            select(*columns)
+            .where(Dataset.topic.in_(set(by_topic.values())))
+            .distinct(Dataset.topic)
+            .order_by(Dataset.topic, Dataset.id.desc())
+        )
+        topic_rows = {row.topic: row for row in (await session.execute(q)).all()}
+
+    rows_by_id = {row.id: row for row in rows}
+    article_rows: dict[int, list[Row]] = defaultdict(list)
+    for row in rows_by_id.values():
+        if row.article_id is not None:
+            article_rows[row.article_id].append(row)
+
+    out: dict[int, Inputs] = {}
+    for spec in specs:
+        if spec.id in explicit:
+            chosen = [rows_by_id[i] for i in explicit[spec.id] if i in rows_by_id]
+        elif spec.id in by_article:
+            chosen = article_rows.get(spec.article_id, [])
+        else:
+            chosen = [topic_rows[spec.topic]] if spec.topic in topic_rows else []
+        chosen = sorted({row.id: row for row in chosen}.values(), key=lambda row: row.id)
+        digest = hashlib.sha256(
+            "|".join(f"{row.id}:{row.digest}:{row.s3_key or ''}" for row in chosen).encode("utf-8")
+        ).hexdigest()[:32]
+        out[spec.id] = Inputs(
+            dataset_ids=[row.id for row in chosen],
+            fingerprint=digest,
+            computable=bool(chosen) and all(any(getattr(row, key) for row in chosen) for key in SEAT_INPUTS),
+        )
+    return out
+
+
+async def _distinct_latest(
+    session: AsyncSession, spec_ids: list[int], columns: Sequence[Any], since: Optional[datetime]
+) -> dict[int, Row]:
+    q = (
+        select(ForecastRun.forecast_spec_id, ForecastRun.id, ForecastRun.run_at, *columns)
+        .where(ForecastRun.forecast_spec_id.in_(spec_ids))
+        .distinct(ForecastRun.forecast_spec_id)
+        .order_by(ForecastRun.forecast_spec_id, ForecastRun.run_at.desc(), ForecastRun.id.desc())
+    )
+    if since is not None:
+        q = q.where(ForecastRun.run_at >= since)
+    return {row.forecast_spec_id: row for row in (await session.execute(q)).all()}
+
+
+async def latest_runs(session: AsyncSession, spec_ids: list[int], *columns: Any) -> dict[int, Row]:
+    """Latest run per spec: (forecast_spec_id, id, run_at, *columns). Recent partitions are searched first."""
+    if not spec_ids:
+        return {}
+    runs = await _distinct_latest(session, spec_ids, columns, partitions.recent_since())
+    missing = [spec_id for spec_id in spec_ids if spec_id not in runs]
+    if missing:
+        runs.update(await _distinct_latest(session, missing, columns, None))
+    return runs
+
+
+def differs(old: Optional[dict[str, Any]], new: dict[str, Any], tolerance: float) -> bool:
+    """True when point_estimate or any party's win probability moved by more than tolerance."""
+    if not old or "point_estimate" not in old:
+        return True
+    if abs(float(old["point_estimate"]) - new["point_estimate"]) > tolerance:
+        return True
+    old_win = {t.get("party"): t.get("win_prob") for t in old.get("targets") or []}
+    return any(
+        old_win.get(t["party"]) is None or abs(old_win[t["party"]] - t["win_prob"]) > tolerance
+        for t in new["targets"]
+    )
+
+
+def compute(spec_id: int, constraints: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+    """Seat forecast result for a spec (CPU-bound; run off the event loop).
+
+    point_estimate is P(constraints.party wins >= constraints.min_seats seats),
+    defaulting to a majority for the party most likely to win most seats.
+    """
+    sim = simulate_seats(
+        data["parties"],
+        np.asarray(data["baseline_shares"], dtype=np.float32),
+        data["poll_shares"],
+        n_sims=settings.forecast_n_sims,
+        seed=spec_id,
+        **{k: data[k] for k in SEAT_OPTIONS if k in data},
+    )
+    summary = summarise(sim)
+    party = constraints.get("party")
+    if party in sim.parties:
+        i = sim.parties.index(party)
+    else:
+        i = int(np.argmax([t.win_prob for t in summary.targets]))
+    min_seats = int(constraints.get("min_seats") or sim.n_seats // 2 + 1)
+    return {
+        "point_estimate": round(float((sim.seats[:, i] >= min_seats).mean()), 4),
+        "party": sim.parties[i],
+        "min_seats": min_seats,
+        "targets": [t.model_dump() for t in summary.targets],
+        "n_sims": settings.forecast_n_sims,
+    }
+
+
+def _merged(datasets: list[Dataset]) -> dict[str, Any]:
+    """Later datasets override earlier ones key by key (e.g. fresh polls over baseline results)."""
+    data: dict[str, Any] = {}
+    for dataset in datasets:
+        data.update(dataset.data or {})
+    return data
+
+
+async def _mark_checked(session: AsyncSession, latest: Row, inputs: Inputs, checked_at: datetime) -> None:
+    """Record on the latest run that it is still current for these inputs."""
+    table = ForecastRun.__table__
+    metadata = table.c["metadata"]
+    patch = {"input_fingerprint": inputs.fingerprint, "checked_at": checked_at.isoformat()}
+    await session.execute(
+        update(table)
+        # run_at (the partition key) limits the update to one partition
+        .where(table.c.id == latest.id, table.c.run_at == latest.run_at)
+        .values({metadata: metadata.op("||")(bindparam("patch", patch, type_=JSONB))})
+    )
+
+
+async def forecast_spec(ctx: dict, spec_id: int) -> dict[str, Any]:
+    """ARQ job: compute a spec from its datasets; store a new ForecastRun only if the result moved."""
+    start = time.perf_counter()
+    async with async_session_maker() as session:
+        spec = await session.get(ForecastSpecDB, spec_id)
+        if spec is None:
+            return {"spec": spec_id, "status": "missing"}
+        datasets = await input_datasets(session, spec)
+        inputs = (await input_fingerprints(session, [spec]))[spec.id]
+        latest = (await latest_runs(session, [spec.id], ForecastRun.result)).get(spec.id)
+    data = _merged(datasets)
+    if not all(k in data for k in SEAT_INPUTS):
+        return {"spec": spec_id, "status": "no_inputs"}
+
+    # No connection is held while simulating
+    result = await asyncio.to_thread(compute, spec.id, spec.constraints or {}, data)
+    now = datetime.now(UTC)
+    async with async_session_maker() as session:
+        if latest is not None and not differs(latest.result, result, settings.forecast_refresh_tolerance):
+            await _mark_checked(session, latest, inputs, now)
+            await session.commit()
+            status, run_id = "unchanged", latest.id
+        else:
+            run = ForecastRun(
+                project_id=spec.project_id,
+                forecast_spec_id=spec.id,
+                model_name=MODEL_NAME,
+                result=result,
+                calibration_flags=[],
+                run_metadata={
+                    "dataset_ids": inputs.dataset_ids,
+                    "input_fingerprint": inputs.fingerprint,
+                    "checked_at": now.isoformat(),
+                },
+            )
+            session.add(run)
+            await session.flush()
+            await session.refresh(run, ["run_at"])
+            webhooks.publish(session, "forecast.updated", webhooks.forecast_updated(spec, run))
+            await session.commit()
+            status, run_id = "updated", run.id
+
+    seconds = round(time.perf_counter() - start, 3)
+    logger.info("Forecast spec %s %s: %.3f in %ss", spec_id, status, result["point_estimate"], seconds)
+    return {"spec": spec_id, "status": status, "run": run_id, "seconds": seconds}
+
+
+async def enqueue_forecast(redis: ArqRedis, spec_id: int, lane: str = "normal") -> Optional[Job]:
+    """Queue a recompute of spec_id on the forecast queue (None while one is already queued or running)."""
+    return await queues.enqueue(redis, "forecast", "forecast_spec", spec_id, key=spec_id, lane=lane)
@@ -0,0 +1,136 @@
+"""Worker topology: one ARQ queue per pipeline stage, priority lanes, dedup and backpressure.
+
+Each stage (ingest -> extract -> forecast / draft) has its own queue and worker
+process (``python -m workers.runner <stage>``) with its own concurrency and
+timeout, so slow LLM drafting never starves feed polling. Within a queue, ARQ
+runs due jobs in score order; lanes enqueue with a score backdated by
+QUEUE_LANE_STEP_SECONDS per level, so breaking news runs before normal work and
+normal work before backfill while each lane stays FIFO. Jobs about one article
+or forecast spec use a job id derived from it, so enqueueing the same work twice
+while it waits or runs is a no-op. ``backpressure`` lets producers wait while a
+downstream queue is deeper than its QUEUE_<STAGE>_MAX_DEPTH.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+from arq import ArqRedis
+from arq.constants import default_queue_name
+from arq.jobs import Job
+
+from core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+LANES = ("breaking", "normal", "backfill")  # highest priority first
+BACKPRESSURE_MAX_POLL_SECONDS = 10.0
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One stage's queue and the limits of the worker that consumes it."""
+
+    name: str
+    max_jobs: int
+    job_timeout: int
+    max_depth: int = 0  # queued jobs before producers back off (0 = never)
+
+    @property
+    def queue(self) -> str:
+        return f"{default_queue_name}:{self.name}"
+
+
+STAGES: dict[str, Stage] = {
+    "ingest": Stage("ingest", settings.queue_ingest_concurrency, 300),
+    "extract": Stage("extract", settings.queue_extract_concurrency, 900),
+    "forecast": Stage(
+        "forecast", settings.queue_forecast_concurrency, 900, settings.queue_forecast_max_depth
+    ),
+    "draft": Stage("draft", settings.queue_draft_concurrency, 600, settings.queue_draft_max_depth),
+}
+# Every queue a worker consumes: the default one (maintenance, webhooks) plus the stages
+QUEUES = (default_queue_name, *(stage.queue for stage in STAGES.values()))
+
+
+def job_id(function: str, key: Any) -> str:
+    """Deterministic job id: one queued/running job per function and key (article id, spec id)."""
+    return f"{function}:{key}"
+
+
+def lane_for(published_at: Optional[datetime]) -> str:
+    """Breaking for items published within QUEUE_BREAKING_NEWS_MINUTES, backfill for older or undated ones."""
+    if published_at is None:
+        return "backfill"
+    age = datetime.now(UTC) - published_at
+    return "breaking" if age <= timedelta(minutes=settings.queue_breaking_news_minutes) else "backfill"
+
+
+def _score_time(lane: str) -> datetime:
+    if lane not in LANES:
+        raise ValueError(f"Unknown lane: {lane}")
+    boost = (len(LANES) - 1 - LANES.index(lane)) * settings.queue_lane_step_seconds
+    return datetime.now(UTC) - timedelta(seconds=boost)
+
+
+async def enqueue(
+    redis: ArqRedis,
+    stage: str,
+    function: str,
+    *args: Any,
+    key: Any = None,
+    lane: str = "normal",
+    **kwargs: Any,
+) -> Optional[Job]:
+    """Enqueue function on a stage's queue in a lane; with key, deduplicated (None if already queued)."""
+    return await redis.enqueue_job(
+        function,
+        *args,
+        _queue_name=STAGES[stage].queue,
+        _job_id=job_id(function, key) if key is not None else None,
+        _defer_until=_score_time(lane),
+        **kwargs,
+    )
+
+
+async def depths(redis: ArqRedis) -> dict[str, int]:
+    """Queued (not yet started) jobs per queue name."""
+    async with redis.pipeline(transaction=False) as pipe:
+        for queue in QUEUES:
+            pipe.zcard(queue)
+        counts = await pipe.execute()
+    return dict(zip(QUEUES, counts))
+
+
+async def backpressure(redis: ArqRedis, *stages: str) -> float:
+    """Wait while any of the stages is over its max depth, at most QUEUE_BACKPRESSURE_MAX_WAIT_SECONDS.
+
+    Returns the seconds waited; producers call this between batches so they slow
+    down rather than stop when downstream work piles up.
+    """
+    watched = [STAGES[s] for s in stages if STAGES[s].max_depth]
+    if not watched:
+        return 0.0
+    start = time.monotonic()
+    delay = 0.5
+    logged = False
+    while True:
+        async with redis.pipeline(transaction=False) as pipe:
+            for stage in watched:
+                pipe.zcard(stage.queue)
+            counts = await pipe.execute()
+        over = [f"{s.name}={n}" for s, n in zip(watched, counts) if n > s.max_depth]
+        waited = time.monotonic() - start
+        if not over or waited >= settings.queue_backpressure_max_wait_seconds:
+            if over:
+                logger.warning("Queues still saturated after %.0fs (%s); continuing", waited, ", ".join(over))
+            return waited
+        if not logged:
+            logger.info("Backing off: queues saturated (%s)", ", ".join(over))
+            logged = True
+        await asyncio.sleep(min(delay, settings.queue_backpressure_max_wait_seconds - waited))
+        delay = min(delay * 2, BACKPRESSURE_MAX_POLL_SECONDS)
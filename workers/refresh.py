@@ -0,0 +1,125 @@
+"""Incremental forecast refresh: queue only the specs whose inputs or cadence call for it.
+
+``schedule_forecast_refresh`` runs every FORECAST_REFRESH_INTERVAL_MINUTES. It
+pages through the specs, fingerprints each spec's input datasets in Postgres
+(workers.forecast.input_fingerprints) and compares that with the fingerprint and
+check time recorded on its latest run. A spec is due when its inputs changed
+(normal lane) or its ``constraints.refresh_cadence`` expired (backfill lane);
+everything else costs one digest per dataset and nothing more. Due specs become
+``forecast_spec`` jobs on the forecast queue, deduplicated by spec id, so every
+forecast worker shares the work. Enqueueing stops for this round once the queue
+is deeper than QUEUE_FORECAST_MAX_DEPTH; the rest stay due for the next round.
+"""
+
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import select
+
+from core.config import get_settings
+from core.db import async_session_maker
+from models.forecast import ForecastRun, ForecastSpecDB
+from workers import queues
+from workers.forecast import enqueue_forecast, input_fingerprints, latest_runs
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SPEC_PAGE = 1000
+CADENCES = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "monthly": timedelta(days=30),
+}
+DEFAULT_CADENCE = "daily"
+
+
+def cadence(constraints: Optional[dict]) -> Optional[timedelta]:
+    """refresh_cadence as a timedelta: a name above or a number of seconds; "never" = inputs only."""
+    value = (constraints or {}).get("refresh_cadence", DEFAULT_CADENCE)
+    if value in (None, "never", "manual"):
+        return None
+    if isinstance(value, (int, float)) and value > 0:
+        return timedelta(seconds=value)
+    return CADENCES.get(value, CADENCES[DEFAULT_CADENCE])
+
+
+def _checked_at(run: Any) -> datetime:
+    """When the latest run was last confirmed current (its run_at if never re-checked)."""
+    if run.checked_at:
+        try:
+            return datetime.fromisoformat(run.checked_at)
+        except ValueError:
+            pass
+    return run.run_at
+
+
+def due_lane(spec: Any, fingerprint: str, run: Optional[Any], now: datetime) -> Optional[str]:
+    """Lane to queue the spec in, or None when its latest run is still current."""
+    if run is None or run.fingerprint != fingerprint:
+        return "normal"
+    every = cadence(spec.constraints)
+    if every is not None and _checked_at(run) + every <= now:
+        return "backfill"
+    return None
+
+
+async def schedule_forecast_refresh(ctx: dict) -> dict[str, Any]:
+    """ARQ cron job: queue a recompute for every spec whose inputs changed or cadence expired."""
+    start = time.perf_counter()
+    redis = ctx["redis"]
+    forecast_queue = queues.STAGES["forecast"]
+    totals = {"specs": 0, "changed": 0, "expired": 0, "queued": 0, "no_inputs": 0}
+    last_id = 0
+    saturated = False
+    while not saturated:
+        async with async_session_maker() as session:
+            specs = (
+                await session.execute(
+                    select(
+                        ForecastSpecDB.id, ForecastSpecDB.article_id, ForecastSpecDB.topic, ForecastSpecDB.constraints
+                    )
+                    .where(ForecastSpecDB.id > last_id)
+                    .order_by(ForecastSpecDB.id)
+                    .limit(SPEC_PAGE)
+                )
+            ).all()
+            if not specs:
+                break
+            last_id = specs[-1].id
+            inputs = await input_fingerprints(session, specs)
+            runs = await latest_runs(
+                session,
+                [s.id for s in specs],
+                ForecastRun.run_metadata["input_fingerprint"].astext.label("fingerprint"),
+                ForecastRun.run_metadata["checked_at"].astext.label("checked_at"),
+            )
+        totals["specs"] += len(specs)
+
+        now = datetime.now(UTC)
+        for spec in specs:
+            spec_inputs = inputs[spec.id]
+            if not spec_inputs.computable:
+                totals["no_inputs"] += 1
+                continue
+            lane = due_lane(spec, spec_inputs.fingerprint, runs.get(spec.id), now)
+            if lane is None:
+                continue
+            totals["changed" if lane == "normal" else "expired"] += 1
+            if await enqueue_forecast(redis, spec.id, lane=lane) is not None:
+                totals["queued"] += 1
+
+        if forecast_queue.max_depth and await redis.zcard(forecast_queue.queue) > forecast_queue.max_depth:
+            logger.info("Forecast queue saturated; remaining specs wait for the next refresh round")
+            saturated = True
+
+    totals["seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(
+        "Forecast refresh: %(specs)s specs, %(changed)s changed, %(expired)s expired, %(queued)s queued "
+        "in %(seconds)ss",
+        totals,
+    )
+    return totals
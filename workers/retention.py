@@ -0,0 +1,105 @@
+"""Partition maintenance for rss_items and forecast_runs.
+
+Runs daily: creates the monthly partitions PARTITION_PREMAKE_MONTHS ahead and
+the months of any rows that fell into the default partition (moving them out), then
+for every partition entirely older than the table's retention, optionally
+archives it to object storage as gzipped CSV and detaches and drops it.
+Dropping a partition is a catalog operation; no row-by-row DELETE, no vacuum debt.
+"""
+
+import asyncio
+import gzip
+import logging
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime
+from typing import Any, BinaryIO
+
+from core.config import get_settings
+from core.db import engine
+from core.partitions import (
+    PARTITIONED,
+    add_months,
+    default_months,
+    default_name,
+    ensure_partitions,
+    list_partitions,
+    month_start,
+)
+from core.storage import upload_stream
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = 1024 * 1024
+
+
+def _retention_months() -> dict[str, int]:
+    return {
+        "rss_items": settings.rss_items_retention_months,
+        "forecast_runs": settings.forecast_runs_retention_months,
+    }
+
+
+async def _chunks(f: BinaryIO) -> AsyncIterator[bytes]:
+    while chunk := await asyncio.to_thread(f.read, CHUNK_BYTES):
+        yield chunk
+
+
+async def archive_partition(conn: Any, table: str, partition: str, month: date) -> str:
+    """COPY a partition to storage as gzipped CSV (spooled through a temp file). Returns the key."""
+    key = f"{settings.partition_archive_prefix}/{table}/{month:%Y/%m}/{partition}.csv.gz"
+    with tempfile.TemporaryFile() as spool:
+        gz = gzip.GzipFile(fileobj=spool, mode="wb")
+
+        async def write(chunk: bytes) -> None:
+            await asyncio.to_thread(gz.write, chunk)
+
+        await conn.copy_from_table(partition, output=write, format="csv", header=True)
+        gz.close()
+        spool.seek(0)
+        await upload_stream(key, _chunks(spool), "application/gzip")
+    return key
+
+
+async def _expire(conn: Any, table: str, cutoff: date) -> list[str]:
+    dropped = []
+    for partition, month in await list_partitions(conn, table):
+        if add_months(month, 1) > cutoff:
+            break
+        if settings.partition_archive:
+            key = await archive_partition(conn, table, partition, month)
+            logger.info("Archived %s to %s", partition, key)
+        await conn.execute(f"ALTER TABLE {table} DETACH PARTITION {partition}")
+        await conn.execute(f"DROP TABLE {partition}")
+        dropped.append(partition)
+    if table == "rss_items" and dropped:
+        # URLs of dropped items may be ingested again if a feed still lists them
+        cutoff_at = datetime(cutoff.year, cutoff.month, 1, tzinfo=UTC)
+        await conn.execute("DELETE FROM rss_item_urls WHERE fetched_at < $1", cutoff_at)
+    return dropped
+
+
+async def maintain_partitions(ctx: dict) -> dict[str, Any]:
+    """ARQ cron job: create upcoming partitions; archive and drop expired ones."""
+    start = time.perf_counter()
+    current = month_start(datetime.now(UTC))
+    created: list[str] = []
+    dropped: list[str] = []
+    async with engine.connect() as sa_conn:
+        conn = (await sa_conn.get_raw_connection()).driver_connection
+        for table in PARTITIONED:
+            created += await ensure_partitions(conn, table, current, add_months(current, settings.partition_premake_months))
+            for month in await default_months(conn, table):
+                created += await ensure_partitions(conn, table, month, month)
+            if await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {default_name(table)})"):
+                raise RuntimeError(f"{default_name(table)} still holds rows after moving them into monthly partitions")
+        for table, months in _retention_months().items():
+            if months > 0:
+                dropped += await _expire(conn, table, add_months(current, -months))
+
+    totals = {"created": created, "dropped": dropped, "seconds": round(time.perf_counter() - start, 3)}
+    if created or dropped:
+        logger.info("Partitions created %s, dropped %s", created, dropped)
+    return totals
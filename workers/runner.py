@@ -1,26 +1,82 @@
-"""ARQ worker entrypoint."""
+"""ARQ worker entrypoint.
 
+Each pipeline stage has its own queue (workers.queues); run one worker per stage
+in production so each scales and fails independently:
+
+    python -m workers.runner ingest      # or extract, forecast, draft
+    python -m workers.runner default     # maintenance crons and webhooks
+    python -m workers.runner             # every queue in one process (development)
+"""
+
+import argparse
 import asyncio
+import functools
+import time
+from typing import Any
 
-from arq import create_pool
+from arq import create_pool, cron, func
 from arq.connections import RedisSettings
+from arq.worker import create_worker, run_worker
 
 from core.config import get_settings
+from core.db import start_pool_stats_logger
+from core.metrics import JOB_SECONDS
+from workers import queues
+from workers.draft import draft_article
+from workers.extract import create_process_pool, extract_pending, sweep_pending
+from workers.forecast import forecast_spec
+from workers.ingest import create_http_client, poll_feeds
+from workers.refresh import schedule_forecast_refresh
+from workers.retention import maintain_partitions
+from workers.webhooks import create_webhook_client, webhook_deliver, webhook_fan_out
 
 settings = get_settings()
 
 
 async def startup(ctx: dict):
-    """Worker startup: connect to Redis and DB."""
-    ctx["redis"] = await create_pool(RedisSettings.from_url(settings.redis_url))
+    """Worker startup: connect to Redis and DB, open the shared HTTP client."""
+    ctx["redis"] = await create_pool(RedisSettings.from_dsn(settings.redis_url))
+    ctx["http"] = create_http_client()
+    ctx["webhook_http"] = create_webhook_client()
+    ctx["process_pool"] = create_process_pool()
+    if ctx.get("log_pool_stats", True):
+        ctx["pool_stats"] = start_pool_stats_logger("worker")
 
 
 async def shutdown(ctx: dict):
     """Worker shutdown."""
+    if ctx.get("pool_stats") is not None:
+        ctx["pool_stats"].cancel()
+    if "process_pool" in ctx:
+        ctx["process_pool"].shutdown(wait=True, cancel_futures=True)
+    if "http" in ctx:
+        await ctx["http"].aclose()
+    if "webhook_http" in ctx:
+        await ctx["webhook_http"].aclose()
     if "redis" in ctx:
         await ctx["redis"].close()
 
 
+def timed(fn):
+    """Record a job's run time and outcome in arq_job_duration_seconds (keeps the function name)."""
+
+    @functools.wraps(fn)
+    async def wrapper(ctx: dict, *args, **kwargs):
+        status = "error"
+        started = time.perf_counter()
+        try:
+            result = await fn(ctx, *args, **kwargs)
+            status = "ok"
+            return result
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            await JOB_SECONDS.observe(time.perf_counter() - started, function=fn.__name__, status=status)
+
+    return wrapper
+
+
 # Worker functions will be registered here as the orchestration is built
 async def sample_task(ctx: dict, msg: str) -> str:
     """Sample task for testing worker setup."""
@@ -28,17 +84,89 @@ async def sample_task(ctx: dict, msg: str) -> str:
 
 
 class WorkerSettings:
-    """ARQ worker configuration."""
-
-    functions = [sample_task]
+    """ARQ worker configuration for the default queue: maintenance and webhooks."""
+
+    functions = [
+        *(timed(fn) for fn in (sample_task, maintain_partitions, webhook_fan_out)),
+        # No stored result, so the fixed job id can be enqueued again as soon as a run finishes
+        func(timed(webhook_deliver), keep_result=0),
+    ]
+    cron_jobs = [
+        cron(timed(maintain_partitions), hour={3}, minute={15}, run_at_startup=True),
+        cron(timed(webhook_deliver), second={30}),  # retries and anything a missed enqueue left behind
+    ]
     on_startup = startup
     on_shutdown = shutdown
-    redis_settings = RedisSettings.from_url(settings.redis_url)
+    redis_settings = RedisSettings.from_dsn(settings.redis_url)
     max_jobs = 10
     job_timeout = 300
 
 
-if __name__ == "__main__":
-    from arq import run_worker
+def stage_settings(stage: str, functions: list, cron_jobs: tuple = ()) -> dict[str, Any]:
+    """Worker configuration for one stage's queue, with that stage's concurrency and timeout."""
+    s = queues.STAGES[stage]
+    return {
+        "functions": functions,
+        "cron_jobs": list(cron_jobs),
+        "queue_name": s.queue,
+        "on_startup": startup,
+        "on_shutdown": shutdown,
+        "redis_settings": RedisSettings.from_dsn(settings.redis_url),
+        "max_jobs": s.max_jobs,
+        "job_timeout": s.job_timeout,
+    }
+
+
+# Jobs keyed by article / spec id keep no result, so the same key can be queued again once done
+IngestWorkerSettings = stage_settings(
+    "ingest",
+    [timed(poll_feeds)],
+    (cron(timed(poll_feeds), minute=set(range(0, 60, settings.rss_poll_interval_minutes)), run_at_startup=True),),
+)
+ExtractWorkerSettings = stage_settings(
+    "extract",
+    [func(timed(extract_pending), keep_result=0)],
+    (cron(timed(sweep_pending), minute=set(range(0, 60, settings.extract_sweep_interval_minutes))),),
+)
+ForecastWorkerSettings = stage_settings(
+    "forecast",
+    [func(timed(forecast_spec), keep_result=0)],
+    (
+        cron(
+            timed(schedule_forecast_refresh),
+            minute=set(range(0, 60, settings.forecast_refresh_interval_minutes)),
+            run_at_startup=True,
+        ),
+    ),
+)
+DraftWorkerSettings = stage_settings("draft", [func(timed(draft_article), keep_result=0)])
+
+WORKERS: dict[str, Any] = {
+    "default": WorkerSettings,
+    "ingest": IngestWorkerSettings,
+    "extract": ExtractWorkerSettings,
+    "forecast": ForecastWorkerSettings,
+    "draft": DraftWorkerSettings,
+}
+
+
+async def run_all() -> None:
+    """Consume every queue from one process (development and small deployments)."""
+    workers = [
+        create_worker(config, handle_signals=False, ctx={"log_pool_stats": name == "default"})
+        for name, config in WORKERS.items()
+    ]
+    try:
+        await asyncio.gather(*(w.async_run() for w in workers))
+    finally:
+        await asyncio.gather(*(w.close() for w in workers))
 
-    asyncio.run(run_worker(WorkerSettings))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queue", nargs="?", choices=["all", *WORKERS], default="all")
+    args = parser.parse_args()
+    if args.queue == "all":
+        asyncio.run(run_all())
+    else:
+        run_worker(WORKERS[args.queue])
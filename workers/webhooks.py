@@ -0,0 +1,392 @@
+"""Webhook delivery: fan events out to integrations and POST them in per-destination batches.
+
+``webhook_fan_out`` appends an event to the Redis list of every subscribed
+integration and marks the integration due (sorted set, score = due time) after
+the batch window, so bursts of updates to one destination share a request.
+``webhook_deliver`` claims due destinations (ZREM), takes a per-destination
+lease and atomically moves the next batch from the pending list to an in-flight
+list, so overlapping runs never send the same events and events queued while a
+POST is in flight are never trimmed away. Batches go out concurrently over a
+pooled client under a per-host rate limit; a failed batch stays in flight and is
+resent as-is after exponential backoff. Integration status and last_sync_at are
+updated in bulk.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy import select, update
+
+from core.cache import TTLCache, get_redis
+from core.config import get_settings
+from core.db import async_session_maker
+from core.webhooks import UnsafeWebhookURL, check_webhook_url
+from models.marketplace import MarketplaceApp, UserAppIntegration
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Probable.news webhooks (+https://probable.news)"
+PENDING_KEY = "probable:webhooks:pending:{}"
+INFLIGHT_KEY = "probable:webhooks:inflight:{}"
+LEASE_KEY = "probable:webhooks:lease:{}"
+DUE_KEY = "probable:webhooks:due"
+ATTEMPTS_KEY = "probable:webhooks:attempts"
+DELIVER_JOB = "webhook_deliver"
+FAN_OUT_PAGE = 2000  # integrations read per query
+DELIVER_PAGE = 500  # due destinations claimed per round
+DELIVER_MAX_SECONDS = 120  # hand over to the next run well inside job_timeout
+# Released when the send finishes; the TTL only matters if a worker dies holding it. It must
+# outlast waiting on the host limiter plus the POST, so it covers a whole run.
+LEASE_SECONDS = DELIVER_MAX_SECONDS + 60
+URL_CHECK_TTL_SECONDS = 300  # DNS answers are re-checked this often per scheme and host
+# Apps whose incoming webhooks expect a chat message rather than raw events
+TEXT_APPS = {"slack", "microsoft-teams"}
+
+
+# KEYS: pending, inflight. ARGV: max events. Resend an unacknowledged batch as-is,
+# otherwise move the next batch from pending to inflight in one step.
+_TAKE_BATCH = """
+local batch = redis.call('LRANGE', KEYS[2], 0, -1)
+if #batch > 0 then
+    return batch
+end
+batch = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #batch > 0 then
+    redis.call('LTRIM', KEYS[1], #batch, -1)
+    redis.call('RPUSH', KEYS[2], unpack(batch))
+end
+return batch
+"""
+# KEYS: lease. ARGV: token. Release only our own lease.
+_RELEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+_url_checks = TTLCache(10_000, URL_CHECK_TTL_SECONDS)
+
+
+async def _unsafe_reason(url: str) -> Optional[str]:
+    """Why url must not be called (None if it may), cached per scheme and host."""
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc.lower())
+    verdict = _url_checks.get(key)
+    if verdict is None:
+        try:
+            await check_webhook_url(url)
+            verdict = ""
+        except UnsafeWebhookURL as e:
+            verdict = str(e)
+        _url_checks.set(key, verdict)
+    return verdict or None
+
+
+def create_webhook_client() -> httpx.AsyncClient:
+    """Shared client for webhook delivery (one connection pool per worker).
+
+    Redirects are not followed: the destination was checked, its redirect target was not.
+    """
+    return httpx.AsyncClient(
+        follow_redirects=False,
+        timeout=httpx.Timeout(settings.webhook_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.webhook_max_connections,
+            max_keepalive_connections=settings.webhook_max_connections,
+        ),
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
+class HostRateLimiter:
+    """Per-host concurrency cap plus a minimum spacing between request starts.
+
+    The overall cap matches the client's connection pool, so queued requests wait
+    here rather than hitting httpx's pool timeout.
+    """
+
+    def __init__(self, per_host: int, rate: float, total: int):
+        self._total = asyncio.Semaphore(total)
+        self._per_host = per_host
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._next_start: dict[str, float] = defaultdict(float)
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        host = urlsplit(url).netloc.lower()
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(self._per_host)
+        async with sem, self._total:
+            if self._interval:
+                now = time.monotonic()
+                start = max(now, self._next_start[host])
+                self._next_start[host] = start + self._interval
+                if start > now:
+                    await asyncio.sleep(start - now)
+            yield
+
+
+def _subscribed(config: Optional[dict], event_type: str) -> bool:
+    """Integrations opt in with config.webhook_url; config.events optionally narrows the event types."""
+    if not isinstance(config, dict) or not config.get("webhook_url"):
+        return False
+    events = config.get("events")
+    return not events or event_type in events
+
+
+async def webhook_fan_out(ctx: dict, event: dict[str, Any]) -> dict[str, Any]:
+    """ARQ job: queue event for every subscribed active integration, then schedule delivery."""
+    redis = get_redis()
+    payload = json.dumps(event, separators=(",", ":"))
+    due_at = time.time() + settings.webhook_batch_window_seconds
+    last_id = 0
+    targets = 0
+    while True:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(UserAppIntegration.id, UserAppIntegration.config)
+                .where(UserAppIntegration.status == "active", UserAppIntegration.id > last_id)
+                .order_by(UserAppIntegration.id)
+                .limit(FAN_OUT_PAGE)
+            )
+            rows = result.all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        ids = [row.id for row in rows if _subscribed(row.config, event["type"])]
+        if not ids:
+            continue
+        async with redis.pipeline(transaction=False) as pipe:
+            for integration_id in ids:
+                key = PENDING_KEY.format(integration_id)
+                pipe.rpush(key, payload)
+                pipe.ltrim(key, -settings.webhook_max_pending_events, -1)
+            # NX: a destination already waiting keeps its earlier due time (its batch grows)
+            pipe.zadd(DUE_KEY, {str(i): due_at for i in ids}, nx=True)
+            await pipe.execute()
+        targets += len(ids)
+
+    if targets:
+        await ctx["redis"].enqueue_job(
+            DELIVER_JOB, _job_id=DELIVER_JOB, _defer_by=settings.webhook_batch_window_seconds
+        )
+    logger.info("Webhook event %s (%s) queued for %d integrations", event["id"], event["type"], targets)
+    return {"event": event["id"], "targets": targets}
+
+
+@dataclass
+class Destination:
+    integration_id: int
+    url: str
+    app_slug: str
+    secret: Optional[str] = None
+
+
+def _summary(event: dict[str, Any]) -> str:
+    data = event.get("data", {})
+    if event["type"] == "forecast.updated":
+        probability = data.get("probability")
+        shown = f"{probability:.0%}" if isinstance(probability, (int, float)) and probability <= 1 else probability
+        return f"Forecast updated: {data.get('target')} — {shown}"
+    if event["type"] == "story.published":
+        return f"Story published: {data.get('title')}"
+    return event["type"]
+
+
+def _body(dest: Destination, events: list[dict[str, Any]]) -> bytes:
+    if dest.app_slug in TEXT_APPS:
+        body: dict[str, Any] = {"text": "\n".join(_summary(e) for e in events)}
+    else:
+        body = {"events": events}
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+def _retry_after(resp: httpx.Response) -> Optional[float]:
+    try:
+        return float(resp.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def _post(client: httpx.AsyncClient, limiter: HostRateLimiter, dest: Destination, events: list) -> tuple:
+    """POST one batch. Returns (outcome, retry_after) with outcome "ok", "retry" or "failed"."""
+    unsafe = await _unsafe_reason(dest.url)
+    if unsafe:
+        logger.warning("Webhook %s not sent to %s: %s", dest.integration_id, dest.url, unsafe)
+        return "failed", None
+    content = _body(dest, events)
+    headers = {"Content-Type": "application/json", "X-Probable-Event-Count": str(len(events))}
+    if dest.secret:
+        digest = hmac.new(dest.secret.encode("utf-8"), content, hashlib.sha256).hexdigest()
+        headers["X-Probable-Signature"] = f"sha256={digest}"
+    try:
+        async with limiter.limit(dest.url):
+            resp = await client.post(dest.url, content=content, headers=headers)
+    except httpx.HTTPError as e:
+        logger.debug("Webhook %s to %s failed: %s", dest.integration_id, dest.url, e)
+        return "retry", None
+    if resp.is_success:
+        return "ok", None
+    if resp.status_code == 429 or resp.status_code >= 500:
+        return "retry", _retry_after(resp)
+    logger.warning("Webhook %s rejected by %s: HTTP %s", dest.integration_id, dest.url, resp.status_code)
+    return "failed", None
+
+
+async def _deliver_one(
+    client: httpx.AsyncClient, limiter: HostRateLimiter, dest: Destination, now: float
+) -> Optional[str]:
+    redis = get_redis()
+    lease = LEASE_KEY.format(dest.integration_id)
+    token = uuid.uuid4().hex
+    lease_ms = int((LEASE_SECONDS + settings.webhook_timeout_seconds) * 1000)
+    if not await redis.set(lease, token, nx=True, px=lease_ms):
+        return None  # another run is sending to this destination; it reschedules what remains
+    try:
+        return await _send_batch(client, limiter, dest, now)
+    finally:
+        await redis.eval(_RELEASE, 1, lease, token)
+
+
+async def _send_batch(
+    client: httpx.AsyncClient, limiter: HostRateLimiter, dest: Destination, now: float
+) -> Optional[str]:
+    redis = get_redis()
+    pending = PENDING_KEY.format(dest.integration_id)
+    inflight = INFLIGHT_KEY.format(dest.integration_id)
+    field = str(dest.integration_id)
+    raw = await redis.eval(_TAKE_BATCH, 2, pending, inflight, settings.webhook_max_batch_events)
+    if not raw:
+        return None
+    outcome, retry_after = await _post(client, limiter, dest, [json.loads(r) for r in raw])
+
+    if outcome == "retry":
+        attempts = await redis.hincrby(ATTEMPTS_KEY, field, 1)
+        if attempts < settings.webhook_max_attempts:
+            backoff = settings.webhook_retry_base_seconds * 2 ** (attempts - 1)
+            delay = min(max(backoff, retry_after or 0), settings.webhook_retry_max_seconds)
+            await redis.zadd(DUE_KEY, {field: now + delay})
+            return "retry"
+        outcome = "failed"
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hdel(ATTEMPTS_KEY, field)
+        pipe.delete(inflight)
+        if outcome == "ok":
+            pipe.llen(pending)
+            *_, remaining = await pipe.execute()
+            if remaining:
+                await redis.zadd(DUE_KEY, {field: now})
+            return "ok"
+        # Gave up: drop everything queued; nothing more is sent until the user reconnects
+        pipe.delete(pending)
+        await pipe.execute()
+        return "failed"
+
+
+async def _destinations(ids: list[int]) -> dict[int, Destination]:
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(UserAppIntegration.id, UserAppIntegration.config, MarketplaceApp.slug)
+            .join(MarketplaceApp, UserAppIntegration.app_id == MarketplaceApp.id)
+            .where(UserAppIntegration.id.in_(ids), UserAppIntegration.status == "active")
+        )
+        rows = result.all()
+    return {
+        row.id: Destination(row.id, row.config["webhook_url"], row.slug, row.config.get("secret"))
+        for row in rows
+        if isinstance(row.config, dict) and row.config.get("webhook_url")
+    }
+
+
+async def _record(outcomes: dict[int, str]) -> None:
+    """Bulk status updates: delivered -> last_sync_at, gave up -> status "error"."""
+    ok = [i for i, outcome in outcomes.items() if outcome == "ok"]
+    failed = [i for i, outcome in outcomes.items() if outcome == "failed"]
+    if not ok and not failed:
+        return
+    table = UserAppIntegration.__table__
+    async with async_session_maker() as session:
+        if ok:
+            await session.execute(
+                update(table)
+                .where(table.c.id.in_(ok), table.c.status == "active")
+                .values(last_sync_at=datetime.now(UTC))
+            )
+        if failed:
+            await session.execute(
+                update(table).where(table.c.id.in_(failed), table.c.status == "active").values(status="error")
+            )
+        await session.commit()
+
+
+async def _claim(now: float) -> list[int]:
+    redis = get_redis()
+    due = await redis.zrangebyscore(DUE_KEY, "-inf", now, start=0, num=DELIVER_PAGE)
+    if not due:
+        return []
+    async with redis.pipeline(transaction=False) as pipe:
+        for member in due:
+            pipe.zrem(DUE_KEY, member)
+        removed = await pipe.execute()
+    return [int(member) for member, won in zip(due, removed) if won]
+
+
+async def webhook_deliver(ctx: dict) -> dict[str, Any]:
+    """ARQ job: send every due destination's batch; keeps going while more become due shortly."""
+    start = time.perf_counter()
+    own_client = "webhook_http" not in ctx
+    client: httpx.AsyncClient = ctx.get("webhook_http") or create_webhook_client()
+    limiter = HostRateLimiter(
+        settings.webhook_per_host_concurrency, settings.webhook_per_host_rate, settings.webhook_max_connections
+    )
+    totals = {"ok": 0, "retry": 0, "failed": 0}
+    try:
+        while time.perf_counter() - start < DELIVER_MAX_SECONDS:
+            now = time.time()
+            claimed = await _claim(now)
+            if not claimed:
+                # Batches due within another window are picked up now rather than by the next run
+                upcoming = await get_redis().zrangebyscore(DUE_KEY, "-inf", "+inf", start=0, num=1, withscores=True)
+                wait = upcoming[0][1] - now if upcoming else None
+                if wait is None or wait > settings.webhook_batch_window_seconds:
+                    break
+                await asyncio.sleep(max(wait, 0.05))
+                continue
+            destinations = await _destinations(claimed)
+            for integration_id in set(claimed) - destinations.keys():
+                # Disconnected, paused or without a URL: discard what was queued for it
+                await get_redis().delete(PENDING_KEY.format(integration_id), INFLIGHT_KEY.format(integration_id))
+            results = await asyncio.gather(
+                *(_deliver_one(client, limiter, dest, now) for dest in destinations.values())
+            )
+            outcomes = {i: r for i, r in zip(destinations, results) if r}
+            await _record(outcomes)
+            for outcome in outcomes.values():
+                totals[outcome] += 1
+    finally:
+        if own_client:
+            await client.aclose()
+
+    totals["seconds"] = round(time.perf_counter() - start, 3)
+    if totals["ok"] or totals["retry"] or totals["failed"]:
+        logger.info("Webhooks: %(ok)s delivered, %(retry)s retrying, %(failed)s failed in %(seconds)ss", totals)
+    return totals
+